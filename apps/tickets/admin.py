@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     Client, Service, Role, EUser, TicketPriority, Program, SubProgram,
-    ClosingCode, ANS, User, Status, Ticket, ReportedTime, Note
+    ClosingCode, ANS, User, Status, Ticket, ReportedTime, Note, Holiday,
+    ReportJob
 )
 
 
@@ -59,7 +60,7 @@ class ClosingCodeAdmin(admin.ModelAdmin):
 
 @admin.register(ANS)
 class ANSAdmin(admin.ModelAdmin):
-    list_display = ['id_ans', 'ans_name', 'ans_description']
+    list_display = ['id_ans', 'ans_name', 'ans_description', 'ans_hours']
     search_fields = ['ans_name']
 
 
@@ -71,7 +72,7 @@ class UserAdmin(admin.ModelAdmin):
 
 @admin.register(Status)
 class StatusAdmin(admin.ModelAdmin):
-    list_display = ['id_status', 'status_name', 'status_description']
+    list_display = ['id_status', 'status_name', 'status_description', 'pauses_sla']
     search_fields = ['status_name']
 
 
@@ -92,7 +93,9 @@ class TicketAdmin(admin.ModelAdmin):
 
 @admin.register(ReportedTime)
 class ReportedTimeAdmin(admin.ModelAdmin):
-    list_display = ['id_reported_times', 'id_ticket', 'date_reported', 'reported_time']
+    list_display = [
+        'id_reported_times', 'id_ticket', 'date_reported', 'reported_time', 'duration_seconds'
+    ]
     search_fields = ['id_ticket__ticket_title']
     list_filter = ['date_reported']
     date_hierarchy = 'date_reported'
@@ -106,3 +109,22 @@ class NoteAdmin(admin.ModelAdmin):
     list_filter = ['visible_to_client', 'create_at']
     date_hierarchy = 'create_at'
     readonly_fields = ['create_at', 'update_at']
+
+
+@admin.register(Holiday)
+class HolidayAdmin(admin.ModelAdmin):
+    list_display = ['holiday_date', 'holiday_name', 'source']
+    search_fields = ['holiday_name']
+    list_filter = ['source']
+    date_hierarchy = 'holiday_date'
+    readonly_fields = ['update_at']
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = [
+        'id_report_job', 'report_type', 'result_format', 'status',
+        'row_count', 'requested_by', 'create_at'
+    ]
+    list_filter = ['report_type', 'status']
+    readonly_fields = ['params_hash', 'result_file', 'create_at', 'finished_at']
@@ -0,0 +1,426 @@
+"""
+Calendario laboral compilado para el cálculo de fechas de ANS.
+
+Se construye una sola vez a partir de ``WorkingHours`` y del conjunto de
+festivos, y responde "sumar N horas hábiles a t" saltando semanas completas
+de forma aritmética y recorriendo solo los días restantes.
+"""
+import unicodedata
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from core.utils.cache_versions import get_version
+
+from .holidays import HOLIDAYS_VERSION, get_holiday_set
+from .models import SubProgram, WorkingHours
+
+
+DAY_NAMES = ('Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo')
+
+ZERO = timedelta(0)
+RESOLUTION = timedelta(microseconds=1)
+
+WORKING_HOURS_VERSION = 'working_hours'
+
+_compiled = {'key': None, 'schedules': {}, 'calendars': {}, 'sub_program_clients': {}}
+
+# Versiones fijadas para el bloque actual (ver ``pinned_calendar_versions``)
+_pinned_versions = ContextVar('pinned_calendar_versions', default=None)
+
+
+def _normalize_day_name(name: str) -> str:
+    """
+    Normaliza el nombre de un día (sin tildes, minúsculas, sin espacios)
+    """
+    decomposed = unicodedata.normalize('NFKD', name or '')
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).strip().lower()
+
+
+_WEEKDAY_BY_NAME = {_normalize_day_name(name): index for index, name in enumerate(DAY_NAMES)}
+
+
+def weekday_from_name(name: str):
+    """
+    Retorna el número de día (0=Lunes ... 6=Domingo) para un nombre de
+    ``WorkingHours.week_day`` o None si no se reconoce
+    """
+    return _WEEKDAY_BY_NAME.get(_normalize_day_name(name))
+
+
+def _time_to_offset(value: time) -> timedelta:
+    return timedelta(
+        hours=value.hour, minutes=value.minute,
+        seconds=value.second, microseconds=value.microsecond
+    )
+
+
+class BusinessCalendar:
+    """
+    Calendario laboral semanal con festivos.
+
+    ``schedule`` es un diccionario {día_de_la_semana: (hora_inicio, hora_fin)}
+    donde día_de_la_semana sigue ``datetime.weekday()``. Los días sin horario
+    o con hora de fin menor o igual a la de inicio no son hábiles.
+    """
+
+    def __init__(self, schedule, holidays=()):
+        self._start = [ZERO] * 7
+        self._end = [ZERO] * 7
+        self._capacity = [ZERO] * 7
+
+        for weekday, (start_time, end_time) in schedule.items():
+            start = _time_to_offset(start_time)
+            end = _time_to_offset(end_time)
+            if end > start:
+                self._start[weekday] = start
+                self._end[weekday] = end
+                self._capacity[weekday] = end - start
+
+        self.week_capacity = sum(self._capacity, ZERO)
+        self.holidays = frozenset(holidays)
+
+        # Solo los festivos que caen en un día laboral restan capacidad.
+        # Se guardan ordenados junto con la capacidad perdida acumulada para
+        # poder descontarlos en O(log n) al saltar semanas completas.
+        self._holiday_days = sorted(d for d in self.holidays if self._capacity[d.weekday()])
+        self._holiday_loss = [ZERO]
+        for day in self._holiday_days:
+            self._holiday_loss.append(self._holiday_loss[-1] + self._capacity[day.weekday()])
+
+    @classmethod
+    def from_working_hours(cls, working_hours, holidays=()):
+        """
+        Compila el calendario a partir de instancias de ``WorkingHours``
+        """
+        schedule = {}
+        for item in working_hours:
+            weekday = weekday_from_name(item.week_day)
+            if weekday is not None:
+                schedule[weekday] = (item.start_time, item.end_time)
+        return cls(schedule, holidays)
+
+    def is_work_day(self, day) -> bool:
+        """
+        Valida si un día es hábil (tiene horario y no es festivo)
+        """
+        return bool(self._capacity[day.weekday()]) and day not in self.holidays
+
+    def capacity(self, day) -> timedelta:
+        """
+        Tiempo hábil disponible en un día completo
+        """
+        if day in self.holidays:
+            return ZERO
+        return self._capacity[day.weekday()]
+
+    def day_bounds(self, day):
+        """
+        Retorna (inicio, fin) de la jornada de un día hábil como datetimes ingenuos
+        """
+        midnight = datetime.combine(day, time.min)
+        weekday = day.weekday()
+        return midnight + self._start[weekday], midnight + self._end[weekday]
+
+    def _lost_between(self, first_day, last_day) -> timedelta:
+        """
+        Capacidad perdida por festivos en el rango [first_day, last_day)
+        """
+        lower = bisect_left(self._holiday_days, first_day)
+        upper = bisect_left(self._holiday_days, last_day)
+        return self._holiday_loss[upper] - self._holiday_loss[lower]
+
+    def add_business_hours(self, start: datetime, hours) -> datetime:
+        """
+        Suma ``hours`` horas hábiles a ``start``
+        """
+        return self.add_business_time(start, timedelta(hours=hours))
+
+    def add_business_time(self, start: datetime, amount: timedelta) -> datetime:
+        """
+        Suma una duración hábil a ``start``.
+
+        Las fechas con zona horaria se calculan en la hora local del proyecto y
+        se retornan con la misma zona; las fechas ingenuas se retornan ingenuas.
+        """
+        if timezone.is_aware(start):
+            local_start = timezone.localtime(start)
+            result = self._add(local_start.replace(tzinfo=None), amount)
+            return timezone.make_aware(result, local_start.tzinfo)
+        return self._add(start, amount)
+
+    def add_business_hours_many(self, start: datetime, hours_list):
+        """
+        Suma a ``start`` cada valor de ``hours_list`` y retorna las fechas en el
+        mismo orden.
+
+        Los valores se ordenan y cada fecha continúa desde la anterior sumando
+        solo la diferencia, de modo que el calendario se recorre una sola vez.
+        """
+        results = {}
+        current, previous = start, timedelta(0)
+        for hours in sorted(set(hours_list)):
+            amount = timedelta(hours=hours)
+            current = self.add_business_time(current, amount - previous)
+            results[hours], previous = current, amount
+        return [results[hours] for hours in hours_list]
+
+    def _add(self, start: datetime, amount: timedelta) -> datetime:
+        if amount <= ZERO:
+            return start
+        if not self.week_capacity:
+            raise ValueError('No hay horarios laborales configurados')
+
+        # Tramo del primer día: desde el momento actual (o el inicio de la
+        # jornada si aún no ha empezado) hasta el fin de la jornada.
+        day = start.date()
+        if self.is_work_day(day):
+            day_start, day_end = self.day_bounds(day)
+            current = max(start, day_start)
+            if current < day_end:
+                available = day_end - current
+                if amount <= available:
+                    return current + amount
+                amount -= available
+        day += timedelta(days=1)
+
+        # Saltar semanas completas descontando los festivos del tramo saltado.
+        # Se deja siempre algo de tiempo pendiente para que la fecha final se
+        # resuelva en el recorrido día a día.
+        while amount > self.week_capacity:
+            weeks = (amount - RESOLUTION) // self.week_capacity
+            target = day + timedelta(weeks=weeks)
+            amount -= weeks * self.week_capacity - self._lost_between(day, target)
+            day = target
+
+        # Recorrer solo los días restantes
+        while True:
+            available = self.capacity(day)
+            if available and amount <= available:
+                return self.day_bounds(day)[0] + amount
+            amount -= available
+            day += timedelta(days=1)
+
+    def elapsed_index(self, first_day, last_day):
+        """
+        Construye un índice de segundos hábiles acumulados para el rango de días
+        """
+        return BusinessHoursIndex(self, first_day, last_day)
+
+    def business_seconds_between(self, start: datetime, end: datetime) -> float:
+        """
+        Segundos hábiles transcurridos entre dos fechas
+        """
+        return self.business_seconds_many([(start, end)])[0]
+
+    def business_seconds_many(self, pairs):
+        """
+        Segundos hábiles transcurridos para una lista de pares (inicio, fin).
+
+        Construye un único índice que cubre todos los pares y resuelve cada uno
+        con dos búsquedas y una resta. Los pares con algún extremo vacío
+        retornan None.
+        """
+        pairs = [
+            (_to_local_naive(start), _to_local_naive(end)) if start and end else None
+            for start, end in pairs
+        ]
+        days = [moment.date() for pair in pairs if pair for moment in pair]
+        if not days:
+            return [None] * len(pairs)
+
+        index = self.elapsed_index(min(days), max(days))
+        return [index.elapsed_seconds(*pair) if pair else None for pair in pairs]
+
+
+def _to_local_naive(moment: datetime) -> datetime:
+    if timezone.is_aware(moment):
+        return timezone.localtime(moment).replace(tzinfo=None)
+    return moment
+
+
+class BusinessHoursIndex:
+    """
+    Segundos hábiles acumulados por día para un rango de fechas.
+
+    ``position(t)`` es el tiempo hábil entre el inicio del rango y ``t``; el
+    tiempo hábil entre dos momentos es la resta de sus posiciones.
+    """
+
+    def __init__(self, calendar: BusinessCalendar, first_day, last_day):
+        self.first_day = first_day
+        self.last_day = last_day
+        self._bounds = []
+        self._cumulative = [0.0]
+
+        day = first_day
+        while day <= last_day:
+            if calendar.is_work_day(day):
+                weekday = day.weekday()
+                start = calendar._start[weekday].total_seconds()
+                end = calendar._end[weekday].total_seconds()
+            else:
+                start = end = 0.0
+            self._bounds.append((start, end))
+            self._cumulative.append(self._cumulative[-1] + end - start)
+            day += timedelta(days=1)
+
+    def position(self, moment: datetime) -> float:
+        """
+        Segundos hábiles desde el inicio del rango hasta ``moment``
+        """
+        moment = _to_local_naive(moment)
+        index = (moment.date() - self.first_day).days
+        if index < 0:
+            return 0.0
+        if index >= len(self._bounds):
+            return self._cumulative[-1]
+
+        start, end = self._bounds[index]
+        seconds = (
+            moment.hour * 3600 + moment.minute * 60 + moment.second + moment.microsecond / 1e6
+        )
+        return self._cumulative[index] + min(max(seconds, start), end) - start
+
+    def elapsed_seconds(self, start: datetime, end: datetime) -> float:
+        """
+        Segundos hábiles entre ``start`` y ``end`` (0 si ``end`` es anterior)
+        """
+        return max(self.position(end) - self.position(start), 0.0)
+
+
+def _current_versions():
+    return (get_version(WORKING_HOURS_VERSION), get_version(HOLIDAYS_VERSION))
+
+
+@contextmanager
+def pinned_calendar_versions():
+    """
+    Dentro del bloque las versiones de horarios y festivos se leen del cache
+    una sola vez, en lugar de dos lecturas en cada consulta de calendario.
+    Se usa en los recorridos por lotes (ej. un calendario por ticket).
+
+    Si el mismo bloque cambia horarios o festivos, ``unpin_calendar_versions``
+    hace que la siguiente consulta vuelva a leerlas.
+    """
+    token = _pinned_versions.set({'versions': None})
+    try:
+        yield
+    finally:
+        _pinned_versions.reset(token)
+
+
+def unpin_calendar_versions():
+    """
+    Descarta las versiones fijadas por ``pinned_calendar_versions`` (si hay)
+    """
+    pinned = _pinned_versions.get()
+    if pinned is not None:
+        pinned['versions'] = None
+
+
+def _load_compiled() -> dict:
+    """
+    Retorna los horarios agrupados por alcance y los calendarios ya compilados.
+
+    Todos los horarios se leen con una sola consulta y se guardan en memoria por
+    proceso; solo se vuelven a leer cuando cambia la versión de los horarios o
+    de los festivos.
+    """
+    pinned = _pinned_versions.get()
+    if pinned is None:
+        key = _current_versions()
+    else:
+        if pinned['versions'] is None:
+            pinned['versions'] = _current_versions()
+        key = pinned['versions']
+    if _compiled['key'] != key:
+        schedules = {}
+        for item in WorkingHours.objects.all():
+            scope = (item.client_name_id, item.id_services_id)
+            schedules.setdefault(scope, []).append(item)
+        _compiled.update(
+            key=key, schedules=schedules, calendars={}, sub_program_clients={}
+        )
+    return _compiled
+
+
+def calendar_scopes():
+    """
+    Alcances (cliente, servicio) con horario propio, incluido el general (None, None)
+    """
+    return sorted(
+        set(_load_compiled()['schedules']) | {(None, None)},
+        key=lambda scope: (scope[0] is not None, scope[1] is not None, scope)
+    )
+
+
+def resolve_scope(client=None, service=None):
+    """
+    Retorna el alcance cuyo horario aplica para un cliente y un servicio.
+
+    Orden de prioridad: cliente y servicio, servicio, cliente y horario general.
+    """
+    return _resolve_scope(_load_compiled(), client, service)
+
+
+def _resolve_scope(compiled, client, service):
+    schedules = compiled['schedules']
+    for scope in ((client, service), (None, service), (client, None)):
+        if scope != (None, None) and scope in schedules:
+            return scope
+    return (None, None)
+
+
+def get_business_calendar(client=None, service=None) -> BusinessCalendar:
+    """
+    Retorna el calendario laboral que aplica a un cliente y un servicio (por
+    defecto el general) con los festivos del almacén local.
+
+    Los calendarios compilados se guardan en memoria por proceso, uno por
+    alcance, y solo se vuelven a construir cuando cambia la versión de los
+    horarios o de los festivos.
+    """
+    return _business_calendar(_load_compiled(), client, service)
+
+
+def _business_calendar(compiled, client, service) -> BusinessCalendar:
+    scope = _resolve_scope(compiled, client, service)
+    calendar = compiled['calendars'].get(scope)
+    if calendar is None:
+        calendar = BusinessCalendar.from_working_hours(
+            compiled['schedules'].get(scope, ()), get_holiday_set()
+        )
+        compiled['calendars'][scope] = calendar
+    return calendar
+
+
+def client_for_sub_program(sub_program_id):
+    """
+    Retorna el id del cliente al que pertenece un subprograma.
+
+    La relación subprograma -> cliente se guarda en memoria y solo se consulta
+    la base de datos cuando aparece un subprograma que no se conoce.
+    """
+    return _client_for_sub_program(_load_compiled(), sub_program_id)
+
+
+def _client_for_sub_program(compiled, sub_program_id):
+    clients = compiled['sub_program_clients']
+    if sub_program_id not in clients:
+        clients.update(
+            SubProgram.objects.values_list('sub_program_name', 'program_name__client_name')
+        )
+    return clients.get(sub_program_id)
+
+
+def get_ticket_calendar(sub_program_id, service_id) -> BusinessCalendar:
+    """
+    Retorna el calendario laboral de un ticket según su subprograma y servicio
+    """
+    compiled = _load_compiled()
+    client = _client_for_sub_program(compiled, sub_program_id) if sub_program_id else None
+    return _business_calendar(compiled, client, service_id)
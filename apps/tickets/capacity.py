@@ -0,0 +1,106 @@
+"""
+Tabla materializada de capacidad laboral diaria (``DailyCapacity``).
+
+Cada fila guarda los segundos disponibles de un día para un alcance
+(cliente, servicio) según su horario, los festivos y el descanso diario
+configurado, de modo que la capacidad de cualquier rango es una sola suma
+indexada.
+
+Los cambios de horarios y festivos no recalculan la tabla en cada fila
+guardada: ``invalidate_daily_capacity`` descarta las filas y
+``available_seconds`` vuelve a calcular solo los días que se consulten.
+"""
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .business_calendar import calendar_scopes, get_business_calendar, resolve_scope
+from .models import DailyCapacity
+
+
+def default_range():
+    """
+    Rango que se mantiene materializado: desde CAPACITY_YEARS_BACK años atrás
+    hasta el último año de festivos cargado (HOLIDAYS_YEARS_AHEAD)
+    """
+    year = timezone.localdate().year
+    return (
+        date(year - settings.CAPACITY_YEARS_BACK, 1, 1),
+        date(year + settings.HOLIDAYS_YEARS_AHEAD, 12, 31),
+    )
+
+
+def refresh_daily_capacity(first_day=None, last_day=None, scopes=None) -> int:
+    """
+    Recalcula la capacidad de los días del rango (por defecto ``default_range``)
+    para cada alcance (cliente, servicio) con horario propio, o solo para los
+    alcances indicados. Retorna la cantidad de filas escritas.
+    """
+    if first_day is None or last_day is None:
+        first_day, last_day = default_range()
+
+    break_seconds = settings.WORKDAY_BREAK_MINUTES * 60
+    existing = DailyCapacity.objects.filter(
+        capacity_date__gte=first_day, capacity_date__lte=last_day
+    )
+    if scopes is None:
+        # Se borran todos los alcances del rango para no dejar filas de
+        # horarios que ya no existen
+        scopes = calendar_scopes()
+    else:
+        scope_filter = Q(pk__in=[])
+        for client, service in scopes:
+            scope_filter |= Q(client_name=client, id_services=service)
+        existing = existing.filter(scope_filter)
+
+    rows = []
+    for client, service in scopes:
+        calendar = get_business_calendar(client, service)
+        day = first_day
+        while day <= last_day:
+            seconds = int(calendar.capacity(day).total_seconds())
+            rows.append(DailyCapacity(
+                capacity_date=day,
+                available_seconds=max(seconds - break_seconds, 0) if seconds else 0,
+                is_work_day=bool(seconds),
+                client_name_id=client,
+                id_services_id=service,
+            ))
+            day += timedelta(days=1)
+
+    with transaction.atomic():
+        existing.delete()
+        DailyCapacity.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def invalidate_daily_capacity():
+    """
+    Descarta la capacidad materializada después de un cambio de horarios o
+    festivos. No depende de Celery: ``available_seconds`` completa con el
+    calendario vigente los días que falten al consultarlos.
+    """
+    DailyCapacity.objects.all().delete()
+
+
+def available_seconds(first_day, last_day, client=None, service=None) -> int:
+    """
+    Segundos laborales disponibles entre dos fechas (inclusive) según el
+    calendario que aplica al cliente y servicio indicados.
+    Si al rango le faltan días materializados se completan antes de sumar.
+    """
+    client, service = resolve_scope(client, service)
+    queryset = DailyCapacity.objects.filter(
+        client_name=client, id_services=service,
+        capacity_date__gte=first_day, capacity_date__lte=last_day
+    )
+    result = queryset.aggregate(total=Sum('available_seconds'), days=Count('id_daily_capacity'))
+
+    if result['days'] != (last_day - first_day).days + 1:
+        refresh_daily_capacity(first_day, last_day, scopes=[(client, service)])
+        result = queryset.aggregate(total=Sum('available_seconds'), days=Count('id_daily_capacity'))
+
+    return result['total'] or 0
@@ -0,0 +1,209 @@
+"""
+Tabla de hechos diaria de tickets (``TicketDailyStats``).
+
+Cada fila cuenta, para un día en la zona horaria del proyecto y una
+combinación (cliente, servicio, estado, asignado), los tickets creados y
+cerrados ese día y cuántos de los cerrados cumplieron o vencieron el ANS.
+El estado y el asignado son los actuales del ticket.
+
+Las señales de Ticket aplican la diferencia entre el aporte anterior y el
+nuevo de cada ticket con incrementos ``F()``; ``rebuild_daily_stats``
+recalcula un rango desde la tabla de tickets con dos consultas agrupadas.
+Las lecturas siempre suman filas, así que los gráficos consultan unas
+pocas decenas de filas en lugar de recorrer la tabla de tickets.
+"""
+import json
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .business_calendar import client_for_sub_program
+from .models import Ticket, TicketDailyStats
+
+MEASURES = ('created', 'closed', 'compliant', 'overdue')
+
+# Campos del ticket que determinan su aporte a la tabla
+TRACKED_FIELDS = (
+    'create_at', 'closing_date', 'cumplimiento', 'ticket_service',
+    'status_id', 'assigned_to', 'sub_program_name',
+)
+
+_CLIENT_PATH = 'sub_program_name__program_name__client_name'
+
+
+def _local_date(moment):
+    return timezone.localtime(moment).date() if timezone.is_aware(moment) else moment.date()
+
+
+def tracked_values(ticket) -> dict:
+    """
+    Valores de un ticket que determinan su aporte, con los ids de las llaves foráneas
+    """
+    return {
+        'create_at': ticket.create_at,
+        'closing_date': ticket.closing_date,
+        'cumplimiento': ticket.cumplimiento,
+        'ticket_service': ticket.ticket_service_id,
+        'status_id': ticket.status_id_id,
+        'assigned_to': ticket.assigned_to_id,
+        'sub_program_name': ticket.sub_program_name_id,
+    }
+
+
+def contributions(values, client=None) -> dict:
+    """
+    Aporte de un ticket a la tabla: {(fecha, cliente, servicio, estado, asignado): Counter}.
+    ``values`` tiene la forma de ``tracked_values``; si no se indica ``client``
+    se obtiene del subprograma.
+    """
+    if values is None:
+        return {}
+    if client is None and values['sub_program_name']:
+        client = client_for_sub_program(values['sub_program_name'])
+    dimensions = (client, values['ticket_service'], values['status_id'], values['assigned_to'])
+
+    result = defaultdict(Counter)
+    if values['create_at'] is not None:
+        result[(_local_date(values['create_at']), *dimensions)]['created'] += 1
+    if values['closing_date'] is not None:
+        closed = result[(_local_date(values['closing_date']), *dimensions)]
+        closed['closed'] += 1
+        if values['cumplimiento'] is True:
+            closed['compliant'] += 1
+        elif values['cumplimiento'] is False:
+            closed['overdue'] += 1
+    return result
+
+
+def contribution_delta(before, after) -> dict:
+    """
+    Diferencia entre dos aportes; solo incluye las llaves y medidas que cambian
+    """
+    delta = {}
+    for key in set(before) | set(after):
+        change = {
+            measure: after.get(key, {}).get(measure, 0) - before.get(key, {}).get(measure, 0)
+            for measure in MEASURES
+        }
+        change = {measure: value for measure, value in change.items() if value}
+        if change:
+            delta[key] = change
+    return delta
+
+
+def bucket_key(key) -> str:
+    """
+    Valor de ``TicketDailyStats.bucket_key`` para una llave (fecha, cliente,
+    servicio, estado, asignado). La restricción única sobre las columnas no
+    impide filas repetidas cuando el cliente o el asignado son NULL; esta
+    llave sí, porque los representa como ``null``.
+    """
+    stat_date, *dimensions = key
+    return json.dumps([stat_date.isoformat(), *dimensions])
+
+
+def _key_filter(key) -> dict:
+    stat_date, client, service, status, assigned = key
+    return {
+        'stat_date': stat_date,
+        'client_name_id': client,
+        'id_services_id': service,
+        'status_id_id': status,
+        'assigned_to_id': assigned,
+    }
+
+
+def apply_delta(delta):
+    """
+    Aplica una diferencia a la tabla con incrementos ``F()``; las filas que no
+    existen se crean
+    """
+    for key, change in delta.items():
+        lookup = {'bucket_key': bucket_key(key)}
+        increments = {measure: F(measure) + value for measure, value in change.items()}
+        if TicketDailyStats.objects.filter(**lookup).update(**increments):
+            continue
+        try:
+            with transaction.atomic():
+                TicketDailyStats.objects.create(**lookup, **_key_filter(key), **change)
+        except IntegrityError:
+            # Otra transacción creó la fila entre la actualización y la inserción
+            TicketDailyStats.objects.filter(**lookup).update(**increments)
+
+
+def _day_bounds(first_day, last_day):
+    """
+    Rango semiabierto [inicio de first_day, inicio del día siguiente a last_day)
+    en la zona horaria del proyecto
+    """
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(first_day, time.min), tz),
+        timezone.make_aware(datetime.combine(last_day + timedelta(days=1), time.min), tz),
+    )
+
+
+def rebuild_daily_stats(first_day, last_day=None) -> int:
+    """
+    Recalcula las filas de los días entre ``first_day`` y ``last_day``
+    (inclusive, por defecto hoy) desde la tabla de tickets.
+    Retorna la cantidad de filas escritas.
+    """
+    last_day = last_day or timezone.localdate()
+    start, end = _day_bounds(first_day, last_day)
+    tz = timezone.get_current_timezone()
+    dimensions = (_CLIENT_PATH, 'ticket_service', 'status_id', 'assigned_to')
+
+    rows = defaultdict(Counter)
+    created = Ticket.objects.filter(
+        create_at__gte=start, create_at__lt=end
+    ).annotate(
+        day=TruncDate('create_at', tzinfo=tz)
+    ).values_list('day', *dimensions).annotate(total=Count('id_ticket')).order_by()
+    for *key, total in created:
+        rows[tuple(key)]['created'] += total
+
+    closed = Ticket.objects.filter(
+        closing_date__gte=start, closing_date__lt=end
+    ).annotate(
+        day=TruncDate('closing_date', tzinfo=tz)
+    ).values_list('day', *dimensions).annotate(
+        total=Count('id_ticket'),
+        compliant=Count('id_ticket', filter=Q(cumplimiento=True)),
+        overdue=Count('id_ticket', filter=Q(cumplimiento=False)),
+    ).order_by()
+    for *key, total, compliant, overdue in closed:
+        measures = rows[tuple(key)]
+        measures['closed'] += total
+        measures['compliant'] += compliant
+        measures['overdue'] += overdue
+
+    objects = [
+        TicketDailyStats(bucket_key=bucket_key(key), **_key_filter(key), **measures)
+        for key, measures in rows.items()
+    ]
+    with transaction.atomic():
+        TicketDailyStats.objects.filter(stat_date__gte=first_day, stat_date__lte=last_day).delete()
+        TicketDailyStats.objects.bulk_create(objects, batch_size=1000)
+    return len(objects)
+
+
+def daily_totals(first_day, last_day, **filters) -> dict:
+    """
+    Totales por día entre dos fechas (inclusive): {fecha: {medida: total}}.
+    ``filters`` se aplican sobre las filas (ej. ``client_name_id``).
+    Los días sin tickets no aparecen.
+    """
+    queryset = TicketDailyStats.objects.filter(
+        stat_date__gte=first_day, stat_date__lte=last_day, **filters
+    ).values('stat_date').annotate(
+        **{measure: Sum(measure) for measure in MEASURES}
+    ).order_by()
+    return {
+        row.pop('stat_date'): row
+        for row in queryset
+    }
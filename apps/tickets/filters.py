@@ -90,6 +90,8 @@ class TicketFilter(django_filters.FilterSet):
             'status_id': ['exact'],
             'ticket_ans': ['exact'],
             'create_at': ['gte', 'lte'],
+            'total_reported_seconds': ['gte', 'lte'],
+            'reported_entries_count': ['exact', 'gte', 'lte'],
         }
 
     def filter_search(self, queryset, name, value):
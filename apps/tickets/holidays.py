@@ -0,0 +1,126 @@
+"""
+Almacén local de días festivos.
+
+Los festivos se cargan en la tabla ``holidays`` con el comando
+``sync_holidays`` o con la tarea programada del mismo nombre. Las lecturas
+pasan por un frozenset en memoria que se invalida con un contador de versión
+en el cache compartido, de modo que ninguna petición hace llamadas de red.
+"""
+import json
+import logging
+from datetime import date
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.db import transaction
+
+from core.utils.cache_versions import bump_version, get_version
+
+from .models import Holiday
+
+logger = logging.getLogger(__name__)
+
+HOLIDAYS_VERSION = 'holidays'
+HOLIDAYS_API_URL = 'https://api-colombia.com/api/v1/Holiday/year/{year}'
+OFFLINE_HOLIDAYS_FILE = Path(__file__).resolve().parent / 'data' / 'holidays_co.json'
+
+_memo = {'version': None, 'holidays': frozenset()}
+
+
+def load_offline_holidays(year=None):
+    """
+    Retorna [(fecha, nombre)] desde el archivo local incluido con la aplicación.
+    Si no se indica el año se retornan todos los años disponibles.
+    """
+    with open(OFFLINE_HOLIDAYS_FILE, encoding='utf-8') as handler:
+        data = json.load(handler)
+
+    years = [str(year)] if year is not None else list(data)
+    return [
+        (date.fromisoformat(item['date']), item.get('name'))
+        for key in years
+        for item in data.get(key, [])
+    ]
+
+
+def fetch_holidays(year):
+    """
+    Consulta los festivos de un año en api-colombia.com.
+    Solo debe usarse desde el comando o la tarea de sincronización.
+    """
+    response = requests.get(
+        HOLIDAYS_API_URL.format(year=year),
+        timeout=settings.HOLIDAYS_API_TIMEOUT,
+        verify=settings.HOLIDAYS_API_VERIFY_SSL,
+    )
+    response.raise_for_status()
+    return [
+        (date.fromisoformat(item['date'].split('T')[0]), item.get('name'))
+        for item in response.json()
+    ]
+
+
+def sync_holidays(years, offline_only=False):
+    """
+    Carga en la tabla ``holidays`` los festivos de los años indicados.
+
+    Por cada año se intenta la API y, si no responde, se usa el archivo local.
+    Retorna {año: (cantidad, origen)} con los años cargados.
+    """
+    summary = {}
+    for year in years:
+        holidays, source = None, Holiday.SOURCE_API
+        if not offline_only:
+            try:
+                holidays = fetch_holidays(year)
+            except (requests.RequestException, ValueError, KeyError) as e:
+                logger.warning(f'No se pudieron consultar los festivos de {year}: {e}')
+
+        if not holidays:
+            holidays, source = load_offline_holidays(year), Holiday.SOURCE_OFFLINE
+
+        if not holidays:
+            logger.warning(f'No hay festivos disponibles para {year}')
+            continue
+
+        names = {}
+        for holiday_date, name in holidays:
+            if holiday_date in names:
+                name = f'{names[holiday_date]} / {name}'
+            names[holiday_date] = name
+
+        with transaction.atomic():
+            # Los festivos cargados manualmente no se reemplazan
+            Holiday.objects.filter(holiday_date__year=year).exclude(
+                source=Holiday.SOURCE_MANUAL
+            ).delete()
+            Holiday.objects.bulk_create(
+                [
+                    Holiday(holiday_date=holiday_date, holiday_name=name, source=source)
+                    for holiday_date, name in sorted(names.items())
+                ],
+                ignore_conflicts=True,
+            )
+        summary[year] = (len(names), source)
+
+    if summary:
+        bump_version(HOLIDAYS_VERSION)
+    return summary
+
+
+def get_holiday_set() -> frozenset:
+    """
+    Retorna el conjunto de festivos como frozenset de fechas.
+
+    El conjunto se guarda en memoria por proceso y se recarga solo cuando cambia
+    la versión. Si la tabla está vacía se usa el archivo local.
+    """
+    version = get_version(HOLIDAYS_VERSION)
+    if _memo['version'] != version:
+        holidays = frozenset(Holiday.objects.values_list('holiday_date', flat=True))
+        if not holidays:
+            holidays = frozenset(holiday_date for holiday_date, _ in load_offline_holidays())
+        _memo['holidays'] = holidays
+        _memo['version'] = version
+    return _memo['holidays']
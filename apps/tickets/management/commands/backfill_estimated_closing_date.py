@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from apps.tickets.models import Ticket
+from apps.tickets.sla import estimate_closing_date, recompute_in_chunks, ticket_calendar
+from apps.tickets.stats import TICKETS_VERSION
+from core.utils.cache_versions import bump_version
+
+
+class Command(BaseCommand):
+    help = 'Calcula la fecha estimada de cierre de los tickets existentes según su ANS'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--todos', action='store_true',
+            help='Recalcular todos los tickets (por defecto solo los que no tienen fecha estimada)'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Cantidad de tickets leídos y escritos por bloque'
+        )
+
+    def handle(self, *args, **options):
+        queryset = Ticket.objects.select_related('ticket_ans').only(
+            'id_ticket', 'create_at', 'estimated_closing_date', 'sub_program_name',
+            'ticket_service', 'ticket_ans__ans_hours'
+        ).filter(ticket_ans__ans_hours__isnull=False).order_by('id_ticket')
+        if not options['todos']:
+            queryset = queryset.filter(estimated_closing_date__isnull=True)
+
+        def update(ticket):
+            estimated_closing_date = estimate_closing_date(
+                ticket.create_at, ticket.ticket_ans, ticket_calendar(ticket)
+            )
+            # Sin horarios laborales no hay fecha que calcular: se deja la actual
+            if estimated_closing_date in (None, ticket.estimated_closing_date):
+                return False
+            ticket.estimated_closing_date = estimated_closing_date
+            return True
+
+        updated = recompute_in_chunks(
+            queryset, update, ['estimated_closing_date'], chunk_size=options['chunk_size']
+        )
+        if updated:
+            # bulk_update no envía señales: se invalidan aquí los reportes en cache
+            bump_version(TICKETS_VERSION)
+        self.stdout.write(self.style.SUCCESS(f'Tickets actualizados: {updated}'))
@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Min
+from django.utils import timezone
+
+from apps.tickets.daily_stats import rebuild_daily_stats
+from apps.tickets.models import Ticket
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye la tabla diaria de tickets (creados, cerrados, cumplidos y vencidos)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--desde',
+            help='Fecha inicial YYYY-MM-DD (por defecto: el primer ticket creado)'
+        )
+        parser.add_argument('--hasta', help='Fecha final YYYY-MM-DD (por defecto: hoy)')
+
+    def handle(self, *args, **options):
+        last_day = timezone.localdate()
+        try:
+            first_day = (
+                datetime.strptime(options['desde'], '%Y-%m-%d').date()
+                if options['desde'] else None
+            )
+            if options['hasta']:
+                last_day = datetime.strptime(options['hasta'], '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError('Formato de fecha inválido. Use YYYY-MM-DD')
+
+        if first_day is None:
+            first_ticket = Ticket.objects.aggregate(first=Min('create_at'))['first']
+            if first_ticket is None:
+                self.stdout.write('No hay tickets para procesar')
+                return
+            first_day = timezone.localtime(first_ticket).date()
+
+        rows = rebuild_daily_stats(first_day, last_day)
+        self.stdout.write(self.style.SUCCESS(
+            f'Tabla diaria reconstruida: {rows} filas ({first_day} a {last_day})'
+        ))
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.tickets.sla import recalculate_cumplimiento
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula el cumplimiento de los tickets cerrados comparando fecha de cierre '
+        'y fecha estimada'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--desde',
+            help=(
+                'Solo tickets cerrados desde esta fecha YYYY-MM-DD '
+                '(por defecto: todo el histórico)'
+            )
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Cantidad de tickets leídos y escritos por bloque'
+        )
+
+    def handle(self, *args, **options):
+        closed_since = None
+        if options['desde']:
+            try:
+                closed_since = timezone.make_aware(datetime.strptime(options['desde'], '%Y-%m-%d'))
+            except ValueError:
+                raise CommandError('Formato de fecha inválido. Use YYYY-MM-DD')
+
+        updated = recalculate_cumplimiento(closed_since, chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Tickets actualizados: {updated}'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.tickets.reported_totals import reconcile_reported_totals
+
+
+class Command(BaseCommand):
+    help = (
+        'Corrige los totales de tiempo reportado de los tickets que no coinciden '
+        'con sus tiempos reportados'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Cantidad de tickets corregidos por bloque'
+        )
+
+    def handle(self, *args, **options):
+        fixed = reconcile_reported_totals(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Tickets corregidos: {fixed}'))
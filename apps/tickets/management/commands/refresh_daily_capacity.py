@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tickets.capacity import default_range, refresh_daily_capacity
+
+
+class Command(BaseCommand):
+    help = 'Recalcula la tabla de capacidad laboral diaria (WorkingHours, festivos y descansos)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', help='Fecha inicial YYYY-MM-DD')
+        parser.add_argument('--hasta', help='Fecha final YYYY-MM-DD')
+
+    def handle(self, *args, **options):
+        first_day, last_day = default_range()
+        try:
+            if options['desde']:
+                first_day = datetime.strptime(options['desde'], '%Y-%m-%d').date()
+            if options['hasta']:
+                last_day = datetime.strptime(options['hasta'], '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError('Formato de fecha inválido. Use YYYY-MM-DD')
+
+        days = refresh_daily_capacity(first_day, last_day)
+        self.stdout.write(self.style.SUCCESS(
+            f'Capacidad diaria recalculada: {days} días ({first_day} a {last_day})'
+        ))
@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.tickets.capacity import refresh_daily_capacity
+from apps.tickets.holidays import sync_holidays
+
+
+class Command(BaseCommand):
+    help = 'Carga los días festivos en la tabla local (API con respaldo en el archivo incluido)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--desde', type=int, default=None,
+            help='Primer año a cargar (por defecto: año actual)'
+        )
+        parser.add_argument(
+            '--anios', type=int, default=settings.HOLIDAYS_YEARS_AHEAD,
+            help='Cantidad de años adicionales a cargar después del primero'
+        )
+        parser.add_argument(
+            '--offline', action='store_true',
+            help='Usar solo el archivo local, sin consultar la API'
+        )
+
+    def handle(self, *args, **options):
+        first_year = options['desde'] or timezone.localdate().year
+        years = range(first_year, first_year + options['anios'] + 1)
+
+        summary = sync_holidays(years, offline_only=options['offline'])
+
+        for year in years:
+            if year in summary:
+                count, source = summary[year]
+                self.stdout.write(f'{year}: {count} festivos ({source})')
+            else:
+                self.stdout.write(self.style.WARNING(f'{year}: sin festivos disponibles'))
+        refresh_daily_capacity()
+        self.stdout.write(self.style.SUCCESS('Festivos sincronizados'))
@@ -0,0 +1,71 @@
+# Generated by Django 5.0.14 on 2026-10-17 03:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0003_ticket_cumplimiento"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Holiday",
+            fields=[
+                (
+                    "id_holiday",
+                    models.AutoField(
+                        db_column="id-holiday",
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID del Festivo",
+                    ),
+                ),
+                (
+                    "holiday_date",
+                    models.DateField(
+                        db_column="holiday-date",
+                        unique=True,
+                        verbose_name="Fecha del Festivo",
+                    ),
+                ),
+                (
+                    "holiday_name",
+                    models.CharField(
+                        blank=True,
+                        db_column="holiday-name",
+                        max_length=100,
+                        null=True,
+                        verbose_name="Nombre del Festivo",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("api", "API"),
+                            ("offline", "Archivo local"),
+                            ("manual", "Manual"),
+                        ],
+                        default="manual",
+                        max_length=15,
+                        verbose_name="Origen",
+                    ),
+                ),
+                (
+                    "update_at",
+                    models.DateTimeField(
+                        auto_now=True,
+                        db_column="update-at",
+                        verbose_name="Fecha de Actualización",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Festivo",
+                "verbose_name_plural": "Festivos",
+                "db_table": "holidays",
+                "ordering": ["holiday_date"],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.14 on 2026-10-17 03:57
+
+import re
+
+from django.db import migrations, models
+
+
+# Solo un número seguido explícitamente de horas: "8 horas", "48h", "24 hrs"
+HOURS_PATTERN = re.compile(r"(\d+)\s*h(?:oras?|rs?)?\b", re.IGNORECASE)
+
+
+def populate_ans_hours(apps, schema_editor):
+    """
+    Toma las horas del nombre del ANS cuando las indica explícitamente
+    (ej: "8 horas", "ANS 2 - 48h"). Los demás (ej: "3 días") quedan vacíos
+    para configurarlos a mano.
+    """
+    ANS = apps.get_model("tickets", "ANS")
+    for ans in ANS.objects.filter(ans_hours__isnull=True):
+        match = HOURS_PATTERN.search(ans.ans_name or "")
+        if match:
+            ans.ans_hours = int(match.group(1))
+            ans.save(update_fields=["ans_hours"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0004_holiday"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ans",
+            name="ans_hours",
+            field=models.PositiveIntegerField(
+                blank=True,
+                db_column="ans-hours",
+                help_text="Horas hábiles disponibles para cerrar el ticket",
+                null=True,
+                verbose_name="Horas del ANS",
+            ),
+        ),
+        migrations.RunPython(populate_ans_hours, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.0.14 on 2026-10-17 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0005_ans_ans_hours"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyCapacity",
+            fields=[
+                (
+                    "id_daily_capacity",
+                    models.AutoField(
+                        db_column="id-daily-capacity",
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID de la Capacidad Diaria",
+                    ),
+                ),
+                (
+                    "capacity_date",
+                    models.DateField(
+                        db_column="capacity-date", unique=True, verbose_name="Fecha"
+                    ),
+                ),
+                (
+                    "available_seconds",
+                    models.PositiveIntegerField(
+                        db_column="available-seconds",
+                        default=0,
+                        verbose_name="Segundos Disponibles",
+                    ),
+                ),
+                (
+                    "is_work_day",
+                    models.BooleanField(
+                        db_column="is-work-day",
+                        default=False,
+                        verbose_name="Es Día Hábil",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Capacidad Diaria",
+                "verbose_name_plural": "Capacidades Diarias",
+                "db_table": "daily-capacity",
+                "ordering": ["capacity_date"],
+            },
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.0.14 on 2026-10-17 04:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0006_dailycapacity"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dailycapacity",
+            name="client_name",
+            field=models.ForeignKey(
+                blank=True,
+                db_column="client-name",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="tickets.client",
+                verbose_name="Cliente",
+            ),
+        ),
+        migrations.AddField(
+            model_name="dailycapacity",
+            name="id_services",
+            field=models.ForeignKey(
+                blank=True,
+                db_column="id-services",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="tickets.service",
+                verbose_name="Servicio",
+            ),
+        ),
+        migrations.AddField(
+            model_name="workinghours",
+            name="client_name",
+            field=models.ForeignKey(
+                blank=True,
+                db_column="client-name",
+                help_text="Cliente al que aplica este horario (vacío = todos)",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="tickets.client",
+                verbose_name="Cliente",
+            ),
+        ),
+        migrations.AddField(
+            model_name="workinghours",
+            name="id_services",
+            field=models.ForeignKey(
+                blank=True,
+                db_column="id-services",
+                help_text="Servicio al que aplica este horario (vacío = todos)",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="tickets.service",
+                verbose_name="Servicio",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="dailycapacity",
+            name="capacity_date",
+            field=models.DateField(db_column="capacity-date", verbose_name="Fecha"),
+        ),
+        migrations.AlterField(
+            model_name="workinghours",
+            name="week_day",
+            field=models.CharField(
+                db_column="week-day", max_length=15, verbose_name="Día de la Semana"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="dailycapacity",
+            constraint=models.UniqueConstraint(
+                fields=("client_name", "id_services", "capacity_date"),
+                name="unique_daily_capacity_scope",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="workinghours",
+            constraint=models.UniqueConstraint(
+                fields=("week_day", "client_name", "id_services"),
+                name="unique_working_hours_scope",
+            ),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.14 on 2026-10-17 04:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0007_calendar_scopes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="status",
+            name="pauses_sla",
+            field=models.BooleanField(
+                db_column="pauses-sla",
+                default=False,
+                help_text="Indica si el tiempo en este estado no cuenta para el ANS (ej. en espera del cliente)",
+                verbose_name="Pausa el ANS",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="sla_paused_seconds",
+            field=models.PositiveIntegerField(
+                db_column="sla-paused-seconds",
+                default=0,
+                help_text="Tiempo hábil acumulado en estados que pausan el ANS",
+                verbose_name="Segundos Hábiles en Pausa",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="sla_paused_since",
+            field=models.DateTimeField(
+                blank=True,
+                db_column="sla-paused-since",
+                help_text="Momento en que el ticket entró al estado que pausa el ANS",
+                null=True,
+                verbose_name="En Pausa Desde",
+            ),
+        ),
+    ]
@@ -0,0 +1,142 @@
+# Generated by Django 5.0.14 on 2026-10-17 04:10
+
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0008_sla_pause"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReportJob",
+            fields=[
+                (
+                    "id_report_job",
+                    models.UUIDField(
+                        db_column="id-report-job",
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID del Reporte",
+                    ),
+                ),
+                (
+                    "report_type",
+                    models.CharField(
+                        choices=[
+                            ("reporte-general", "Reporte general"),
+                            ("reporte-driver", "Reporte driver"),
+                        ],
+                        db_column="report-type",
+                        max_length=30,
+                        verbose_name="Tipo de Reporte",
+                    ),
+                ),
+                (
+                    "result_format",
+                    models.CharField(
+                        choices=[("csv", "CSV"), ("json", "JSON")],
+                        db_column="result-format",
+                        default="csv",
+                        max_length=10,
+                        verbose_name="Formato del Resultado",
+                    ),
+                ),
+                ("params", models.JSONField(default=dict, verbose_name="Parámetros")),
+                (
+                    "params_hash",
+                    models.CharField(
+                        db_column="params-hash",
+                        help_text="Tipo, formato y parámetros normalizados para reutilizar reportes",
+                        max_length=64,
+                        verbose_name="Hash de Parámetros",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pendiente"),
+                            ("running", "En proceso"),
+                            ("done", "Terminado"),
+                            ("failed", "Fallido"),
+                        ],
+                        default="pending",
+                        max_length=15,
+                        verbose_name="Estado",
+                    ),
+                ),
+                (
+                    "result_file",
+                    models.CharField(
+                        blank=True,
+                        db_column="result-file",
+                        default="",
+                        help_text="Ruta relativa a REPORTS_ROOT",
+                        max_length=255,
+                        verbose_name="Archivo de Resultado",
+                    ),
+                ),
+                (
+                    "row_count",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        db_column="row-count",
+                        null=True,
+                        verbose_name="Cantidad de Filas",
+                    ),
+                ),
+                (
+                    "error_message",
+                    models.TextField(
+                        blank=True,
+                        db_column="error-message",
+                        null=True,
+                        verbose_name="Mensaje de Error",
+                    ),
+                ),
+                (
+                    "requested_by",
+                    models.CharField(
+                        blank=True,
+                        db_column="requested-by",
+                        max_length=150,
+                        null=True,
+                        verbose_name="Solicitado por",
+                    ),
+                ),
+                (
+                    "create_at",
+                    models.DateTimeField(
+                        db_column="create-at",
+                        default=django.utils.timezone.now,
+                        verbose_name="Fecha de Creación",
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True,
+                        db_column="finished-at",
+                        null=True,
+                        verbose_name="Fecha de Finalización",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Reporte en Segundo Plano",
+                "verbose_name_plural": "Reportes en Segundo Plano",
+                "db_table": "report-jobs",
+                "indexes": [
+                    models.Index(
+                        fields=["params_hash", "create_at"], name="report_jobs_hash_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,126 @@
+# Generated by Django 5.0.14 on 2026-10-17 04:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0009_reportjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketDailyStats",
+            fields=[
+                (
+                    "id_ticket_daily_stats",
+                    models.AutoField(
+                        db_column="id-ticket-daily-stats",
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID de la Estadística Diaria",
+                    ),
+                ),
+                (
+                    "stat_date",
+                    models.DateField(
+                        db_column="stat-date",
+                        help_text="Día en la zona horaria del proyecto",
+                        verbose_name="Fecha",
+                    ),
+                ),
+                (
+                    "created",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Tickets creados en el día",
+                        verbose_name="Creados",
+                    ),
+                ),
+                (
+                    "closed",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Tickets cerrados en el día",
+                        verbose_name="Cerrados",
+                    ),
+                ),
+                (
+                    "compliant",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Tickets cerrados en el día dentro del ANS",
+                        verbose_name="Cumplidos",
+                    ),
+                ),
+                (
+                    "overdue",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Tickets cerrados en el día fuera del ANS",
+                        verbose_name="Vencidos",
+                    ),
+                ),
+                (
+                    "assigned_to",
+                    models.ForeignKey(
+                        blank=True,
+                        db_column="assigned-to",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="tickets.euser",
+                        verbose_name="Asignado a",
+                    ),
+                ),
+                (
+                    "client_name",
+                    models.ForeignKey(
+                        blank=True,
+                        db_column="client-name",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="tickets.client",
+                        verbose_name="Cliente",
+                    ),
+                ),
+                (
+                    "id_services",
+                    models.ForeignKey(
+                        db_column="id-services",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="tickets.service",
+                        verbose_name="Servicio",
+                    ),
+                ),
+                (
+                    "status_id",
+                    models.ForeignKey(
+                        db_column="status-id",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="tickets.status",
+                        verbose_name="Estado",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Estadística Diaria de Tickets",
+                "verbose_name_plural": "Estadísticas Diarias de Tickets",
+                "db_table": "ticket-daily-stats",
+                "ordering": ["stat_date"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="ticketdailystats",
+            constraint=models.UniqueConstraint(
+                fields=(
+                    "stat_date",
+                    "client_name",
+                    "id_services",
+                    "status_id",
+                    "assigned_to",
+                ),
+                name="unique_ticket_daily_stats",
+            ),
+        ),
+    ]
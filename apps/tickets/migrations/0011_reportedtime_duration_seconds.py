@@ -0,0 +1,62 @@
+# Generated by Django 5.0.14 on 2026-10-17 04:19
+
+from django.db import migrations, models
+from django.db.models import Max, Min
+from django.db.models.functions import ExtractHour, ExtractMinute, ExtractSecond
+
+CHUNK_SIZE = 5000
+
+
+def populate_duration_seconds(apps, schema_editor):
+    """
+    Calcula duration_seconds desde reported_time en la base de datos, por
+    rangos de id para no bloquear la tabla completa en una sola sentencia
+    """
+    ReportedTime = apps.get_model("tickets", "ReportedTime")
+    bounds = ReportedTime.objects.aggregate(first=Min("pk"), last=Max("pk"))
+    if bounds["first"] is None:
+        return
+    seconds = (
+        ExtractHour("reported_time") * 3600
+        + ExtractMinute("reported_time") * 60
+        + ExtractSecond("reported_time")
+    )
+    for start in range(bounds["first"], bounds["last"] + 1, CHUNK_SIZE):
+        ReportedTime.objects.filter(
+            pk__gte=start, pk__lt=start + CHUNK_SIZE
+        ).update(duration_seconds=seconds)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0010_ticket_daily_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="reportedtime",
+            name="duration_seconds",
+            field=models.PositiveIntegerField(
+                db_column="duration-seconds",
+                default=0,
+                editable=False,
+                help_text="Segundos de reported_time; se calcula al guardar y es el que se suma en los reportes",
+                verbose_name="Duración en Segundos",
+            ),
+        ),
+        migrations.RunPython(populate_duration_seconds, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="reportedtime",
+            index=models.Index(
+                fields=["network_user", "date_reported", "duration_seconds"],
+                name="reported_times_user_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="reportedtime",
+            index=models.Index(
+                fields=["id_ticket", "duration_seconds"],
+                name="reported_times_ticket_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.0.14 on 2026-10-17 04:20
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, Max, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+CHUNK_SIZE = 2000
+
+
+def populate_reported_totals(apps, schema_editor):
+    """
+    Calcula los totales de tiempo reportado de los tickets existentes en la
+    base de datos, por rangos de id
+    """
+    Ticket = apps.get_model("tickets", "Ticket")
+    ReportedTime = apps.get_model("tickets", "ReportedTime")
+    bounds = Ticket.objects.aggregate(first=Min("pk"), last=Max("pk"))
+    if bounds["first"] is None:
+        return
+
+    times = ReportedTime.objects.filter(id_ticket=OuterRef("pk")).order_by().values("id_ticket")
+    seconds = times.annotate(total=Sum("duration_seconds")).values("total")
+    entries = times.annotate(total=Count("pk")).values("total")
+    for start in range(bounds["first"], bounds["last"] + 1, CHUNK_SIZE):
+        Ticket.objects.filter(pk__gte=start, pk__lt=start + CHUNK_SIZE).update(
+            total_reported_seconds=Coalesce(Subquery(seconds, output_field=IntegerField()), 0),
+            reported_entries_count=Coalesce(Subquery(entries, output_field=IntegerField()), 0),
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0011_reportedtime_duration_seconds"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="reported_entries_count",
+            field=models.PositiveIntegerField(
+                db_column="reported-entries-count",
+                default=0,
+                editable=False,
+                verbose_name="Cantidad de Tiempos Reportados",
+            ),
+        ),
+        migrations.AddField(
+            model_name="ticket",
+            name="total_reported_seconds",
+            field=models.PositiveIntegerField(
+                db_column="total-reported-seconds",
+                default=0,
+                editable=False,
+                help_text="Suma de los tiempos reportados del ticket",
+                verbose_name="Segundos Reportados",
+            ),
+        ),
+        migrations.RunPython(populate_reported_totals, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["total_reported_seconds"], name="tickets_reported_seconds_idx"
+            ),
+        ),
+    ]
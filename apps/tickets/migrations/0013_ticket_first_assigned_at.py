@@ -0,0 +1,24 @@
+# Generated by Django 5.0.14 on 2026-10-17 06:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0012_ticket_reported_totals"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="first_assigned_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_column="first-assigned-at",
+                editable=False,
+                help_text="Momento en que el ticket se asignó por primera vez; se registra al guardar",
+                null=True,
+                verbose_name="Fecha de Primera Asignación",
+            ),
+        ),
+    ]
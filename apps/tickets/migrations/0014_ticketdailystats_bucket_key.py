@@ -0,0 +1,95 @@
+# Generated by Django 5.0.14 on 2026-10-17 07:05
+
+import json
+from collections import Counter, defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+MEASURES = ("created", "closed", "compliant", "overdue")
+
+
+def rebuild_daily_stats(apps, schema_editor):
+    """
+    Reconstruye toda la tabla diaria desde los tickets existentes, incluida la
+    llave ``bucket_key`` (mismo cálculo que ``daily_stats.rebuild_daily_stats``)
+    """
+    Ticket = apps.get_model("tickets", "Ticket")
+    TicketDailyStats = apps.get_model("tickets", "TicketDailyStats")
+    tz = timezone.get_current_timezone()
+    dimensions = (
+        "sub_program_name__program_name__client_name", "ticket_service", "status_id", "assigned_to",
+    )
+
+    rows = defaultdict(Counter)
+    created = Ticket.objects.annotate(
+        day=TruncDate("create_at", tzinfo=tz)
+    ).values_list("day", *dimensions).annotate(total=Count("id_ticket")).order_by()
+    for *key, total in created:
+        rows[tuple(key)]["created"] += total
+
+    closed = Ticket.objects.filter(closing_date__isnull=False).annotate(
+        day=TruncDate("closing_date", tzinfo=tz)
+    ).values_list("day", *dimensions).annotate(
+        total=Count("id_ticket"),
+        compliant=Count("id_ticket", filter=Q(cumplimiento=True)),
+        overdue=Count("id_ticket", filter=Q(cumplimiento=False)),
+    ).order_by()
+    for *key, total, compliant, overdue in closed:
+        measures = rows[tuple(key)]
+        measures["closed"] += total
+        measures["compliant"] += compliant
+        measures["overdue"] += overdue
+
+    TicketDailyStats.objects.all().delete()
+    TicketDailyStats.objects.bulk_create(
+        [
+            TicketDailyStats(
+                stat_date=stat_date,
+                client_name_id=client,
+                id_services_id=service,
+                status_id_id=status,
+                assigned_to_id=assigned,
+                bucket_key=json.dumps([stat_date.isoformat(), client, service, status, assigned]),
+                **{measure: measures[measure] for measure in MEASURES},
+            )
+            for (stat_date, client, service, status, assigned), measures in rows.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tickets", "0013_ticket_first_assigned_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticketdailystats",
+            name="bucket_key",
+            field=models.CharField(
+                db_column="bucket-key",
+                editable=False,
+                max_length=200,
+                null=True,
+                verbose_name="Llave de la Fila",
+            ),
+        ),
+        migrations.RunPython(rebuild_daily_stats, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="ticketdailystats",
+            name="bucket_key",
+            field=models.CharField(
+                db_column="bucket-key",
+                editable=False,
+                help_text="Fecha y dimensiones de la fila; a diferencia de las columnas, "
+                "los valores vacíos también cuentan en la restricción única",
+                max_length=200,
+                unique=True,
+                verbose_name="Llave de la Fila",
+            ),
+        ),
+    ]
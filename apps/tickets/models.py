@@ -1,5 +1,8 @@
+import uuid
+
 from django.db import models
 from django.utils import timezone
+from django.utils.dateparse import parse_time
 
 
 class Client(models.Model):
@@ -301,6 +304,13 @@ class ANS(models.Model):
         db_column='ans-description',
         verbose_name='Descripción del ANS'
     )
+    ans_hours = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        db_column='ans-hours',
+        verbose_name='Horas del ANS',
+        help_text='Horas hábiles disponibles para cerrar el ticket'
+    )
 
     class Meta:
         db_table = 'ans'
@@ -387,6 +397,15 @@ class Status(models.Model):
         db_column='ordering',
         null=True,
     )
+    pauses_sla = models.BooleanField(
+        default=False,
+        db_column='pauses-sla',
+        verbose_name='Pausa el ANS',
+        help_text=(
+            'Indica si el tiempo en este estado no cuenta para el ANS '
+            '(ej. en espera del cliente)'
+        )
+    )
 
     class Meta:
         db_table = 'status'
@@ -474,6 +493,14 @@ class Ticket(models.Model):
         verbose_name='Asignado a',
         related_name='assigned_tickets'
     )
+    first_assigned_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_column='first-assigned-at',
+        verbose_name='Fecha de Primera Asignación',
+        help_text='Momento en que el ticket se asignó por primera vez; se registra al guardar'
+    )
     closing_date = models.DateTimeField(
         null=True,
         blank=True,
@@ -493,6 +520,19 @@ class Ticket(models.Model):
         verbose_name='Cumplimiento',
         help_text='Indica si el ticket cumple con las métricas establecidas'
     )
+    sla_paused_seconds = models.PositiveIntegerField(
+        default=0,
+        db_column='sla-paused-seconds',
+        verbose_name='Segundos Hábiles en Pausa',
+        help_text='Tiempo hábil acumulado en estados que pausan el ANS'
+    )
+    sla_paused_since = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_column='sla-paused-since',
+        verbose_name='En Pausa Desde',
+        help_text='Momento en que el ticket entró al estado que pausa el ANS'
+    )
     status_id = models.ForeignKey(
         Status,
         on_delete=models.PROTECT,
@@ -505,15 +545,72 @@ class Ticket(models.Model):
         db_column='sub-program-name',
         verbose_name='Sub-programa'
     )
+    total_reported_seconds = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        db_column='total-reported-seconds',
+        verbose_name='Segundos Reportados',
+        help_text='Suma de los tiempos reportados del ticket'
+    )
+    reported_entries_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        db_column='reported-entries-count',
+        verbose_name='Cantidad de Tiempos Reportados'
+    )
+
+    # Se actualizan con F() desde las señales de ReportedTime; un save del
+    # ticket en memoria no debe sobrescribirlos con valores anteriores
+    REPORTED_TOTAL_FIELDS = ('total_reported_seconds', 'reported_entries_count')
 
     class Meta:
         db_table = 'tickets'
         verbose_name = 'Ticket'
         verbose_name_plural = 'Tickets'
+        indexes = [
+            models.Index(fields=['total_reported_seconds'], name='tickets_reported_seconds_idx'),
+        ]
 
     def __str__(self):
         return f'Ticket #{self.id_ticket} - {self.ticket_title}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Asignado con el que se cargó, para registrar solo la primera asignación
+        instance._loaded_assigned_to_id = instance.__dict__.get('assigned_to_id', models.DEFERRED)
+        return instance
+
+    def _is_first_assignment(self) -> bool:
+        """
+        El ticket pasa de no tener asignado a tenerlo (o se crea asignado).
+        Los tickets asignados antes de existir ``first_assigned_at`` no se
+        marcan al guardarlos de nuevo.
+        """
+        if not self.assigned_to_id or self.first_assigned_at is not None:
+            return False
+        if self._state.adding:
+            return True
+        return getattr(self, '_loaded_assigned_to_id', models.DEFERRED) is None
+
+    def save(self, *args, **kwargs):
+        if self._is_first_assignment():
+            self.first_assigned_at = timezone.now()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'first_assigned_at'}
+        if (
+            not self._state.adding
+            and kwargs.get('update_fields') is None
+            and not kwargs.get('force_insert')
+        ):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.REPORTED_TOTAL_FIELDS
+            ]
+        super().save(*args, **kwargs)
+        self._loaded_assigned_to_id = self.assigned_to_id
+
 
 class ReportedTime(models.Model):
     """
@@ -532,6 +629,16 @@ class ReportedTime(models.Model):
         db_column='reported-time',
         verbose_name='Tiempo Reportado'
     )
+    duration_seconds = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        db_column='duration-seconds',
+        verbose_name='Duración en Segundos',
+        help_text=(
+            'Segundos de reported_time; se calcula al guardar y es el que se suma '
+            'en los reportes'
+        )
+    )
     id_ticket = models.ForeignKey(
         Ticket,
         on_delete=models.PROTECT,
@@ -562,10 +669,35 @@ class ReportedTime(models.Model):
         db_table = 'reported-times'
         verbose_name = 'Tiempo Reportado'
         verbose_name_plural = 'Tiempos Reportados'
+        indexes = [
+            # Cubren las sumas de ocupación (usuario y rango) y de cada ticket
+            # sin leer las filas de la tabla
+            models.Index(
+                fields=['network_user', 'date_reported', 'duration_seconds'],
+                name='reported_times_user_date_idx'
+            ),
+            models.Index(
+                fields=['id_ticket', 'duration_seconds'],
+                name='reported_times_ticket_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'Tiempo #{self.id_reported_times} - Ticket {self.id_ticket.id_ticket}'
 
+    def save(self, *args, **kwargs):
+        reported_time = self.reported_time
+        if isinstance(reported_time, str):
+            reported_time = parse_time(reported_time)
+        self.duration_seconds = (
+            reported_time.hour * 3600 + reported_time.minute * 60 + reported_time.second
+            if reported_time else 0
+        )
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'reported_time' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'duration_seconds'}
+        super().save(*args, **kwargs)
+
 
 class Note(models.Model):
     """
@@ -619,6 +751,11 @@ class Note(models.Model):
         return f'Nota #{self.id_note} - Ticket {self.id_ticket.id_ticket}'
 
 class WorkingHours(models.Model):
+    """
+    Modelo para representar el horario laboral de un día de la semana.
+    Sin cliente ni servicio es el horario general; con cliente y/o servicio
+    es un calendario propio que reemplaza al general para ese alcance.
+    """
     id_working_hours = models.AutoField(
         primary_key=True,
         db_column='id-working-hours',
@@ -627,8 +764,7 @@ class WorkingHours(models.Model):
     week_day = models.CharField(
         max_length=15,
         db_column='week-day',
-        verbose_name='Día de la Semana',
-        unique=True
+        verbose_name='Día de la Semana'
     )
     start_time = models.TimeField(
         db_column='start-time',
@@ -638,11 +774,351 @@ class WorkingHours(models.Model):
         db_column='end-time',
         verbose_name='Hora de Fin'
     )
+    client_name = models.ForeignKey(
+        Client,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        db_column='client-name',
+        verbose_name='Cliente',
+        help_text='Cliente al que aplica este horario (vacío = todos)'
+    )
+    id_services = models.ForeignKey(
+        Service,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        db_column='id-services',
+        verbose_name='Servicio',
+        help_text='Servicio al que aplica este horario (vacío = todos)'
+    )
     
     class Meta:
         db_table = 'working-hours'
         verbose_name = 'Horas Laborales'
         verbose_name_plural = 'Horas Laborales'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['week_day', 'client_name', 'id_services'],
+                name='unique_working_hours_scope'
+            ),
+        ]
+
+    def __str__(self):
+        return f'Horas Laborales #{self.id_working_hours} - {self.week_day}'
+
+
+class Holiday(models.Model):
+    """
+    Modelo para representar los días festivos usados en el calendario laboral
+    """
+    SOURCE_API = 'api'
+    SOURCE_OFFLINE = 'offline'
+    SOURCE_MANUAL = 'manual'
+    SOURCE_CHOICES = [
+        (SOURCE_API, 'API'),
+        (SOURCE_OFFLINE, 'Archivo local'),
+        (SOURCE_MANUAL, 'Manual'),
+    ]
+
+    id_holiday = models.AutoField(
+        primary_key=True,
+        db_column='id-holiday',
+        verbose_name='ID del Festivo'
+    )
+    holiday_date = models.DateField(
+        unique=True,
+        db_column='holiday-date',
+        verbose_name='Fecha del Festivo'
+    )
+    holiday_name = models.CharField(
+        max_length=100,
+        null=True,
+        blank=True,
+        db_column='holiday-name',
+        verbose_name='Nombre del Festivo'
+    )
+    source = models.CharField(
+        max_length=15,
+        choices=SOURCE_CHOICES,
+        default=SOURCE_MANUAL,
+        verbose_name='Origen'
+    )
+    update_at = models.DateTimeField(
+        auto_now=True,
+        db_column='update-at',
+        verbose_name='Fecha de Actualización'
+    )
+
+    class Meta:
+        db_table = 'holidays'
+        verbose_name = 'Festivo'
+        verbose_name_plural = 'Festivos'
+        ordering = ['holiday_date']
+
+    def __str__(self):
+        return f'{self.holiday_date} - {self.holiday_name or "Festivo"}'
+
+
+class DailyCapacity(models.Model):
+    """
+    Modelo con la capacidad laboral precalculada de cada día del calendario
+    (horario de WorkingHours menos festivos y descansos)
+    """
+    id_daily_capacity = models.AutoField(
+        primary_key=True,
+        db_column='id-daily-capacity',
+        verbose_name='ID de la Capacidad Diaria'
+    )
+    capacity_date = models.DateField(
+        db_column='capacity-date',
+        verbose_name='Fecha'
+    )
+    available_seconds = models.PositiveIntegerField(
+        default=0,
+        db_column='available-seconds',
+        verbose_name='Segundos Disponibles'
+    )
+    is_work_day = models.BooleanField(
+        default=False,
+        db_column='is-work-day',
+        verbose_name='Es Día Hábil'
+    )
+    client_name = models.ForeignKey(
+        Client,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        db_column='client-name',
+        verbose_name='Cliente'
+    )
+    id_services = models.ForeignKey(
+        Service,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        db_column='id-services',
+        verbose_name='Servicio'
+    )
+
+    class Meta:
+        db_table = 'daily-capacity'
+        verbose_name = 'Capacidad Diaria'
+        verbose_name_plural = 'Capacidades Diarias'
+        ordering = ['capacity_date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['client_name', 'id_services', 'capacity_date'],
+                name='unique_daily_capacity_scope'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.capacity_date} - {self.available_seconds}s'
+
+
+class TicketDailyStats(models.Model):
+    """
+    Modelo con los conteos diarios de tickets por cliente, servicio, estado y
+    usuario asignado. Se mantiene desde las señales de Ticket y se puede
+    reconstruir con el comando rebuild_ticket_daily_stats.
+    """
+    id_ticket_daily_stats = models.AutoField(
+        primary_key=True,
+        db_column='id-ticket-daily-stats',
+        verbose_name='ID de la Estadística Diaria'
+    )
+    stat_date = models.DateField(
+        db_column='stat-date',
+        verbose_name='Fecha',
+        help_text='Día en la zona horaria del proyecto'
+    )
+    client_name = models.ForeignKey(
+        Client,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        db_column='client-name',
+        verbose_name='Cliente'
+    )
+    id_services = models.ForeignKey(
+        Service,
+        on_delete=models.CASCADE,
+        db_column='id-services',
+        verbose_name='Servicio'
+    )
+    status_id = models.ForeignKey(
+        Status,
+        on_delete=models.CASCADE,
+        db_column='status-id',
+        verbose_name='Estado'
+    )
+    assigned_to = models.ForeignKey(
+        EUser,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        db_column='assigned-to',
+        verbose_name='Asignado a'
+    )
+    bucket_key = models.CharField(
+        max_length=200,
+        unique=True,
+        editable=False,
+        db_column='bucket-key',
+        verbose_name='Llave de la Fila',
+        help_text='Fecha y dimensiones de la fila; a diferencia de las columnas, '
+                  'los valores vacíos también cuentan en la restricción única'
+    )
+    created = models.IntegerField(
+        default=0,
+        verbose_name='Creados',
+        help_text='Tickets creados en el día'
+    )
+    closed = models.IntegerField(
+        default=0,
+        verbose_name='Cerrados',
+        help_text='Tickets cerrados en el día'
+    )
+    compliant = models.IntegerField(
+        default=0,
+        verbose_name='Cumplidos',
+        help_text='Tickets cerrados en el día dentro del ANS'
+    )
+    overdue = models.IntegerField(
+        default=0,
+        verbose_name='Vencidos',
+        help_text='Tickets cerrados en el día fuera del ANS'
+    )
+
+    class Meta:
+        db_table = 'ticket-daily-stats'
+        verbose_name = 'Estadística Diaria de Tickets'
+        verbose_name_plural = 'Estadísticas Diarias de Tickets'
+        ordering = ['stat_date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['stat_date', 'client_name', 'id_services', 'status_id', 'assigned_to'],
+                name='unique_ticket_daily_stats'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.stat_date} - {self.created} creados / {self.closed} cerrados'
+
+
+class ReportJob(models.Model):
+    """
+    Modelo para representar un reporte calculado en segundo plano (Celery)
+    cuyo resultado se guarda comprimido en REPORTS_ROOT
+    """
+    TYPE_GENERAL = 'reporte-general'
+    TYPE_DRIVER = 'reporte-driver'
+    TYPE_CHOICES = [
+        (TYPE_GENERAL, 'Reporte general'),
+        (TYPE_DRIVER, 'Reporte driver'),
+    ]
+
+    FORMAT_CSV = 'csv'
+    FORMAT_JSON = 'json'
+    FORMAT_CHOICES = [
+        (FORMAT_CSV, 'CSV'),
+        (FORMAT_JSON, 'JSON'),
+    ]
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pendiente'),
+        (STATUS_RUNNING, 'En proceso'),
+        (STATUS_DONE, 'Terminado'),
+        (STATUS_FAILED, 'Fallido'),
+    ]
+
+    id_report_job = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        db_column='id-report-job',
+        verbose_name='ID del Reporte'
+    )
+    report_type = models.CharField(
+        max_length=30,
+        choices=TYPE_CHOICES,
+        db_column='report-type',
+        verbose_name='Tipo de Reporte'
+    )
+    result_format = models.CharField(
+        max_length=10,
+        choices=FORMAT_CHOICES,
+        default=FORMAT_CSV,
+        db_column='result-format',
+        verbose_name='Formato del Resultado'
+    )
+    params = models.JSONField(
+        default=dict,
+        verbose_name='Parámetros'
+    )
+    params_hash = models.CharField(
+        max_length=64,
+        db_column='params-hash',
+        verbose_name='Hash de Parámetros',
+        help_text='Tipo, formato y parámetros normalizados para reutilizar reportes'
+    )
+    status = models.CharField(
+        max_length=15,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        verbose_name='Estado'
+    )
+    result_file = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        db_column='result-file',
+        verbose_name='Archivo de Resultado',
+        help_text='Ruta relativa a REPORTS_ROOT'
+    )
+    row_count = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        db_column='row-count',
+        verbose_name='Cantidad de Filas'
+    )
+    error_message = models.TextField(
+        null=True,
+        blank=True,
+        db_column='error-message',
+        verbose_name='Mensaje de Error'
+    )
+    requested_by = models.CharField(
+        max_length=150,
+        null=True,
+        blank=True,
+        db_column='requested-by',
+        verbose_name='Solicitado por'
+    )
+    create_at = models.DateTimeField(
+        default=timezone.now,
+        db_column='create-at',
+        verbose_name='Fecha de Creación'
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_column='finished-at',
+        verbose_name='Fecha de Finalización'
+    )
+
+    class Meta:
+        db_table = 'report-jobs'
+        verbose_name = 'Reporte en Segundo Plano'
+        verbose_name_plural = 'Reportes en Segundo Plano'
+        indexes = [
+            models.Index(fields=['params_hash', 'create_at'], name='report_jobs_hash_idx'),
+        ]
 
     def __str__(self):
-        return f'Horas Laborales #{self.id_working_hours} - {self.week_day}'
\ No newline at end of file
+        return f'{self.report_type} #{self.id_report_job} - {self.status}'
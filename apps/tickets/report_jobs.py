@@ -0,0 +1,217 @@
+"""
+Reportes pesados calculados fuera de los workers de peticiones.
+
+Un ``ReportJob`` guarda el tipo de reporte y sus parámetros normalizados; la
+tarea ``run_report_job`` lo calcula y deja el resultado comprimido (gzip) en
+``REPORTS_ROOT``. Las peticiones con los mismos parámetros dentro de
+``REPORT_JOB_TTL_MINUTES`` reutilizan el trabajo existente.
+"""
+import csv
+import gzip
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ReportJob
+from .reporting import DriverReport, general_report_queryset
+from .serializers import TicketReporteDriverSerializer, TicketReporteGeneralSerializer
+
+logger = logging.getLogger(__name__)
+
+REPORT_CHUNK_SIZE = 2000
+
+
+def _general_rows(params, chunk_size=REPORT_CHUNK_SIZE):
+    # Mismo orden que la respuesta JSON del reporte (GENERAL_REPORT_ORDERING)
+    queryset = general_report_queryset(params)
+    serializer = TicketReporteGeneralSerializer()
+    rows = (
+        serializer.to_representation(ticket)
+        for ticket in queryset.iterator(chunk_size=chunk_size)
+    )
+    return list(serializer.fields), rows
+
+
+def _driver_rows(params, chunk_size=REPORT_CHUNK_SIZE):
+    report = DriverReport(params)
+    serializer = TicketReporteDriverSerializer()
+    rows = (
+        serializer.to_representation(result)
+        for result in report.iter_results(chunk_size)
+    )
+    return list(serializer.fields), rows
+
+
+# report_type -> (parámetros aceptados, función que retorna (columnas, filas))
+REPORT_TYPES = {
+    ReportJob.TYPE_GENERAL: (
+        ('fecha_desde', 'fecha_hasta', 'cliente', 'id_servicio', 'network_user', 'cumple'),
+        _general_rows,
+    ),
+    ReportJob.TYPE_DRIVER: (
+        ('fecha_desde', 'fecha_hasta', 'cliente', 'network_user'),
+        _driver_rows,
+    ),
+}
+
+
+def report_rows(report_type, params, chunk_size=REPORT_CHUNK_SIZE):
+    """
+    Retorna (columnas, filas) de un reporte completo. Las filas son un
+    iterador de diccionarios que se consulta por bloques.
+    Los parámetros inválidos lanzan ``ReportParamsError`` antes de iterar.
+    """
+    _, build = REPORT_TYPES[report_type]
+    return build(params, chunk_size)
+
+
+def normalize_params(report_type, params) -> dict:
+    """
+    Solo los parámetros que acepta el reporte, sin valores vacíos y como texto
+    """
+    accepted, _ = REPORT_TYPES[report_type]
+    return {
+        key: str(params[key]).strip()
+        for key in accepted
+        if params.get(key) not in (None, '')
+    }
+
+
+def params_hash(report_type, result_format, params) -> str:
+    payload = json.dumps([report_type, result_format, params], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def request_report_job(report_type, result_format, params, requested_by=None):
+    """
+    Retorna (trabajo, creado) para un reporte. Si el mismo usuario tiene un
+    trabajo con los mismos parámetros creado dentro del TTL que no haya
+    fallado se reutiliza (salvo que siga pendiente después de
+    REPORT_JOB_PENDING_MINUTES, porque ningún worker lo tomó); si no, se crea
+    uno y se encola su cálculo al confirmar la transacción.
+
+    Los parámetros se validan antes de crear el trabajo (``ReportParamsError``).
+    """
+    params = normalize_params(report_type, params)
+    report_rows(report_type, params)
+
+    digest = params_hash(report_type, result_format, params)
+    now = timezone.now()
+    since = now - timedelta(minutes=settings.REPORT_JOB_TTL_MINUTES)
+    pending_since = now - timedelta(minutes=settings.REPORT_JOB_PENDING_MINUTES)
+    job = ReportJob.objects.filter(
+        params_hash=digest, requested_by=requested_by, create_at__gte=since
+    ).exclude(
+        status=ReportJob.STATUS_FAILED
+    ).exclude(
+        status=ReportJob.STATUS_PENDING, create_at__lt=pending_since
+    ).order_by('-create_at').first()
+    if job is not None:
+        return job, False
+
+    job = ReportJob.objects.create(
+        report_type=report_type,
+        result_format=result_format,
+        params=params,
+        params_hash=digest,
+        requested_by=requested_by,
+    )
+    transaction.on_commit(lambda: _enqueue_job(job))
+    return job, True
+
+
+def _enqueue_job(job):
+    """
+    Encola el cálculo de un trabajo; si no se puede (ej. el broker no
+    responde) el trabajo queda fallido para que no se reutilice
+    """
+    from .tasks import run_report_job
+
+    try:
+        run_report_job.delay(str(job.pk))
+    except Exception as e:
+        logger.exception(f'No se pudo encolar el reporte {job.pk}')
+        ReportJob.objects.filter(pk=job.pk, status=ReportJob.STATUS_PENDING).update(
+            status=ReportJob.STATUS_FAILED,
+            error_message=f'No se pudo encolar el reporte: {e}',
+            finished_at=timezone.now(),
+        )
+
+
+def result_path(job) -> Path:
+    return Path(settings.REPORTS_ROOT) / job.result_file
+
+
+def _write_csv(handler, headers, rows) -> int:
+    writer = csv.writer(handler)
+    writer.writerow(headers)
+    count = 0
+    for row in rows:
+        writer.writerow([row.get(header) for header in headers])
+        count += 1
+    return count
+
+
+def _write_json(handler, headers, rows) -> int:
+    # Se escribe un arreglo fila por fila para no armarlo completo en memoria
+    handler.write('[')
+    count = 0
+    for row in rows:
+        if count:
+            handler.write(',')
+        handler.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False))
+        count += 1
+    handler.write(']')
+    return count
+
+
+def run_job(job):
+    """
+    Calcula el reporte de un trabajo y guarda el archivo comprimido
+    """
+    job.status = ReportJob.STATUS_RUNNING
+    job.save(update_fields=['status'])
+
+    relative = f'{job.pk}.{job.result_format}.gz'
+    path = Path(settings.REPORTS_ROOT) / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        headers, rows = report_rows(job.report_type, job.params)
+        write = _write_csv if job.result_format == ReportJob.FORMAT_CSV else _write_json
+        with gzip.open(path, 'wt', encoding='utf-8', newline='') as handler:
+            row_count = write(handler, headers, rows)
+    except Exception as e:
+        logger.exception(f'Error al generar el reporte {job.pk}')
+        path.unlink(missing_ok=True)
+        job.status = ReportJob.STATUS_FAILED
+        job.error_message = str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error_message', 'finished_at'])
+        return job
+
+    job.status = ReportJob.STATUS_DONE
+    job.result_file = relative
+    job.row_count = row_count
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'result_file', 'row_count', 'finished_at'])
+    return job
+
+
+def purge_report_jobs(days=None) -> int:
+    """
+    Elimina los trabajos (y sus archivos) creados hace más de ``days`` días
+    (por defecto ``REPORT_JOB_RETENTION_DAYS``). Retorna la cantidad eliminada.
+    """
+    days = settings.REPORT_JOB_RETENTION_DAYS if days is None else days
+    jobs = ReportJob.objects.filter(create_at__lt=timezone.now() - timedelta(days=days))
+    for job in jobs.exclude(result_file=''):
+        result_path(job).unlink(missing_ok=True)
+    deleted, _ = jobs.delete()
+    return deleted
@@ -0,0 +1,61 @@
+"""
+Totales de tiempo reportado guardados en cada ticket
+(``Ticket.total_reported_seconds`` y ``Ticket.reported_entries_count``).
+
+Las señales de ReportedTime los ajustan con ``F()`` en la misma transacción
+del cambio, así que no se pierden escrituras concurrentes; si quedan
+desalineados (ej. escrituras con ``QuerySet.update``) se corrigen con
+``reconcile_reported_totals``.
+"""
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from core.utils.cache_versions import bump_version
+
+from .models import ReportedTime, Ticket
+from .reporting import ticket_reported_seconds
+from .stats import REPORTED_TIMES_VERSION
+
+
+def add_reported_time(ticket_id, seconds, entries):
+    """
+    Suma ``seconds`` y ``entries`` (pueden ser negativos) a los totales de un ticket
+    """
+    if ticket_id is None or (not seconds and not entries):
+        return
+    Ticket.objects.filter(pk=ticket_id).update(
+        total_reported_seconds=F('total_reported_seconds') + seconds,
+        reported_entries_count=F('reported_entries_count') + entries,
+    )
+
+
+def _entries_count():
+    counts = ReportedTime.objects.filter(
+        id_ticket=OuterRef('pk')
+    ).order_by().values('id_ticket').annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def reconcile_reported_totals(chunk_size=2000) -> int:
+    """
+    Recalcula los totales de los tickets que no coinciden con sus tiempos
+    reportados, por bloques, e invalida los reportes en cache si corrigió
+    alguno. Retorna la cantidad de tickets corregidos.
+    """
+    mismatched = Ticket.objects.annotate(
+        expected_seconds=ticket_reported_seconds(),
+        expected_entries=_entries_count(),
+    ).filter(
+        ~Q(total_reported_seconds=F('expected_seconds'))
+        | ~Q(reported_entries_count=F('expected_entries'))
+    ).order_by('pk').values_list('pk', flat=True)
+
+    ids = list(mismatched)
+    for start in range(0, len(ids), chunk_size):
+        Ticket.objects.filter(pk__in=ids[start:start + chunk_size]).update(
+            total_reported_seconds=ticket_reported_seconds(),
+            reported_entries_count=_entries_count(),
+        )
+    if ids:
+        bump_version(REPORTED_TIMES_VERSION)
+    return len(ids)
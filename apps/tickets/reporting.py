@@ -0,0 +1,648 @@
+"""
+Expresiones y consultas compartidas por los reportes y métricas de tickets
+"""
+from collections import defaultdict
+from datetime import datetime, time as dt_time, timedelta
+from itertools import islice
+
+from django.db.models import Count, F, IntegerField, Min, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .business_calendar import get_business_calendar, pinned_calendar_versions, resolve_scope
+from .models import ReportedTime, Ticket
+
+
+def reported_seconds(prefix: str = ''):
+    """
+    Expresión SQL con los segundos de un tiempo reportado
+    (``ReportedTime.duration_seconds``).
+    ``prefix`` permite usarla desde otro modelo (ej: 'reportedtime__').
+    """
+    return F(f'{prefix}duration_seconds')
+
+
+def ticket_reported_seconds(ticket_ref: str = 'pk'):
+    """
+    Subconsulta correlacionada con el total de segundos reportados de un ticket
+    (0 si no tiene tiempos). ``ticket_ref`` es la referencia al ticket en la
+    consulta externa.
+    """
+    totals = ReportedTime.objects.filter(
+        id_ticket=OuterRef(ticket_ref)
+    ).order_by().values('id_ticket').annotate(
+        total=Sum(reported_seconds())
+    ).values('total')
+    return Coalesce(Subquery(totals, output_field=IntegerField()), 0)
+
+
+def format_duration(total_seconds) -> str:
+    """
+    Formatea segundos como HH:MM:SS (las horas pueden superar 24)
+    """
+    hours, remainder = divmod(int(total_seconds), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f'{hours:02}:{minutes:02}:{seconds:02}'
+
+
+class ReportParamsError(ValueError):
+    """
+    Parámetros inválidos de un reporte; el mensaje se muestra al usuario
+    """
+
+
+def parse_report_dates(params):
+    """
+    Retorna (fecha_desde, fecha_hasta) como fechas desde los parámetros
+    obligatorios ``fecha_desde`` y ``fecha_hasta`` (YYYY-MM-DD)
+    """
+    fecha_desde_str = params.get('fecha_desde')
+    fecha_hasta_str = params.get('fecha_hasta')
+    if not fecha_desde_str or not fecha_hasta_str:
+        raise ReportParamsError('Los parámetros fecha_desde y fecha_hasta son obligatorios')
+    try:
+        return (
+            datetime.strptime(fecha_desde_str, '%Y-%m-%d').date(),
+            datetime.strptime(fecha_hasta_str, '%Y-%m-%d').date(),
+        )
+    except ValueError:
+        raise ReportParamsError('Formato de fecha inválido. Use YYYY-MM-DD')
+
+
+def parse_metric_range(params):
+    """
+    Retorna (fecha_desde, fecha_hasta) como datetimes locales desde los
+    parámetros opcionales ``fecha_desde`` (por defecto el día 1 del mes
+    actual, 00:00:00) y ``fecha_hasta`` (por defecto hoy, 23:59:59.999999)
+    """
+    now = timezone.now()
+    try:
+        fecha_desde_str = params.get('fecha_desde')
+        if fecha_desde_str:
+            fecha_desde = datetime.strptime(fecha_desde_str, '%Y-%m-%d')
+            fecha_desde = timezone.make_aware(datetime.combine(fecha_desde.date(), dt_time.min))
+        else:
+            fecha_desde = timezone.make_aware(datetime(now.year, now.month, 1, 0, 0, 0))
+    except ValueError:
+        raise ReportParamsError('Formato de fecha_desde inválido. Use YYYY-MM-DD')
+
+    try:
+        fecha_hasta_str = params.get('fecha_hasta')
+        if fecha_hasta_str:
+            fecha_hasta = datetime.strptime(fecha_hasta_str, '%Y-%m-%d')
+            fecha_hasta = timezone.make_aware(datetime.combine(fecha_hasta.date(), dt_time.max))
+        else:
+            fecha_hasta = timezone.make_aware(datetime.combine(now.date(), dt_time.max))
+    except ValueError:
+        raise ReportParamsError('Formato de fecha_hasta inválido. Use YYYY-MM-DD')
+
+    return fecha_desde, fecha_hasta
+
+
+# Orden natural de las filas del reporte general; la última columna es única
+GENERAL_REPORT_ORDERING = ('create_at', 'id_ticket')
+
+
+def general_report_queryset(params):
+    """
+    Tickets del reporte general con el total de segundos reportados anotado
+    (``tiempo_total_segundos``, el total guardado en el ticket).
+
+    Parámetros: fecha_desde, fecha_hasta (por create_at, inclusive), cliente,
+    id_servicio, network_user (asignado) y cumple (true / false).
+    """
+    fecha_desde, fecha_hasta = parse_report_dates(params)
+
+    queryset = Ticket.objects.select_related(
+        'ticket_service',
+        'assigned_to',
+        'sub_program_name__program_name__client_name',
+    ).filter(
+        create_at__gte=timezone.make_aware(datetime.combine(fecha_desde, dt_time.min)),
+        create_at__lte=timezone.make_aware(datetime.combine(fecha_hasta, dt_time.max)),
+    ).annotate(
+        tiempo_total_segundos=F('total_reported_seconds'),
+    )
+
+    cliente = params.get('cliente')
+    if cliente:
+        queryset = queryset.filter(
+            sub_program_name__program_name__client_name__client_name=cliente
+        )
+
+    id_servicio = params.get('id_servicio')
+    if id_servicio:
+        try:
+            queryset = queryset.filter(ticket_service__id_services=int(id_servicio))
+        except ValueError:
+            raise ReportParamsError('id_servicio debe ser un número entero')
+
+    network_user = params.get('network_user')
+    if network_user:
+        queryset = queryset.filter(assigned_to__network_user=network_user)
+
+    cumple_str = params.get('cumple')
+    if cumple_str is not None:
+        if cumple_str.lower() == 'true':
+            queryset = queryset.filter(cumplimiento=True)
+        elif cumple_str.lower() == 'false':
+            queryset = queryset.filter(cumplimiento=False)
+        else:
+            raise ReportParamsError('El parámetro cumple debe ser "true" o "false"')
+
+    return queryset.order_by(*GENERAL_REPORT_ORDERING)
+
+
+class DriverReport:
+    """
+    Reporte driver: una fila por ticket con tiempo reportado en el rango,
+    agrupada por usuario asignado y cliente, con los totales por (usuario,
+    cliente) y por usuario calculados en la base de datos.
+
+    Parámetros: fecha_desde, fecha_hasta (por date_reported, inclusive),
+    cliente y network_user (asignado).
+    """
+    CLIENT_FIELD = 'id_ticket__sub_program_name__program_name__client_name'
+    # Orden natural de las filas; la última columna es única
+    ORDERING = ('assigned_user', 'ticket_client', 'id_ticket')
+
+    def __init__(self, params):
+        fecha_desde, fecha_hasta = parse_report_dates(params)
+
+        # All reported times in the period for tickets that have an assigned user.
+        # Filtered by the ticket's assigned_to (not the reporter) so that
+        # user_total_seconds spans all clients correctly. The range is a
+        # half-open interval on local days so the date_reported index is used.
+        self.reported_times = ReportedTime.objects.filter(
+            date_reported__gte=timezone.make_aware(datetime.combine(fecha_desde, dt_time.min)),
+            date_reported__lt=timezone.make_aware(
+                datetime.combine(fecha_hasta + timedelta(days=1), dt_time.min)
+            ),
+            id_ticket__assigned_to__isnull=False,
+        )
+
+        network_user = params.get('network_user')
+        if network_user:
+            self.reported_times = self.reported_times.filter(
+                id_ticket__assigned_to__network_user=network_user
+            )
+
+        # One row per ticket with its reported seconds, grouped in the database.
+        # The client filter applies to the output only (not to the per-user
+        # totals so that user_total_seconds always reflects all clients)
+        rows = self.reported_times
+        cliente = params.get('cliente')
+        if cliente:
+            rows = rows.filter(**{self.CLIENT_FIELD: cliente})
+        self.rows = rows.values(
+            'id_ticket',
+            assigned_user=F('id_ticket__assigned_to'),
+            ticket_client=F(self.CLIENT_FIELD),
+        ).annotate(
+            ticket_seconds=Sum(reported_seconds()),
+        ).order_by(*self.ORDERING)
+
+    def user_totals(self, users=None):
+        """
+        Totales por (usuario, cliente) y por usuario, opcionalmente solo para
+        los usuarios indicados
+        """
+        totals = self.reported_times
+        if users is not None:
+            totals = totals.filter(id_ticket__assigned_to__in=users)
+        user_client_seconds = {
+            (item['assigned_user'], item['ticket_client']): item['total']
+            for item in totals.values(
+                assigned_user=F('id_ticket__assigned_to'),
+                ticket_client=F(self.CLIENT_FIELD),
+            ).annotate(total=Sum(reported_seconds())).order_by()
+        }
+        user_total_seconds = defaultdict(int)
+        for (nu, _), seconds in user_client_seconds.items():
+            user_total_seconds[nu] += seconds
+        return user_client_seconds, user_total_seconds
+
+    def build_results(self, rows, totals=None):
+        """
+        Filas del reporte para ``rows`` (filas de ``self.rows``). Sin ``totals``
+        se calculan solo para los usuarios de esas filas.
+        """
+        if totals is None:
+            totals = self.user_totals({row['assigned_user'] for row in rows})
+        user_client_seconds, user_total_seconds = totals
+
+        tickets = Ticket.objects.select_related('assigned_to').only(
+            'id_ticket', 'ticket_title', 'create_at', 'closing_date',
+            'estimated_closing_date', 'cumplimiento',
+            'assigned_to__name', 'assigned_to__middle_name',
+            'assigned_to__last_name', 'assigned_to__second_last_name',
+        ).in_bulk([row['id_ticket'] for row in rows])
+
+        results = []
+        for row in rows:
+            nu, client_name = row['assigned_user'], row['ticket_client']
+            t_uc = user_client_seconds[(nu, client_name)]
+            t_total = user_total_seconds[nu]
+            porcentaje = round((t_uc / t_total) * 100, 1) if t_total > 0 else 0.0
+
+            ticket = tickets[row['id_ticket']]
+            euser = ticket.assigned_to
+            parts = [euser.name]
+            if euser.middle_name:
+                parts.append(euser.middle_name)
+            parts.append(euser.last_name)
+            if euser.second_last_name:
+                parts.append(euser.second_last_name)
+
+            results.append({
+                'euser_nombre': ' '.join(parts),
+                'network_user': nu,
+                'cliente': client_name,
+                'id_ticket': ticket.id_ticket,
+                'ticket_title': ticket.ticket_title,
+                'fecha_creacion': ticket.create_at,
+                'fecha_cierre': ticket.closing_date,
+                'fecha_estimada_cierre': ticket.estimated_closing_date,
+                'tiempo_ticket': format_duration(row['ticket_seconds']),
+                'tiempo_usuario_cliente': format_duration(t_uc),
+                'porcentaje_cliente': porcentaje,
+                'tiempo_total_usuario': format_duration(t_total),
+                'cumple': ticket.cumplimiento,
+            })
+
+        return results
+
+    def iter_results(self, chunk_size=2000):
+        """
+        Recorre todas las filas del reporte por bloques sin cargarlas en memoria
+        """
+        totals = self.user_totals()
+        rows = self.rows.iterator(chunk_size=chunk_size)
+        while chunk := list(islice(rows, chunk_size)):
+            yield from self.build_results(chunk, totals)
+
+
+class TicketTimeSeries:
+    """
+    Serie de tickets creados, cerrados y cumplidos por periodo (día, semana o
+    mes) en la zona horaria del proyecto.
+
+    Parámetros: fecha_desde, fecha_hasta (inclusive), bucket (day / week /
+    month, por defecto day), agrupar_por (lista separada por comas de
+    cliente, servicio y asignado) y los filtros cliente, id_servicio y
+    network_user (asignado).
+
+    Creados (por create_at) y cerrados (por closing_date) se agrupan en una
+    sola consulta (UNION ALL de dos GROUP BY) sobre rangos semiabiertos, de
+    modo que un año por días cuesta una consulta. Las semanas empiezan el
+    lunes; el primer y el último periodo solo cuentan los días del rango.
+    """
+    BUCKETS = {'day': TruncDay, 'week': TruncWeek, 'month': TruncMonth}
+    DIMENSIONS = {
+        'cliente': 'sub_program_name__program_name__client_name',
+        'servicio': 'ticket_service',
+        'asignado': 'assigned_to',
+    }
+
+    def __init__(self, params):
+        self.fecha_desde, self.fecha_hasta = parse_report_dates(params)
+        if self.fecha_desde > self.fecha_hasta:
+            raise ReportParamsError('fecha_desde debe ser anterior o igual a fecha_hasta')
+
+        self.bucket = params.get('bucket') or 'day'
+        if self.bucket not in self.BUCKETS:
+            raise ReportParamsError('El parámetro bucket debe ser day, week o month')
+
+        agrupar_por = params.get('agrupar_por') or ''
+        self.dimensions = [name.strip() for name in agrupar_por.split(',') if name.strip()]
+        invalid = [name for name in self.dimensions if name not in self.DIMENSIONS]
+        if invalid:
+            raise ReportParamsError(
+                f'agrupar_por solo acepta: {", ".join(self.DIMENSIONS)} '
+                f'(recibido: {", ".join(invalid)})'
+            )
+
+        self.tickets = Ticket.objects.all()
+        cliente = params.get('cliente')
+        if cliente:
+            self.tickets = self.tickets.filter(**{self.DIMENSIONS['cliente']: cliente})
+        id_servicio = params.get('id_servicio')
+        if id_servicio:
+            try:
+                self.tickets = self.tickets.filter(ticket_service=int(id_servicio))
+            except ValueError:
+                raise ReportParamsError('id_servicio debe ser un número entero')
+        network_user = params.get('network_user')
+        if network_user:
+            self.tickets = self.tickets.filter(assigned_to=network_user)
+
+    def _grouped(self, date_field, start, end, **measures):
+        """
+        Conteos de ``date_field`` en [start, end) por periodo y dimensiones
+        """
+        trunc = self.BUCKETS[self.bucket]
+        dimensions = {name: F(self.DIMENSIONS[name]) for name in self.dimensions}
+        return self.tickets.filter(
+            **{f'{date_field}__gte': start, f'{date_field}__lt': end}
+        ).annotate(
+            periodo=trunc(date_field, tzinfo=timezone.get_current_timezone()),
+        ).values('periodo', **dimensions).annotate(**measures).order_by()
+
+    def _periods(self):
+        """
+        Inicio de cada periodo del rango, para completar con ceros los vacíos
+        """
+        if self.bucket == 'week':
+            current = self.fecha_desde - timedelta(days=self.fecha_desde.weekday())
+        elif self.bucket == 'month':
+            current = self.fecha_desde.replace(day=1)
+        else:
+            current = self.fecha_desde
+        while current <= self.fecha_hasta:
+            yield current
+            if self.bucket == 'week':
+                current += timedelta(days=7)
+            elif self.bucket == 'month':
+                current = (current + timedelta(days=32)).replace(day=1)
+            else:
+                current += timedelta(days=1)
+
+    def results(self):
+        """
+        Lista de periodos con creados, cerrados y cumplidos. Sin agrupar_por se
+        incluyen todos los periodos del rango (los vacíos en cero); con
+        agrupar_por solo las combinaciones con tickets.
+        """
+        start = timezone.make_aware(datetime.combine(self.fecha_desde, dt_time.min))
+        end = timezone.make_aware(
+            datetime.combine(self.fecha_hasta + timedelta(days=1), dt_time.min)
+        )
+
+        zero = Value(0, output_field=IntegerField())
+        created = self._grouped(
+            'create_at', start, end,
+            creados=Count('id_ticket'), cerrados=zero, cumplidos=zero,
+        )
+        closed = self._grouped(
+            'closing_date', start, end,
+            creados=zero, cerrados=Count('id_ticket'),
+            cumplidos=Count('id_ticket', filter=Q(cumplimiento=True)),
+        )
+
+        series = defaultdict(lambda: {'creados': 0, 'cerrados': 0, 'cumplidos': 0})
+        for row in created.union(closed, all=True):
+            periodo = row['periodo']
+            if isinstance(periodo, datetime):
+                if timezone.is_aware(periodo):
+                    periodo = timezone.localtime(periodo)
+                periodo = periodo.date()
+            key = (periodo, *(row[name] for name in self.dimensions))
+            for measure in ('creados', 'cerrados', 'cumplidos'):
+                series[key][measure] += row[measure]
+
+        if not self.dimensions:
+            for periodo in self._periods():
+                series[(periodo,)]
+        return [
+            {
+                'periodo': key[0].strftime('%Y-%m-%d'),
+                **dict(zip(self.dimensions, key[1:])),
+                **measures,
+            }
+            for key, measures in sorted(
+                series.items(), key=lambda item: tuple((v is None, v) for v in item[0])
+            )
+        ]
+
+
+class HierarchyRollup:
+    """
+    Totales por cliente, programa y subprograma con subtotales en cada nivel
+    (estilo ROLLUP) y un total general.
+
+    Parámetros: fecha_desde, fecha_hasta (inclusive) y cliente (opcional).
+    Los tickets se cuentan por create_at en el rango; las horas son las de
+    los tiempos reportados (date_reported) en el rango.
+
+    Tickets y tiempos se agrupan por subprograma en una sola consulta (UNION
+    ALL de dos GROUP BY); los subtotales de programa y cliente se suman en
+    memoria sobre esas filas.
+    """
+    LEVELS = (
+        ('sub_program_name__program_name__client_name', 'cliente'),
+        ('sub_program_name__program_name', 'programa'),
+        ('sub_program_name', 'subprograma'),
+    )
+
+    def __init__(self, params):
+        self.fecha_desde, self.fecha_hasta = parse_report_dates(params)
+        self.cliente = params.get('cliente')
+
+    def _rows(self):
+        start = timezone.make_aware(datetime.combine(self.fecha_desde, dt_time.min))
+        end = timezone.make_aware(
+            datetime.combine(self.fecha_hasta + timedelta(days=1), dt_time.min)
+        )
+        zero = Value(0, output_field=IntegerField())
+        client_path = self.LEVELS[0][0]
+
+        tickets = Ticket.objects.filter(create_at__gte=start, create_at__lt=end)
+        reported = ReportedTime.objects.filter(date_reported__gte=start, date_reported__lt=end)
+        if self.cliente:
+            tickets = tickets.filter(**{client_path: self.cliente})
+            reported = reported.filter(**{f'id_ticket__{client_path}': self.cliente})
+
+        tickets = tickets.values(
+            **{name: F(path) for path, name in self.LEVELS}
+        ).annotate(
+            tickets=Count('id_ticket'),
+            cerrados=Count('id_ticket', filter=Q(closing_date__isnull=False)),
+            cumplidos=Count('id_ticket', filter=Q(cumplimiento=True)),
+            segundos=zero,
+        ).order_by()
+        reported = reported.values(
+            **{name: F(f'id_ticket__{path}') for path, name in self.LEVELS}
+        ).annotate(
+            tickets=zero,
+            cerrados=zero,
+            cumplidos=zero,
+            segundos=Sum(reported_seconds()),
+        ).order_by()
+        return tickets.union(reported, all=True)
+
+    @staticmethod
+    def _measures(totals):
+        return {
+            'tickets': totals['tickets'],
+            'cerrados': totals['cerrados'],
+            'cumplidos': totals['cumplidos'],
+            'porcentaje_cumplimiento': (
+                round((totals['cumplidos'] / totals['tickets']) * 100, 2)
+                if totals['tickets'] else 0
+            ),
+            'horas_reportadas': round(totals['segundos'] / 3600, 2),
+        }
+
+    def results(self):
+        """
+        Árbol cliente -> programas -> subprogramas con los totales de cada
+        nodo y el total general
+        """
+        measures = ('tickets', 'cerrados', 'cumplidos', 'segundos')
+        totals = defaultdict(lambda: dict.fromkeys(measures, 0))
+        for row in self._rows():
+            path = (row['cliente'], row['programa'], row['subprograma'])
+            # Un subtotal por cada prefijo de la jerarquía, () es el total general
+            for depth in range(len(path) + 1):
+                node = totals[path[:depth]]
+                for measure in measures:
+                    node[measure] += row[measure] or 0
+
+        def children(prefix):
+            depth = len(prefix)
+            keys = sorted(
+                {key for key in totals if len(key) == depth + 1 and key[:depth] == prefix},
+                key=lambda key: tuple((v is None, v) for v in key)
+            )
+            name = self.LEVELS[depth][1]
+            nodes = []
+            for key in keys:
+                node = {name: key[-1], **self._measures(totals[key])}
+                if depth + 1 < len(self.LEVELS):
+                    node[f'{self.LEVELS[depth + 1][1]}s'] = children(key)
+                nodes.append(node)
+            return nodes
+
+        return {
+            'total': self._measures(totals[()]),
+            'clientes': children(()),
+        }
+
+
+def percentile(values, fraction):
+    """
+    Percentil de una lista ordenada con interpolación lineal entre las dos
+    posiciones vecinas (``fraction`` entre 0 y 1); None si está vacía
+    """
+    if not values:
+        return None
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class ResolutionPercentiles:
+    """
+    Distribución del tiempo de cierre (create_at -> closing_date) y del tiempo
+    hasta la primera asignación (create_at -> first_assigned_at) en horas
+    hábiles, con los percentiles p50, p90 y p99 en general y por servicio,
+    prioridad y cliente.
+
+    Parámetros: fecha_desde, fecha_hasta (inclusive) y los filtros cliente e
+    id_servicio. El tiempo de cierre cuenta los tickets cerrados en el rango
+    y el de asignación los asignados por primera vez en el rango. No hay
+    historial de asignaciones del que derivar ``first_assigned_at``, así que
+    los tickets asignados antes de que se registrara no entran en esa medida.
+
+    Los tickets se leen en una sola consulta recorrida por bloques. Las horas
+    hábiles salen de un ``BusinessHoursIndex`` por calendario que cubre todo
+    el rango, así que cada duración son dos búsquedas y una resta, sin
+    recorrer los días de cada ticket.
+    """
+    PERCENTILES = (('p50', 0.5), ('p90', 0.9), ('p99', 0.99))
+    MEASURES = (
+        ('tiempo_cierre', 'closing_date'),
+        ('tiempo_primera_asignacion', 'first_assigned_at'),
+    )
+    DIMENSIONS = (
+        ('servicio', 'ticket_service__service_name'),
+        ('prioridad', 'ticket_priority__priority_name'),
+        ('cliente', 'sub_program_name__program_name__client_name'),
+    )
+
+    def __init__(self, params, chunk_size=2000):
+        self.fecha_desde, self.fecha_hasta = parse_report_dates(params)
+        if self.fecha_desde > self.fecha_hasta:
+            raise ReportParamsError('fecha_desde debe ser anterior o igual a fecha_hasta')
+        self.chunk_size = chunk_size
+
+        self.start = timezone.make_aware(datetime.combine(self.fecha_desde, dt_time.min))
+        self.end = timezone.make_aware(
+            datetime.combine(self.fecha_hasta + timedelta(days=1), dt_time.min)
+        )
+        in_range = Q()
+        for _, field in self.MEASURES:
+            in_range |= Q(**{f'{field}__gte': self.start, f'{field}__lt': self.end})
+        self.tickets = Ticket.objects.filter(in_range)
+
+        cliente = params.get('cliente')
+        if cliente:
+            self.tickets = self.tickets.filter(**{self.DIMENSIONS[2][1]: cliente})
+        id_servicio = params.get('id_servicio')
+        if id_servicio:
+            try:
+                self.tickets = self.tickets.filter(ticket_service=int(id_servicio))
+            except ValueError:
+                raise ReportParamsError('id_servicio debe ser un número entero')
+
+    def _durations(self):
+        """
+        Genera (dimensiones, {medida: segundos hábiles}) por ticket
+        """
+        first = self.tickets.aggregate(first=Min('create_at'))['first']
+        if first is None:
+            return
+        first_day = timezone.localtime(first).date()
+
+        indexes = {}
+        rows = self.tickets.values_list(
+            'create_at', 'ticket_service', *(field for _, field in self.MEASURES),
+            *(path for _, path in self.DIMENSIONS),
+        ).order_by().iterator(chunk_size=self.chunk_size)
+        for create_at, service, *rest in rows:
+            moments, dimensions = rest[:len(self.MEASURES)], rest[len(self.MEASURES):]
+            scope = resolve_scope(dimensions[2], service)
+            index = indexes.get(scope)
+            if index is None:
+                index = indexes[scope] = get_business_calendar(*scope).elapsed_index(
+                    first_day, self.fecha_hasta
+                )
+            durations = {
+                name: index.elapsed_seconds(create_at, moment)
+                for (name, _), moment in zip(self.MEASURES, moments)
+                if moment is not None and self.start <= moment < self.end
+            }
+            yield dimensions, durations
+
+    def _summary(self, samples):
+        summary = {}
+        for name, _ in self.MEASURES:
+            values = sorted(samples[name])
+            summary[name] = {'tickets': len(values)}
+            for label, fraction in self.PERCENTILES:
+                value = percentile(values, fraction)
+                summary[name][label] = None if value is None else round(value / 3600, 2)
+        return summary
+
+    def results(self):
+        """
+        Percentiles en horas hábiles: total general y una lista por cada
+        dimensión (servicio, prioridad y cliente)
+        """
+        general = defaultdict(list)
+        groups = {name: defaultdict(lambda: defaultdict(list)) for name, _ in self.DIMENSIONS}
+        with pinned_calendar_versions():
+            for dimensions, durations in self._durations():
+                for name, seconds in durations.items():
+                    general[name].append(seconds)
+                    for (dimension, _), value in zip(self.DIMENSIONS, dimensions):
+                        groups[dimension][value][name].append(seconds)
+
+        data = {'general': self._summary(general)}
+        for dimension, samples in groups.items():
+            data[dimension] = [
+                {dimension: value, **self._summary(samples[value])}
+                for value in sorted(samples, key=lambda value: (value is None, value))
+            ]
+        return data
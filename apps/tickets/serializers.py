@@ -1,9 +1,14 @@
 from rest_framework import serializers
+from django.urls import reverse
 from django.utils import timezone
 from .models import (
     Client, Service, Role, EUser, TicketPriority, Program, SubProgram,
-    ClosingCode, ANS, User, Status, Ticket, ReportedTime, Note, WorkingHours
+    ClosingCode, ANS, User, Status, Ticket, ReportedTime, Note, WorkingHours,
+    ReportJob
 )
+from .business_calendar import get_ticket_calendar
+from .reporting import format_duration
+from .sla import apply_status_change, estimate_closing_date
 
 
 class ClientSerializer(serializers.ModelSerializer):
@@ -152,7 +157,7 @@ class ReportedTimeSerializer(serializers.ModelSerializer):
     class Meta:
         model = ReportedTime
         fields = '__all__'
-        read_only_fields = ['id_reported_times']
+        read_only_fields = ['id_reported_times', 'duration_seconds']
 
 
 class ReportedTimeCreateSerializer(serializers.ModelSerializer):
@@ -183,7 +188,9 @@ class TicketListSerializer(serializers.ModelSerializer):
             'id_ticket', 'ticket_title', 'ticket_service', 'ticket_priority',
             'status_id', 'service_name', 'priority_name', 'status_name',
             'reporter_user_name', 'assigned_to', 'create_at',
-            'estimated_closing_date', 'closing_date', 'cumplimiento', 'ticket_description', 'sub_program_name', 'ticket_ans'
+            'estimated_closing_date', 'closing_date', 'cumplimiento', 'ticket_description',
+            'sub_program_name', 'ticket_ans',
+            'total_reported_seconds', 'reported_entries_count'
         ]
 
 
@@ -217,8 +224,31 @@ class TicketCreateSerializer(serializers.ModelSerializer):
         read_only_fields = ['id_ticket']
 
     def create(self, validated_data):
-        """Crear ticket con valores iniciales"""
-        return Ticket.objects.create(**validated_data)
+        """
+        Crear ticket con valores iniciales.
+        La fecha estimada de cierre se calcula con las horas hábiles del ANS en
+        el calendario del cliente y servicio del ticket; si el ANS no tiene
+        horas configuradas o no hay horarios laborales se conserva la enviada.
+        Si el estado inicial pausa el ANS, la pausa empieza en la fecha de
+        creación.
+        """
+        validated_data.setdefault('create_at', timezone.now())
+        sub_program = validated_data.get('sub_program_name')
+        service = validated_data.get('ticket_service')
+        calendar = get_ticket_calendar(
+            sub_program.pk if sub_program else None, service.pk if service else None
+        )
+        estimated_closing_date = estimate_closing_date(
+            validated_data['create_at'], validated_data.get('ticket_ans'), calendar
+        )
+        if estimated_closing_date is not None:
+            validated_data['estimated_closing_date'] = estimated_closing_date
+
+        ticket = Ticket(**validated_data)
+        if ticket.status_id_id is not None:
+            apply_status_change(ticket, ticket.status_id, ticket.create_at, calendar)
+        ticket.save(force_insert=True)
+        return ticket
 
 
 class TicketUpdateSerializer(serializers.ModelSerializer):
@@ -239,6 +269,25 @@ class TicketUpdateSerializer(serializers.ModelSerializer):
             status = validated_data['status_id']
             if status.status_name.lower() in ['cerrado', 'closed', 'resuelto', 'resolved']:
                 validated_data['closing_date'] = timezone.now()
+
+            # Acumular el tiempo en pausa del ANS al cambiar de estado
+            if status.pk != instance.status_id_id:
+                apply_status_change(instance, status, validated_data.get('closing_date'))
+
+        # Si cambia el ANS, el servicio o el subprograma (y con él el cliente)
+        # se recalcula la fecha estimada de cierre con el calendario que aplica
+        scope_fields = ('ticket_ans', 'ticket_service', 'sub_program_name')
+        ids = {
+            field: getattr(validated_data[field], 'pk', None) if field in validated_data
+            else getattr(instance, f'{field}_id')
+            for field in scope_fields
+        }
+        if any(ids[field] != getattr(instance, f'{field}_id') for field in scope_fields):
+            ans = validated_data.get('ticket_ans', instance.ticket_ans)
+            calendar = get_ticket_calendar(ids['sub_program_name'], ids['ticket_service'])
+            estimated_closing_date = estimate_closing_date(instance.create_at, ans, calendar)
+            if estimated_closing_date is not None:
+                validated_data['estimated_closing_date'] = estimated_closing_date
         
         return super().update(instance, validated_data)
 
@@ -248,10 +297,16 @@ class TicketAssignSerializer(serializers.Serializer):
     assigned_to = serializers.CharField(max_length=45, required=True)
 
     def validate_assigned_to(self, value):
-        """Validar que el usuario asignado exista"""
+        """
+        Validar que el usuario asignado exista; retorna el EUser para
+        asignarlo directamente al ticket
+        """
         if not value:
             raise serializers.ValidationError("El usuario asignado es requerido")
-        return value
+        try:
+            return EUser.objects.get(network_user=value)
+        except EUser.DoesNotExist:
+            raise serializers.ValidationError(f"El usuario {value} no existe")
 
 
 class TicketStatsSerializer(serializers.Serializer):
@@ -271,13 +326,92 @@ class WorkingHoursSerializer(serializers.ModelSerializer):
         model = WorkingHours
         fields = '__all__'
         read_only_fields = ['id_working_hours']
-        
+
+    def validate(self, attrs):
+        """Validar que el día no esté repetido en el mismo alcance (cliente, servicio)"""
+        def current(field):
+            return attrs[field] if field in attrs else getattr(self.instance, field, None)
+
+        duplicates = WorkingHours.objects.filter(
+            week_day=current('week_day'),
+            client_name=current('client_name'),
+            id_services=current('id_services'),
+        )
+        if self.instance is not None:
+            duplicates = duplicates.exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError(
+                'Ya existe un horario para ese día con el mismo cliente y servicio'
+            )
+        return attrs
+
 
 class ProjectDateSerializer(serializers.Serializer):
     ans = serializers.IntegerField()
     date_creation = serializers.CharField(
         help_text="Formato requerido: YYYY-MM-DDTHH:MM:SS",
     )
+    client = serializers.CharField(
+        max_length=45, required=False, allow_null=True, allow_blank=True,
+        help_text="Nombre del cliente para usar su calendario laboral (opcional)"
+    )
+    service = serializers.IntegerField(
+        required=False, allow_null=True,
+        help_text="ID del servicio para usar su calendario laboral (opcional)"
+    )
+
+
+class ProjectDateBatchSerializer(serializers.Serializer):
+    """Serializer para calcular fechas estimadas de varios tickets en una sola petición"""
+    MAX_ITEMS = 1000
+
+    items = ProjectDateSerializer(
+        many=True, required=False,
+        help_text="Lista de pares {date_creation, ans}"
+    )
+    tickets = serializers.ListField(
+        child=serializers.IntegerField(), required=False,
+        help_text="Lista de IDs de tickets (usa create_at y las horas de su ANS)"
+    )
+
+    def validate(self, attrs):
+        items = attrs.get('items') or []
+        tickets = attrs.get('tickets') or []
+        if not items and not tickets:
+            raise serializers.ValidationError('Debe enviar items o tickets')
+        if len(items) + len(tickets) > self.MAX_ITEMS:
+            raise serializers.ValidationError(
+                f'Se permiten máximo {self.MAX_ITEMS} elementos por petición'
+            )
+        return attrs
+
+
+class ProjectDateMatrixSerializer(serializers.Serializer):
+    """Serializer para proyectar la fecha estimada de cierre con varios ANS"""
+    MAX_HOURS = 100
+
+    date_creation = serializers.CharField(
+        help_text="Formato requerido: YYYY-MM-DDTHH:MM:SS",
+    )
+    hours = serializers.ListField(
+        child=serializers.IntegerField(min_value=0), required=False,
+        help_text="Horas a proyectar; si no se envían se usan todos los ANS"
+    )
+    client = serializers.CharField(
+        max_length=45, required=False, allow_null=True, allow_blank=True,
+        help_text="Nombre del cliente para usar su calendario laboral (opcional)"
+    )
+    service = serializers.IntegerField(
+        required=False, allow_null=True,
+        help_text="ID del servicio para usar su calendario laboral (opcional)"
+    )
+
+    def validate_hours(self, value):
+        if len(value) > self.MAX_HOURS:
+            raise serializers.ValidationError(
+                f'Se permiten máximo {self.MAX_HOURS} valores por petición'
+            )
+        return value
 
 
 class TicketReporteDriverSerializer(serializers.Serializer):
@@ -323,13 +457,12 @@ class TicketReporteGeneralSerializer(serializers.ModelSerializer):
             return None
 
     def get_tiempo_total(self, obj) -> str:
-        total_seconds = 0
-        for rt in obj.reportedtime_set.all():
-            t = rt.reported_time
-            total_seconds += t.hour * 3600 + t.minute * 60 + t.second
-        hours, remainder = divmod(total_seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        return f'{hours:02}:{minutes:02}:{seconds:02}'
+        # El reporte anota el total en la consulta; sin la anotación se usa
+        # el total guardado en el ticket
+        total_seconds = getattr(obj, 'tiempo_total_segundos', None)
+        if total_seconds is None:
+            total_seconds = obj.total_reported_seconds
+        return format_duration(total_seconds)
 
     def get_euser_nombre(self, obj) -> str | None:
         euser = obj.assigned_to
@@ -342,3 +475,36 @@ class TicketReporteGeneralSerializer(serializers.ModelSerializer):
         if euser.second_last_name:
             parts.append(euser.second_last_name)
         return ' '.join(parts)
+
+
+class ReportJobCreateSerializer(serializers.Serializer):
+    """Serializer para solicitar un reporte en segundo plano"""
+    report_type = serializers.ChoiceField(choices=ReportJob.TYPE_CHOICES)
+    result_format = serializers.ChoiceField(
+        choices=ReportJob.FORMAT_CHOICES, default=ReportJob.FORMAT_CSV
+    )
+    params = serializers.DictField(
+        child=serializers.CharField(allow_blank=True), required=False, default=dict,
+        help_text="Mismos parámetros query del reporte (fecha_desde, fecha_hasta, ...)"
+    )
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    """Serializer para el estado de un reporte en segundo plano"""
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = [
+            'id_report_job', 'report_type', 'result_format', 'params', 'status',
+            'row_count', 'error_message', 'requested_by', 'create_at',
+            'finished_at', 'download_url',
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj) -> str | None:
+        if obj.status != ReportJob.STATUS_DONE:
+            return None
+        url = reverse('tickets:report-job-download', kwargs={'pk': obj.pk})
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
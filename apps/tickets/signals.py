@@ -0,0 +1,142 @@
+"""
+Señales de la aplicación de tickets
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.utils.cache_versions import bump_version
+
+from .business_calendar import WORKING_HOURS_VERSION, unpin_calendar_versions
+from .capacity import invalidate_daily_capacity
+from .daily_stats import (
+    TRACKED_FIELDS, apply_delta, contribution_delta, contributions, tracked_values,
+)
+from .holidays import HOLIDAYS_VERSION
+from .models import Holiday, ReportedTime, Ticket, WorkingHours
+from .reported_totals import add_reported_time
+from .stats import REPORTED_TIMES_VERSION, TICKETS_VERSION
+
+
+@receiver([post_save, post_delete], sender=Holiday)
+def holiday_changed(sender, **kwargs):
+    """
+    Invalida el conjunto de festivos en memoria de todos los procesos
+    y la capacidad diaria materializada
+    """
+    _calendar_changed(HOLIDAYS_VERSION)
+
+
+@receiver([post_save, post_delete], sender=WorkingHours)
+def working_hours_changed(sender, **kwargs):
+    """
+    Invalida el calendario compilado y la capacidad diaria materializada
+    cuando cambian los horarios laborales
+    """
+    _calendar_changed(WORKING_HOURS_VERSION)
+
+
+def _calendar_changed(namespace):
+    # De inmediato, para que el resto de la transacción use el calendario
+    # nuevo, y otra vez al confirmar, para descartar lo que una lectura
+    # concurrente haya guardado con la generación intermedia y los datos
+    # anteriores
+    bump_version(namespace)
+    unpin_calendar_versions()
+    invalidate_daily_capacity()
+    transaction.on_commit(lambda: _discard_calendar_state(namespace))
+
+
+def _discard_calendar_state(namespace):
+    bump_version(namespace)
+    invalidate_daily_capacity()
+
+
+def _invalidate(namespace):
+    # Al confirmar la transacción, para que ninguna lectura concurrente guarde
+    # en cache los datos anteriores con la generación nueva
+    transaction.on_commit(lambda: bump_version(namespace))
+
+
+def _tracks_daily_stats(update_fields):
+    return update_fields is None or not set(update_fields).isdisjoint(TRACKED_FIELDS)
+
+
+@receiver(pre_save, sender=Ticket)
+def ticket_before_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    """
+    Guarda los valores anteriores del ticket para actualizar la tabla diaria
+    """
+    instance._daily_stats_before = None
+    if raw or instance._state.adding or not _tracks_daily_stats(update_fields):
+        return
+    instance._daily_stats_before = Ticket.objects.filter(
+        pk=instance.pk
+    ).values(*TRACKED_FIELDS).first()
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_saved(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """
+    Invalida los reportes en cache y aplica a la tabla diaria la
+    diferencia entre el aporte anterior y el nuevo del ticket
+    """
+    _invalidate(TICKETS_VERSION)
+    if raw or not _tracks_daily_stats(update_fields):
+        return
+    before = None if created else getattr(instance, '_daily_stats_before', None)
+    apply_delta(contribution_delta(contributions(before), contributions(tracked_values(instance))))
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_deleted(sender, instance, **kwargs):
+    """
+    Invalida los reportes en cache y descuenta de la tabla diaria el
+    aporte del ticket eliminado
+    """
+    _invalidate(TICKETS_VERSION)
+    apply_delta(contribution_delta(contributions(tracked_values(instance)), {}))
+
+
+@receiver(pre_save, sender=ReportedTime)
+def reported_time_before_save(sender, instance, raw=False, **kwargs):
+    """
+    Guarda el ticket y los segundos anteriores del tiempo reportado
+    """
+    instance._reported_before = None
+    if raw or instance._state.adding:
+        return
+    instance._reported_before = ReportedTime.objects.filter(
+        pk=instance.pk
+    ).values_list('id_ticket', 'duration_seconds').first()
+
+
+@receiver(post_save, sender=ReportedTime)
+def reported_time_saved(sender, instance, created, raw=False, **kwargs):
+    """
+    Invalida los reportes en cache y ajusta los totales de tiempo reportado
+    del ticket (o de los dos tickets si el tiempo se movió de uno a otro)
+    """
+    if raw:
+        return
+    _invalidate(REPORTED_TIMES_VERSION)
+    before = None if created else getattr(instance, '_reported_before', None)
+    if before is None:
+        add_reported_time(instance.id_ticket_id, instance.duration_seconds, 1)
+        return
+    ticket_id, seconds = before
+    if ticket_id == instance.id_ticket_id:
+        add_reported_time(ticket_id, instance.duration_seconds - seconds, 0)
+    else:
+        add_reported_time(ticket_id, -seconds, -1)
+        add_reported_time(instance.id_ticket_id, instance.duration_seconds, 1)
+
+
+@receiver(post_delete, sender=ReportedTime)
+def reported_time_deleted(sender, instance, **kwargs):
+    """
+    Invalida los reportes en cache y descuenta el tiempo eliminado de los
+    totales del ticket
+    """
+    _invalidate(REPORTED_TIMES_VERSION)
+    add_reported_time(instance.id_ticket_id, -instance.duration_seconds, -1)
@@ -0,0 +1,145 @@
+"""
+Cálculos de ANS (Acuerdo de Nivel de Servicio) sobre tickets
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+
+from core.utils.cache_versions import bump_version
+
+from .business_calendar import (
+    get_business_calendar, get_ticket_calendar, pinned_calendar_versions,
+)
+from .daily_stats import rebuild_daily_stats
+from .models import Ticket
+from .stats import TICKETS_VERSION
+
+
+def estimate_closing_date(create_at, ans, calendar=None):
+    """
+    Fecha estimada de cierre: ``create_at`` más las horas hábiles del ANS.
+    Retorna None si el ANS no tiene horas configuradas o si no hay horarios
+    laborales con los que calcularla.
+    """
+    if create_at is None or ans is None or ans.ans_hours is None:
+        return None
+    calendar = calendar or get_business_calendar()
+    try:
+        return calendar.add_business_hours(create_at, ans.ans_hours)
+    except ValueError:
+        return None
+
+
+def ticket_calendar(ticket):
+    """
+    Calendario laboral de un ticket según el cliente de su subprograma y su servicio
+    """
+    return get_ticket_calendar(ticket.sub_program_name_id, ticket.ticket_service_id)
+
+
+def apply_status_change(ticket, status, moment=None, calendar=None):
+    """
+    Actualiza la pausa del ANS de ``ticket`` al pasar al estado ``status``.
+
+    Al salir de un estado que pausa el ANS se suma al acumulado el tiempo hábil
+    transcurrido desde ``sla_paused_since``; al entrar a uno se guarda el
+    momento de inicio. No modifica la base de datos; retorna los campos
+    modificados para que quien llama los guarde.
+    """
+    moment = moment or timezone.now()
+    if ticket.sla_paused_since is not None and not status.pauses_sla:
+        calendar = calendar or ticket_calendar(ticket)
+        ticket.sla_paused_seconds += int(
+            calendar.business_seconds_between(ticket.sla_paused_since, moment)
+        )
+        ticket.sla_paused_since = None
+        return ['sla_paused_seconds', 'sla_paused_since']
+    if ticket.sla_paused_since is None and status.pauses_sla:
+        ticket.sla_paused_since = moment
+        return ['sla_paused_since']
+    return []
+
+
+def sla_deadline(ticket, calendar=None):
+    """
+    Fecha límite del ANS: la fecha estimada de cierre desplazada por el tiempo
+    hábil acumulado en pausa. Retorna None si no hay fecha estimada.
+    """
+    if ticket.estimated_closing_date is None:
+        return None
+    if not ticket.sla_paused_seconds:
+        return ticket.estimated_closing_date
+    calendar = calendar or ticket_calendar(ticket)
+    return calendar.add_business_time(
+        ticket.estimated_closing_date, timedelta(seconds=ticket.sla_paused_seconds)
+    )
+
+
+def recompute_in_chunks(queryset, update, fields, chunk_size=2000) -> int:
+    """
+    Recorre ``queryset`` por bloques con ``iterator`` y guarda con ``bulk_update``
+    los tickets para los que ``update(ticket)`` retorna True.
+    Retorna la cantidad de tickets actualizados.
+    """
+    pending = []
+    updated = 0
+    with pinned_calendar_versions():
+        for ticket in queryset.iterator(chunk_size=chunk_size):
+            if update(ticket):
+                pending.append(ticket)
+            if len(pending) >= chunk_size:
+                Ticket.objects.bulk_update(pending, fields, batch_size=chunk_size)
+                updated += len(pending)
+                pending = []
+
+    if pending:
+        Ticket.objects.bulk_update(pending, fields, batch_size=chunk_size)
+        updated += len(pending)
+    return updated
+
+
+def evaluate_cumplimiento(ticket):
+    """
+    Cumplimiento de un ticket cerrado: se cerró antes o en la fecha límite del
+    ANS (fecha estimada más el tiempo en pausa). Retorna None si falta la fecha
+    de cierre o la estimada.
+    """
+    if ticket.closing_date is None or ticket.estimated_closing_date is None:
+        return None
+    return ticket.closing_date <= sla_deadline(ticket)
+
+
+def recalculate_cumplimiento(closed_since=None, chunk_size=2000) -> int:
+    """
+    Recalcula ``cumplimiento`` de los tickets cerrados (opcionalmente solo los
+    cerrados desde ``closed_since``). Retorna la cantidad de tickets modificados.
+
+    ``bulk_update`` no dispara señales, así que al terminar se reconstruyen los
+    días de la tabla diaria en que se cerraron los tickets modificados y se
+    invalidan las estadísticas en cache.
+    """
+    queryset = Ticket.objects.filter(
+        closing_date__isnull=False,
+        estimated_closing_date__isnull=False,
+    ).only(
+        'id_ticket', 'closing_date', 'estimated_closing_date', 'cumplimiento',
+        'sla_paused_seconds', 'sub_program_name', 'ticket_service'
+    ).order_by('id_ticket')
+    if closed_since is not None:
+        queryset = queryset.filter(closing_date__gte=closed_since)
+
+    closing_days = set()
+
+    def update(ticket):
+        cumplimiento = evaluate_cumplimiento(ticket)
+        if cumplimiento is None or cumplimiento == ticket.cumplimiento:
+            return False
+        ticket.cumplimiento = cumplimiento
+        closing_days.add(timezone.localtime(ticket.closing_date).date())
+        return True
+
+    updated = recompute_in_chunks(queryset, update, ['cumplimiento'], chunk_size=chunk_size)
+    if closing_days:
+        rebuild_daily_stats(min(closing_days), max(closing_days))
+        bump_version(TICKETS_VERSION)
+    return updated
@@ -0,0 +1,171 @@
+"""
+Estadísticas agregadas de tickets para los widgets del dashboard y las
+métricas por usuario.
+
+``TICKETS_VERSION`` y ``REPORTED_TIMES_VERSION`` son las generaciones de los
+dominios de los que dependen los reportes en cache (``core.utils.report_cache``);
+las señales de Ticket y de ReportedTime las incrementan en cada escritura.
+"""
+from collections import Counter
+
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .business_calendar import pinned_calendar_versions, resolve_scope
+from .capacity import available_seconds
+from .models import ReportedTime
+from .reporting import reported_seconds
+
+# Generaciones de los datos derivados de tickets y de tiempos reportados
+TICKETS_VERSION = 'tickets'
+REPORTED_TIMES_VERSION = 'reported_times'
+
+# Estados agrupados en los contadores por nombre (coincidencia sin mayúsculas)
+STATUS_GROUPS = {
+    'open_tickets': 'abierto',
+    'closed_tickets': 'cerrado',
+    'in_progress_tickets': 'proceso',
+}
+
+
+def ticket_stats(queryset) -> dict:
+    """
+    Totales de ``queryset`` por estado, prioridad y servicio en una sola
+    consulta agrupada por (prioridad, estado, servicio)
+    """
+    groups = queryset.order_by().values_list(
+        'ticket_priority__priority_name',
+        'ticket_service__service_name',
+        'status_id__status_name',
+    ).annotate(count=Count('id_ticket'))
+
+    by_priority, by_service, by_status = Counter(), Counter(), Counter()
+    for priority, service, status_name, count in groups:
+        by_priority[priority] += count
+        by_service[service] += count
+        by_status[status_name] += count
+
+    data = {'total_tickets': sum(by_status.values())}
+    for field, fragment in STATUS_GROUPS.items():
+        data[field] = sum(
+            count for status_name, count in by_status.items()
+            if status_name and fragment in status_name.lower()
+        )
+    data.update(
+        by_priority=dict(by_priority),
+        by_service=dict(by_service),
+        by_status=dict(by_status),
+    )
+    return data
+
+
+def stats_scope(user) -> str:
+    """
+    Alcance de visibilidad de un usuario: el staff ve todos los tickets y los
+    demás solo los que reportaron o tienen asignados
+    """
+    return 'staff' if user.is_staff else f'user:{user.username}'
+
+
+def dashboard_stats(eusers, now=None):
+    """
+    Contadores del dashboard personal para cada EUser de ``eusers`` en una
+    sola consulta agrupada (los usuarios sin tickets quedan en cero):
+
+    - assigned: tickets activos (sin fecha de cierre) asignados
+    - in_progress: tickets activos cuyo estado tiene valor de ordering
+    - completed_this_month: cerrados en el mes actual con cumplimiento
+    - overdue: cerrados en el mes actual sin cumplimiento
+
+    Retorna un queryset de diccionarios con ``network_user`` y los contadores.
+    """
+    now = now or timezone.now()
+    first_day_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+    active = Q(assigned_tickets__closing_date__isnull=True)
+    this_month = Q(
+        assigned_tickets__closing_date__gte=first_day_of_month,
+        assigned_tickets__closing_date__lte=now,
+    )
+    return eusers.order_by('network_user').values('network_user').annotate(
+        assigned=Count('assigned_tickets', filter=active),
+        in_progress=Count(
+            'assigned_tickets',
+            filter=active & Q(assigned_tickets__status_id__ordering__isnull=False)
+        ),
+        completed_this_month=Count(
+            'assigned_tickets', filter=this_month & Q(assigned_tickets__cumplimiento=True)
+        ),
+        overdue=Count(
+            'assigned_tickets', filter=this_month & Q(assigned_tickets__cumplimiento=False)
+        ),
+    )
+
+
+def _percentage(part, total):
+    return round((part / total) * 100, 2) if total > 0 else 0
+
+
+def user_metrics(eusers, fecha_desde, fecha_hasta) -> list:
+    """
+    Cumplimiento y ocupación de cada EUser de ``eusers`` entre dos datetimes
+    (inclusive), con los mismos criterios de metricas-cumplimiento y
+    metricas-ocupacion:
+
+    - cumplimiento: tickets asignados creados en el rango y cuántos cumplieron
+    - ocupación: horas reportadas por el usuario en el rango sobre las horas
+      disponibles según el calendario de su cliente y servicio
+
+    Los conteos y las horas reportadas salen de una sola consulta agrupada;
+    la capacidad se calcula una vez por calendario distinto, no por usuario.
+    """
+    reported = ReportedTime.objects.filter(
+        network_user=OuterRef('pk'),
+        date_reported__gte=fecha_desde,
+        date_reported__lte=fecha_hasta,
+    ).order_by().values('network_user').annotate(
+        total=Sum(reported_seconds())
+    ).values('total')
+
+    in_range = Q(
+        assigned_tickets__create_at__gte=fecha_desde,
+        assigned_tickets__create_at__lte=fecha_hasta,
+    )
+    rows = eusers.order_by('network_user').annotate(
+        total_tickets=Count('assigned_tickets', filter=in_range),
+        tickets_cumplimiento=Count(
+            'assigned_tickets', filter=in_range & Q(assigned_tickets__cumplimiento=True)
+        ),
+        reported_seconds=Coalesce(Subquery(reported, output_field=IntegerField()), 0),
+    ).values(
+        'network_user', 'name', 'last_name', 'user_client_name', 'id_services',
+        'total_tickets', 'tickets_cumplimiento', 'reported_seconds',
+    )
+
+    with pinned_calendar_versions():
+        scopes = [resolve_scope(row['user_client_name'], row['id_services']) for row in rows]
+
+    capacity = {}
+    results = []
+    for row, scope in zip(rows, scopes):
+        if scope not in capacity:
+            capacity[scope] = available_seconds(
+                fecha_desde.date(), fecha_hasta.date(), client=scope[0], service=scope[1]
+            )
+        total_reported_hours = round(row['reported_seconds'] / 3600, 2)
+        total_working_hours = round(capacity[scope] / 3600, 2)
+
+        results.append({
+            'network_user': row['network_user'],
+            'nombre_completo': row['name'] + ' ' + row['last_name'],
+            'total_tickets': row['total_tickets'],
+            'tickets_cumplimiento': row['tickets_cumplimiento'],
+            'porcentaje_cumplimiento': _percentage(
+                row['tickets_cumplimiento'], row['total_tickets']
+            ),
+            'total_horas_reportadas': total_reported_hours,
+            'total_horas_disponibles': total_working_hours,
+            'porcentaje_ocupacion': _percentage(total_reported_hours, total_working_hours),
+        })
+    return results
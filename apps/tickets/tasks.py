@@ -0,0 +1,52 @@
+"""
+Tareas programadas de la aplicación de tickets
+"""
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from . import capacity, holidays, report_jobs, sla
+from .models import ReportJob
+
+
+@shared_task
+def sync_holidays():
+    """
+    Carga los festivos del año actual y de los años siguientes configurados
+    """
+    year = timezone.localdate().year
+    years = range(year, year + settings.HOLIDAYS_YEARS_AHEAD + 1)
+    summary = holidays.sync_holidays(years)
+    capacity.refresh_daily_capacity()
+    return {str(key): value for key, value in summary.items()}
+
+
+@shared_task
+def recalculate_cumplimiento(days=None):
+    """
+    Recalcula el cumplimiento de los tickets cerrados en los últimos ``days``
+    días (todos si no se indica)
+    """
+    closed_since = timezone.now() - timedelta(days=days) if days else None
+    return sla.recalculate_cumplimiento(closed_since)
+
+
+@shared_task
+def run_report_job(job_id):
+    """
+    Calcula un reporte en segundo plano y guarda el resultado comprimido
+    """
+    job = ReportJob.objects.filter(pk=job_id).first()
+    if job is None or job.status != ReportJob.STATUS_PENDING:
+        return None
+    return report_jobs.run_job(job).status
+
+
+@shared_task
+def purge_report_jobs():
+    """
+    Elimina los reportes en segundo plano vencidos y sus archivos
+    """
+    return report_jobs.purge_report_jobs()
@@ -5,7 +5,7 @@ from .views import (
     TicketPriorityViewSet, ProgramViewSet, SubProgramViewSet,
     ClosingCodeViewSet, ANSViewSet, UserViewSet, StatusViewSet,
     TicketViewSet, ReportedTimeViewSet, NoteViewSet, WorkingHoursViewSet,
-    ProjectDateViewSet
+    ProjectDateViewSet, ReportJobViewSet
 )
 
 app_name = 'tickets'
@@ -29,6 +29,7 @@ router.register(r'notes', NoteViewSet, basename='note')
 router.register(r'working-hours', WorkingHoursViewSet, basename='working-hours')
 router.register(r'project-date', ProjectDateViewSet, basename='project-date')
 router.register(r'project-date/holidays', ProjectDateViewSet, basename='project-date')
+router.register(r'report-jobs', ReportJobViewSet, basename='report-job')
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,23 +1,26 @@
-from celery import shared_task
-from django.core.cache import cache
-from urllib import response
-from django.http import HttpResponse
+from django.core.exceptions import ValidationError
+from django.http import FileResponse
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Q
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
-import requests
 from datetime import date, datetime, timedelta
 from core.utils.helpers import Pagination
+from core.utils.pagination import KeysetPagination
+from core.utils.report_cache import cached_report
+from core.utils.exports import (
+    EXPORT_CHUNK_SIZE, EXPORT_FORMATS, EXPORT_RENDERER_CLASSES, export_response
+)
 
 from core.base.mixins import CustomDeleteMixin
 
 from .models import (
     Client, Service, Role, EUser, TicketPriority, Program, SubProgram,
-    ClosingCode, ANS, User, Status, Ticket, ReportedTime, Note, WorkingHours
+    ClosingCode, ANS, User, Status, Ticket, ReportedTime, Note, WorkingHours,
+    ReportJob
 )
 from .serializers import (
     ClientSerializer, ServiceSerializer, RoleSerializer, EUserSerializer,
@@ -27,12 +30,32 @@ from .serializers import (
     TicketDetailSerializer, TicketCreateSerializer, TicketUpdateSerializer,
     ReportedTimeSerializer, ReportedTimeCreateSerializer, NoteSerializer,
     NoteCreateSerializer, TicketAssignSerializer, TicketStatsSerializer,
-    WorkingHoursSerializer, ProjectDateSerializer, TicketReporteGeneralSerializer,
-    TicketReporteDriverSerializer
+    WorkingHoursSerializer, ProjectDateSerializer, ProjectDateBatchSerializer,
+    ProjectDateMatrixSerializer,
+    TicketReporteGeneralSerializer,
+    TicketReporteDriverSerializer,
+    ReportJobCreateSerializer, ReportJobSerializer
 )
 
+from .business_calendar import (
+    WORKING_HOURS_VERSION, get_business_calendar, get_ticket_calendar, pinned_calendar_versions,
+)
+from .capacity import available_seconds
+from .daily_stats import daily_totals
+from .holidays import HOLIDAYS_VERSION, get_holiday_set
 from .filters import TicketFilter, ReportedTimeFilter
 from .permissions import IsTicketOwnerOrAssigned, IsAdminOrReadOnly
+from .report_jobs import report_rows, request_report_job, result_path
+from .reporting import (
+    GENERAL_REPORT_ORDERING, DriverReport, HierarchyRollup, ReportParamsError,
+    ResolutionPercentiles, TicketTimeSeries, general_report_queryset, parse_metric_range,
+    reported_seconds,
+)
+from .sla import apply_status_change
+from .stats import (
+    REPORTED_TIMES_VERSION, TICKETS_VERSION, dashboard_stats, stats_scope, ticket_stats,
+    user_metrics,
+)
 
 class ClientViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
     """
@@ -88,6 +111,64 @@ class EUserViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
             return EUserCreateSerializer
         return EUserSerializer
 
+    @action(detail=False, methods=['get'], url_path='leaderboard')
+    def leaderboard(self, request):
+        """
+        Porcentaje de cumplimiento y de ocupación de todos los usuarios (o de
+        los filtrados) en un rango de fechas, con los mismos criterios de
+        metricas-cumplimiento y metricas-ocupacion.
+
+        Parámetros query:
+        - fecha_desde (opcional): Fecha inicio en formato YYYY-MM-DD
+          (por defecto: día 1 del mes actual)
+        - fecha_hasta (opcional): Fecha fin en formato YYYY-MM-DD (por defecto: día actual)
+        - network_users (opcional): usuarios separados por comas
+        - user_client_name, rol_name, id_services, search (opcionales): filtros del listado
+        - ordenar_por (opcional): cumplimiento (por defecto) u ocupacion, de mayor a menor
+        """
+        try:
+            fecha_desde, fecha_hasta = parse_metric_range(request.query_params)
+        except ReportParamsError as e:
+            return Response({
+                'success': False,
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        ordenar_por = request.query_params.get('ordenar_por', 'cumplimiento')
+        if ordenar_por not in ('cumplimiento', 'ocupacion'):
+            return Response({
+                'success': False,
+                'message': 'El parámetro ordenar_por debe ser "cumplimiento" u "ocupacion"'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        eusers = self.filter_queryset(self.get_queryset())
+        network_users = [
+            value.strip()
+            for value in request.query_params.get('network_users', '').split(',')
+            if value.strip()
+        ]
+        if network_users:
+            eusers = eusers.filter(network_user__in=network_users)
+
+        usuarios = cached_report(
+            'leaderboard', request.query_params,
+            lambda: user_metrics(eusers, fecha_desde, fecha_hasta),
+            domains=(
+                TICKETS_VERSION, REPORTED_TIMES_VERSION, WORKING_HOURS_VERSION, HOLIDAYS_VERSION
+            )
+        )
+        usuarios.sort(key=lambda row: row[f'porcentaje_{ordenar_por}'], reverse=True)
+
+        return Response({
+            'success': True,
+            'data': {
+                'fecha_desde': fecha_desde.strftime('%Y-%m-%d'),
+                'fecha_hasta': fecha_hasta.strftime('%Y-%m-%d'),
+                'ordenar_por': ordenar_por,
+                'usuarios': usuarios,
+            }
+        })
+
     @action(detail=False, methods=['get'], url_path='metricas-cumplimiento')
     def metricas_cumplimiento(self, request):
         """
@@ -98,8 +179,6 @@ class EUserViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
         - fecha_desde (opcional): Fecha inicio en formato YYYY-MM-DD (por defecto: día 1 del mes actual)
         - fecha_hasta (opcional): Fecha fin en formato YYYY-MM-DD (por defecto: día actual)
         """
-        from datetime import datetime, time
-        
         # Obtener parámetros
         network_user = request.query_params.get('network_user')
         
@@ -118,77 +197,45 @@ class EUserViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
                 'message': f'El usuario {network_user} no existe'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        # Configurar fechas
-        now = timezone.now()
-        
-        # Fecha desde: día 1 del mes actual a las 00:00:00
-        fecha_desde_str = request.query_params.get('fecha_desde')
-        if fecha_desde_str:
-            try:
-                fecha_desde = datetime.strptime(fecha_desde_str, '%Y-%m-%d')
-                fecha_desde = timezone.make_aware(datetime.combine(fecha_desde.date(), time.min))
-            except ValueError:
-                return Response({
-                    'success': False,
-                    'message': 'Formato de fecha_desde inválido. Use YYYY-MM-DD'
-                }, status=status.HTTP_400_BAD_REQUEST)
-        else:
-            fecha_desde = timezone.make_aware(datetime(now.year, now.month, 1, 0, 0, 0))
-        
-        # Fecha hasta: día actual a las 23:59:59
-        fecha_hasta_str = request.query_params.get('fecha_hasta')
-        if fecha_hasta_str:
-            try:
-                fecha_hasta = datetime.strptime(fecha_hasta_str, '%Y-%m-%d')
-                fecha_hasta = timezone.make_aware(datetime.combine(fecha_hasta.date(), time.max))
-            except ValueError:
-                return Response({
-                    'success': False,
-                    'message': 'Formato de fecha_hasta inválido. Use YYYY-MM-DD'
-                }, status=status.HTTP_400_BAD_REQUEST)
-        else:
-            fecha_hasta = timezone.make_aware(datetime.combine(now.date(), time.max))
-        
-        # Consultar tickets asignados al usuario en el rango de fechas
-        tickets = Ticket.objects.filter(
-            assigned_to=network_user,
-            create_at__gte=fecha_desde,
-            create_at__lte=fecha_hasta
-        )
-        
-        total_tickets = tickets.count()
-        
-        if total_tickets == 0:
+        # Rango de fechas (por defecto: el mes actual hasta hoy)
+        try:
+            fecha_desde, fecha_hasta = parse_metric_range(request.query_params)
+        except ReportParamsError as e:
             return Response({
-                'success': True,
-                'data': {
-                    'network_user': network_user,
-                    'nombre_completo': user.name + ' ' + user.last_name,
-                    'fecha_desde': fecha_desde.strftime('%Y-%m-%d'),
-                    'fecha_hasta': fecha_hasta.strftime('%Y-%m-%d'),
-                    'total_tickets': 0,
-                    'tickets_cumplimiento': 0,
-                    'porcentaje_cumplimiento': 0
-                }
-            })
-        
-        # Contar tickets con cumplimiento = True
-        tickets_cumplimiento = tickets.filter(cumplimiento=True).count()
-        
-        # Calcular porcentaje
-        porcentaje_cumplimiento = round((tickets_cumplimiento / total_tickets) * 100, 2)
+                'success': False,
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
         
-        return Response({
-            'success': True,
-            'data': {
+        def compute():
+            # Tickets asignados al usuario creados en el rango
+            totals = Ticket.objects.filter(
+                assigned_to=network_user,
+                create_at__gte=fecha_desde,
+                create_at__lte=fecha_hasta
+            ).aggregate(
+                total=Count('id_ticket'),
+                cumplidos=Count('id_ticket', filter=Q(cumplimiento=True)),
+            )
+            total_tickets = totals['total']
+            porcentaje_cumplimiento = (
+                round((totals['cumplidos'] / total_tickets) * 100, 2) if total_tickets else 0
+            )
+            return {
                 'network_user': network_user,
                 'nombre_completo': user.name + ' ' + user.last_name,
                 'fecha_desde': fecha_desde.strftime('%Y-%m-%d'),
                 'fecha_hasta': fecha_hasta.strftime('%Y-%m-%d'),
                 'total_tickets': total_tickets,
-                'tickets_cumplimiento': tickets_cumplimiento,
+                'tickets_cumplimiento': totals['cumplidos'],
                 'porcentaje_cumplimiento': porcentaje_cumplimiento
             }
+
+        return Response({
+            'success': True,
+            'data': cached_report(
+                'metricas-cumplimiento', request.query_params, compute,
+                domains=(TICKETS_VERSION,)
+            )
         })
 
     @action(detail=False, methods=['get'], url_path='metricas-ocupacion')
@@ -201,8 +248,6 @@ class EUserViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
         - fecha_desde (opcional): Fecha inicio en formato YYYY-MM-DD (por defecto: día 1 del mes actual)
         - fecha_hasta (opcional): Fecha fin en formato YYYY-MM-DD (por defecto: día actual)
         """
-        from datetime import datetime, time
-        
         # Obtener parámetros
         network_user = request.query_params.get('network_user')
         
@@ -221,111 +266,47 @@ class EUserViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
                 'message': f'El usuario {network_user} no existe'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        # Configurar fechas
-        now = timezone.now()
-        
-        # Fecha desde: día 1 del mes actual a las 00:00:00
-        fecha_desde_str = request.query_params.get('fecha_desde')
-        if fecha_desde_str:
-            try:
-                fecha_desde = datetime.strptime(fecha_desde_str, '%Y-%m-%d')
-                fecha_desde = timezone.make_aware(datetime.combine(fecha_desde.date(), time.min))
-            except ValueError:
-                return Response({
-                    'success': False,
-                    'message': 'Formato de fecha_desde inválido. Use YYYY-MM-DD'
-                }, status=status.HTTP_400_BAD_REQUEST)
-        else:
-            fecha_desde = timezone.make_aware(datetime(now.year, now.month, 1, 0, 0, 0))
-        
-        # Fecha hasta: día actual a las 23:59:59
-        fecha_hasta_str = request.query_params.get('fecha_hasta')
-        if fecha_hasta_str:
-            try:
-                fecha_hasta = datetime.strptime(fecha_hasta_str, '%Y-%m-%d')
-                fecha_hasta = timezone.make_aware(datetime.combine(fecha_hasta.date(), time.max))
-            except ValueError:
-                return Response({
-                    'success': False,
-                    'message': 'Formato de fecha_hasta inválido. Use YYYY-MM-DD'
-                }, status=status.HTTP_400_BAD_REQUEST)
-        else:
-            fecha_hasta = timezone.make_aware(datetime.combine(now.date(), time.max))
-        
-        # Consultar tiempos reportados por el usuario en el rango de fechas
-        reported_times = ReportedTime.objects.filter(
-            network_user=network_user,
-            date_reported__gte=fecha_desde,
-            date_reported__lte=fecha_hasta
-        )
-        
-        # Sumar todos los reported_time
-        total_reported_seconds = 0
-        for rt in reported_times:
-            # Convertir time a segundos
-            reported_time = rt.reported_time
-            seconds = reported_time.hour * 3600 + reported_time.minute * 60 + reported_time.second
-            total_reported_seconds += seconds
-        
-        # Convertir a horas
-        total_reported_hours = round(total_reported_seconds / 3600, 2)
-        
-        # Obtener horarios laborales
-        working_hours = WorkingHours.objects.all()
-        
-        if not working_hours.exists():
+        # Rango de fechas (por defecto: el mes actual hasta hoy)
+        try:
+            fecha_desde, fecha_hasta = parse_metric_range(request.query_params)
+        except ReportParamsError as e:
             return Response({
                 'success': False,
-                'message': 'No hay horarios laborales configurados'
+                'message': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Crear diccionario de horarios por día de la semana
-        # Python weekday(): 0=Lunes, 1=Martes, ..., 6=Domingo
-        weekday_map = {
-            'Lunes': 0,
-            'Martes': 1,
-            'Miércoles': 2,
-            'Jueves': 3,
-            'Viernes': 4,
-            'Sábado': 5,
-            'Domingo': 6
-        }
-        
-        working_schedule = {}
-        for wh in working_hours:
-            weekday_num = weekday_map.get(wh.week_day)
-            if weekday_num is not None:
-                # Calcular horas del día
-                start = datetime.combine(datetime.today(), wh.start_time)
-                end = datetime.combine(datetime.today(), wh.end_time)
-                hours_per_day = (end - start).total_seconds() / 3600
-                working_schedule[weekday_num] = hours_per_day
-        
-        # Calcular horas disponibles en el rango de fechas
-        total_working_hours = 0
-        current_date = fecha_desde.date()
-        end_date = fecha_hasta.date()
-        
-        while current_date <= end_date:
-            weekday = current_date.weekday()
-            if weekday in working_schedule:
-                hours = working_schedule[weekday]
-                # Restar 1.5 horas por almuerzo y desayuno
-                hours -= 1.5
-                total_working_hours += hours
-            current_date += timedelta(days=1)
-        
-        total_working_hours = round(total_working_hours, 2)
-        
-        # Calcular porcentaje de ocupación
-        if total_working_hours > 0:
-            porcentaje_ocupacion = round((total_reported_hours / total_working_hours) * 100, 2)
-        else:
-            porcentaje_ocupacion = 0
-        
-        return Response({
-            'success': True,
-            'data': {
+        def compute():
+            # Sumar en la base de datos los tiempos reportados por el usuario en el rango
+            total_reported_seconds = ReportedTime.objects.filter(
+                network_user=network_user,
+                date_reported__gte=fecha_desde,
+                date_reported__lte=fecha_hasta
+            ).aggregate(total=Sum(reported_seconds()))['total'] or 0
+
+            # Convertir a horas
+            total_reported_hours = round(total_reported_seconds / 3600, 2)
+
+            # Capacidad disponible en el rango desde la tabla de capacidad diaria
+            # (horarios laborales, festivos y descansos ya descontados) según el
+            # calendario del cliente y servicio del usuario
+            total_working_seconds = available_seconds(
+                fecha_desde.date(), fecha_hasta.date(),
+                client=user.user_client_name_id, service=user.id_services_id
+            )
+
+            # Sin horarios configurados no se guarda nada en el cache
+            if not total_working_seconds and not WorkingHours.objects.exists():
+                return None
+
+            total_working_hours = round(total_working_seconds / 3600, 2)
+
+            # Calcular porcentaje de ocupación
+            if total_working_hours > 0:
+                porcentaje_ocupacion = round((total_reported_hours / total_working_hours) * 100, 2)
+            else:
+                porcentaje_ocupacion = 0
+
+            return {
                 'network_user': network_user,
                 'nombre_completo': user.name + ' ' + user.last_name,
                 'fecha_desde': fecha_desde.strftime('%Y-%m-%d'),
@@ -334,6 +315,20 @@ class EUserViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
                 'total_horas_disponibles': total_working_hours,
                 'porcentaje_ocupacion': porcentaje_ocupacion
             }
+
+        data = cached_report(
+            'metricas-ocupacion', request.query_params, compute,
+            domains=(REPORTED_TIMES_VERSION, WORKING_HOURS_VERSION, HOLIDAYS_VERSION)
+        )
+        if data is None:
+            return Response({
+                'success': False,
+                'message': 'No hay horarios laborales configurados'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'success': True,
+            'data': data
         })
 
 
@@ -424,7 +419,10 @@ class TicketViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_class = TicketFilter
     search_fields = ['ticket_title', 'ticket_description', 'id_ticket']
-    ordering_fields = ['id_ticket', 'create_at', 'estimated_closing_date', 'ticket_priority']
+    ordering_fields = [
+        'id_ticket', 'create_at', 'estimated_closing_date', 'ticket_priority',
+        'total_reported_seconds', 'reported_entries_count'
+    ]
     ordering = ['-create_at']
     lookup_field = 'id_ticket'
 
@@ -468,7 +466,7 @@ class TicketViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
         serializer.save()
 
     @action(detail=True, methods=['post'])
-    def assign(self, request, pk=None):
+    def assign(self, request, id_ticket=None):
         """
         Asignar un ticket a un usuario
         """
@@ -488,7 +486,7 @@ class TicketViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=True, methods=['post'])
-    def close(self, request, pk=None):
+    def close(self, request, id_ticket=None):
         """
         Cerrar un ticket
         """
@@ -514,8 +512,10 @@ class TicketViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
                 }, status=status.HTTP_400_BAD_REQUEST)
             
             ticket.ticket_closing_code = closing_code
-            ticket.status_id = closed_status
             ticket.closing_date = timezone.now()
+            if closed_status.pk != ticket.status_id_id:
+                apply_status_change(ticket, closed_status, ticket.closing_date)
+            ticket.status_id = closed_status
             ticket.save()
             
             return Response({
@@ -566,45 +566,16 @@ class TicketViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
     def stats(self, request):
         """
         Obtener estadísticas de tickets
+
+        Se calculan en una sola consulta agrupada y se sirven desde el cache
+        (por staff o por usuario) mientras no cambie ningún ticket.
         """
         queryset = self.get_queryset()
-        
-        total_tickets = queryset.count()
-        open_tickets = queryset.filter(
-            status_id__status_name__icontains='abierto'
-        ).count()
-        closed_tickets = queryset.filter(
-            status_id__status_name__icontains='cerrado'
-        ).count()
-        in_progress_tickets = queryset.filter(
-            status_id__status_name__icontains='proceso'
-        ).count()
-        
-        # Estadísticas por prioridad
-        by_priority = queryset.values(
-            'ticket_priority__priority_name'
-        ).annotate(count=Count('id_ticket'))
-        
-        # Estadísticas por servicio
-        by_service = queryset.values(
-            'ticket_service__service_name'
-        ).annotate(count=Count('id_ticket'))
-        
-        # Estadísticas por estado
-        by_status = queryset.values(
-            'status_id__status_name'
-        ).annotate(count=Count('id_ticket'))
-        
-        data = {
-            'total_tickets': total_tickets,
-            'open_tickets': open_tickets,
-            'closed_tickets': closed_tickets,
-            'in_progress_tickets': in_progress_tickets,
-            'by_priority': {item['ticket_priority__priority_name']: item['count'] for item in by_priority},
-            'by_service': {item['ticket_service__service_name']: item['count'] for item in by_service},
-            'by_status': {item['status_id__status_name']: item['count'] for item in by_status},
-        }
-        
+        data = cached_report(
+            'stats', {}, lambda: ticket_stats(queryset),
+            domains=(TICKETS_VERSION,), scope=stats_scope(request.user)
+        )
+
         serializer = TicketStatsSerializer(data)
         return Response(serializer.data)
 
@@ -615,25 +586,26 @@ class TicketViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
 
         Respuesta:
         - datos_diarios: lista con conteo de tickets creados (create_at) y cerrados (closing_date) por día
+
+        Los conteos se leen de la tabla diaria (TicketDailyStats) en una sola consulta.
         """
         day_names = ['Lun', 'Mar', 'Mié', 'Jue', 'Vie', 'Sáb', 'Dom']
 
         today = timezone.localdate()
         fecha_hasta = today
         fecha_desde = today - timedelta(days=6)
+        totals = daily_totals(fecha_desde, fecha_hasta)
 
         datos_diarios = []
         for i in range(7):
             current_date = fecha_desde + timedelta(days=i)
-
-            creados = Ticket.objects.filter(create_at__date=current_date).count()
-            cerrados = Ticket.objects.filter(closing_date__date=current_date).count()
+            day = totals.get(current_date, {})
 
             datos_diarios.append({
                 'dia': day_names[current_date.weekday()],
                 'fecha': current_date.strftime('%Y-%m-%d'),
-                'creados': creados,
-                'cerrados': cerrados,
+                'creados': day.get('created') or 0,
+                'cerrados': day.get('closed') or 0,
             })
 
         return Response({
@@ -646,6 +618,119 @@ class TicketViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
             }
         })
 
+    @action(detail=False, methods=['get'], url_path='timeseries')
+    def timeseries(self, request):
+        """
+        Serie de tickets creados, cerrados y cumplidos por periodo.
+
+        Parámetros query:
+        - fecha_desde, fecha_hasta (obligatorios, YYYY-MM-DD, inclusive)
+        - bucket: day, week o month (por defecto day)
+        - agrupar_por: cliente, servicio y/o asignado separados por comas
+        - cliente, id_servicio, network_user: filtros opcionales
+
+        Respuesta:
+        - series: lista con periodo (inicio del día, semana o mes), las
+          dimensiones de agrupar_por y los conteos creados, cerrados y cumplidos
+        """
+        try:
+            series = TicketTimeSeries(request.query_params)
+        except ReportParamsError as e:
+            return Response({
+                'success': False,
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'success': True,
+            'data': {
+                'fecha_desde': series.fecha_desde.strftime('%Y-%m-%d'),
+                'fecha_hasta': series.fecha_hasta.strftime('%Y-%m-%d'),
+                'bucket': series.bucket,
+                'agrupar_por': series.dimensions,
+                'series': series.results(),
+            }
+        })
+
+    @action(detail=False, methods=['get'], url_path='reporte-jerarquia')
+    def reporte_jerarquia(self, request):
+        """
+        Totales por cliente, programa y subprograma con subtotales en cada nivel.
+
+        Parámetros query:
+        - fecha_desde (obligatorio): YYYY-MM-DD — inicio del rango
+        - fecha_hasta (obligatorio): YYYY-MM-DD — fin del rango (inclusive)
+        - cliente     (opcional): nombre exacto del cliente
+
+        Respuesta:
+        - total: totales generales
+        - clientes: cada cliente con sus totales y sus programas, y cada
+          programa con sus totales y sus subprogramas
+
+        Cada nodo tiene tickets (creados en el rango), cerrados, cumplidos,
+        porcentaje_cumplimiento y horas_reportadas (tiempos reportados en el rango).
+        """
+        try:
+            rollup = HierarchyRollup(request.query_params)
+        except ReportParamsError as e:
+            return Response({
+                'success': False,
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'success': True,
+            'data': {
+                'fecha_desde': rollup.fecha_desde.strftime('%Y-%m-%d'),
+                'fecha_hasta': rollup.fecha_hasta.strftime('%Y-%m-%d'),
+                **rollup.results(),
+            }
+        })
+
+    @action(detail=False, methods=['get'], url_path='tiempos-resolucion')
+    def tiempos_resolucion(self, request):
+        """
+        Percentiles (p50, p90, p99) en horas hábiles del tiempo de cierre y del
+        tiempo hasta la primera asignación.
+
+        Parámetros query:
+        - fecha_desde (obligatorio): YYYY-MM-DD — inicio del rango
+        - fecha_hasta (obligatorio): YYYY-MM-DD — fin del rango (inclusive)
+        - cliente     (opcional): nombre exacto del cliente
+        - id_servicio (opcional): ID del tipo de servicio
+
+        Respuesta:
+        - general: tiempo_cierre (tickets cerrados en el rango) y
+          tiempo_primera_asignacion (tickets asignados por primera vez en el
+          rango), cada uno con tickets, p50, p90 y p99
+        - servicio, prioridad, cliente: las mismas medidas por cada valor
+
+        Las horas hábiles usan el calendario laboral del cliente y servicio
+        de cada ticket. La primera asignación solo se registra desde que existe
+        ``first_assigned_at``: los tickets asignados antes no cuentan en
+        tiempo_primera_asignacion.
+        """
+        try:
+            report = ResolutionPercentiles(request.query_params)
+        except ReportParamsError as e:
+            return Response({
+                'success': False,
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        data = cached_report(
+            'tiempos-resolucion', request.query_params, report.results,
+            domains=(TICKETS_VERSION, WORKING_HOURS_VERSION, HOLIDAYS_VERSION)
+        )
+        return Response({
+            'success': True,
+            'data': {
+                'fecha_desde': report.fecha_desde.strftime('%Y-%m-%d'),
+                'fecha_hasta': report.fecha_hasta.strftime('%Y-%m-%d'),
+                **data,
+            }
+        })
+
     @action(detail=False, methods=['get'], url_path='dashboard-stats')
     def dashboard_stats(self, request):
         """
@@ -668,56 +753,75 @@ class TicketViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
                 'message': 'El parámetro assigned_to es obligatorio'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        # Verificar que el usuario existe
-        if not EUser.objects.filter(network_user=assigned_to).exists():
+        # Una sola consulta: si el usuario no existe no hay fila
+        data = dashboard_stats(EUser.objects.filter(network_user=assigned_to)).first()
+        if data is None:
             return Response({
                 'success': False,
                 'message': f'El usuario {assigned_to} no existe'
             }, status=status.HTTP_404_NOT_FOUND)
+        data.pop('network_user')
 
-        now = timezone.now()
-        first_day_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-        # assigned: tickets activos (sin closing_date) asignados a este usuario
-        assigned = Ticket.objects.filter(
-            closing_date__isnull=True,
-            assigned_to=assigned_to
-        ).count()
-
-        # in_progress: tickets activos de este usuario cuyo status tiene ordering con valor
-        in_progress = Ticket.objects.filter(
-            closing_date__isnull=True,
-            assigned_to=assigned_to,
-            status_id__ordering__isnull=False
-        ).count()
-
-        # completed_this_month: tickets de este usuario cerrados este mes con cumplimiento=True
-        completed_this_month = Ticket.objects.filter(
-            assigned_to=assigned_to,
-            closing_date__gte=first_day_of_month,
-            closing_date__lte=now,
-            cumplimiento=True
-        ).count()
-
-        # overdue: tickets de este usuario cerrados este mes con cumplimiento=False
-        overdue = Ticket.objects.filter(
-            assigned_to=assigned_to,
-            closing_date__gte=first_day_of_month,
-            closing_date__lte=now,
-            cumplimiento=False
-        ).count()
+        return Response({
+            'success': True,
+            'data': data
+        })
+
+    @action(detail=False, methods=['get'], url_path='team-dashboard-stats')
+    def team_dashboard_stats(self, request):
+        """
+        Estadísticas del dashboard (las mismas de dashboard-stats) para varios
+        usuarios en una sola consulta.
+
+        Parámetros query (opcionales, se combinan; sin ninguno se incluyen todos):
+        - network_users: network_user de los usuarios separados por comas
+        - rol: nombre del rol de los usuarios
+        - cliente: cliente de los usuarios
+
+        Respuesta:
+        - usuarios: lista con network_user, assigned, in_progress,
+          completed_this_month y overdue de cada usuario
+        - no_encontrados: network_users solicitados que no existen
+        """
+        eusers = EUser.objects.all()
+        network_users = [
+            value.strip()
+            for value in request.query_params.get('network_users', '').split(',')
+            if value.strip()
+        ]
+        if network_users:
+            eusers = eusers.filter(network_user__in=network_users)
+        rol = request.query_params.get('rol')
+        if rol:
+            eusers = eusers.filter(rol_name=rol)
+        cliente = request.query_params.get('cliente')
+        if cliente:
+            eusers = eusers.filter(user_client_name=cliente)
+
+        usuarios = list(dashboard_stats(eusers))
+        found = {row['network_user'] for row in usuarios}
 
         return Response({
             'success': True,
             'data': {
-                'assigned': assigned,
-                'in_progress': in_progress,
-                'completed_this_month': completed_this_month,
-                'overdue': overdue,
+                'usuarios': usuarios,
+                'no_encontrados': [nu for nu in network_users if nu not in found],
             }
         })
 
-    @action(detail=False, methods=['get'], url_path='reporte-general')
+    def report_paginator(self, request, ordering):
+        """
+        Paginador de los reportes: el de número de página por defecto, o por
+        llave sobre ``ordering`` si el cliente lo pide (``pagination=keyset``)
+        """
+        if self.paginator is None or KeysetPagination.requested(request):
+            return KeysetPagination(ordering)
+        return self.paginator
+
+    @action(
+        detail=False, methods=['get'], url_path='reporte-general',
+        renderer_classes=EXPORT_RENDERER_CLASSES
+    )
     def reporte_general(self, request):
         """
         Reporte general de tickets en un rango de fechas.
@@ -729,81 +833,52 @@ class TicketViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
         - id_servicio  (opcional): ID del tipo de servicio
         - network_user (opcional): network_user del EUser asignado
         - cumple       (opcional): true / false — si se omite devuelve todos
+        - page         (opcional): número de página (paginación por defecto)
+        - page_size    (opcional): filas por página (máximo 100)
+        - pagination   (opcional): keyset — pagina por llave en lugar de por número
+        - cursor       (opcional): con keyset, cursor de la página siguiente (ver ``next``)
+        - count        (opcional): con keyset, true — incluye el total de filas
+        - format       (opcional): csv / xlsx — descarga el reporte completo sin paginar
+
+        Las filas se ordenan por (create_at, id_ticket), que es también la llave
+        de la paginación con ``pagination=keyset``.
         """
-        from datetime import datetime, time as dt_time
-
-        fecha_desde_str = request.query_params.get('fecha_desde')
-        fecha_hasta_str = request.query_params.get('fecha_hasta')
-
-        if not fecha_desde_str or not fecha_hasta_str:
-            return Response({
-                'success': False,
-                'message': 'Los parámetros fecha_desde y fecha_hasta son obligatorios'
-            }, status=status.HTTP_400_BAD_REQUEST)
-
         try:
-            fecha_desde = timezone.make_aware(
-                datetime.combine(datetime.strptime(fecha_desde_str, '%Y-%m-%d').date(), dt_time.min)
-            )
-            fecha_hasta = timezone.make_aware(
-                datetime.combine(datetime.strptime(fecha_hasta_str, '%Y-%m-%d').date(), dt_time.max)
-            )
-        except ValueError:
+            queryset = general_report_queryset(request.query_params)
+        except ReportParamsError as e:
             return Response({
                 'success': False,
-                'message': 'Formato de fecha inválido. Use YYYY-MM-DD'
+                'message': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        queryset = Ticket.objects.select_related(
-            'ticket_service',
-            'assigned_to',
-            'sub_program_name__program_name__client_name',
-        ).prefetch_related('reportedtime_set').filter(
-            create_at__gte=fecha_desde,
-            create_at__lte=fecha_hasta,
-        )
-
-        cliente = request.query_params.get('cliente')
-        if cliente:
-            queryset = queryset.filter(
-                sub_program_name__program_name__client_name__client_name=cliente
+        # Exportación (?format=csv / xlsx): se recorren todas las filas por
+        # bloques sin paginar
+        export_format = request.accepted_renderer.format
+        if export_format in EXPORT_FORMATS:
+            params = request.query_params
+            return export_response(
+                export_format, f"reporte-general_{params['fecha_desde']}_{params['fecha_hasta']}",
+                *report_rows(ReportJob.TYPE_GENERAL, params, EXPORT_CHUNK_SIZE)
             )
 
-        id_servicio = request.query_params.get('id_servicio')
-        if id_servicio:
-            try:
-                queryset = queryset.filter(ticket_service__id_services=int(id_servicio))
-            except ValueError:
-                return Response({
-                    'success': False,
-                    'message': 'id_servicio debe ser un número entero'
-                }, status=status.HTTP_400_BAD_REQUEST)
-
-        network_user = request.query_params.get('network_user')
-        if network_user:
-            queryset = queryset.filter(assigned_to__network_user=network_user)
-
-        cumple_str = request.query_params.get('cumple')
-        if cumple_str is not None:
-            if cumple_str.lower() == 'true':
-                queryset = queryset.filter(cumplimiento=True)
-            elif cumple_str.lower() == 'false':
-                queryset = queryset.filter(cumplimiento=False)
-            else:
-                return Response({
-                    'success': False,
-                    'message': 'El parámetro cumple debe ser "true" o "false"'
-                }, status=status.HTTP_400_BAD_REQUEST)
+        def compute():
+            paginator = self.report_paginator(request, GENERAL_REPORT_ORDERING)
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            if page is not None:
+                serializer = TicketReporteGeneralSerializer(page, many=True)
+                return paginator.get_paginated_response(serializer.data).data
 
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = TicketReporteGeneralSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+            return TicketReporteGeneralSerializer(queryset, many=True).data
 
-        serializer = TicketReporteGeneralSerializer(queryset, many=True)
-        return Response(serializer.data)
+        return Response(cached_report(
+            'reporte-general', request.query_params, compute,
+            domains=(TICKETS_VERSION, REPORTED_TIMES_VERSION)
+        ))
 
-    @action(detail=False, methods=['get'], url_path='reporte-driver')
+    @action(
+        detail=False, methods=['get'], url_path='reporte-driver',
+        renderer_classes=EXPORT_RENDERER_CLASSES
+    )
     def reporte_driver(self, request):
         """
         Reporte driver: tickets agrupados por usuario E-User y cliente con métricas de ocupación.
@@ -813,130 +888,48 @@ class TicketViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
         - fecha_hasta  (obligatorio): YYYY-MM-DD — fin del rango (inclusive)
         - cliente      (opcional): nombre exacto del cliente
         - network_user (opcional): network_user del EUser asignado al ticket
+        - page         (opcional): número de página (paginación por defecto)
+        - page_size    (opcional): filas por página (máximo 100)
+        - pagination   (opcional): keyset — pagina por llave en lugar de por número
+        - cursor       (opcional): con keyset, cursor de la página siguiente (ver ``next``)
+        - count        (opcional): con keyset, true — incluye el total de filas
+        - format       (opcional): csv / xlsx — descarga el reporte completo sin paginar
+
+        Las filas se ordenan por (usuario, cliente, id_ticket), que es también
+        la llave de la paginación con ``pagination=keyset``.
         """
-        from datetime import datetime, date as dt_date
-        from collections import defaultdict
-
-        fecha_desde_str = request.query_params.get('fecha_desde')
-        fecha_hasta_str = request.query_params.get('fecha_hasta')
-
-        if not fecha_desde_str or not fecha_hasta_str:
-            return Response(
-                {'detail': 'Los parámetros fecha_desde y fecha_hasta son obligatorios'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
         try:
-            fecha_desde = datetime.strptime(fecha_desde_str, '%Y-%m-%d').date()
-            fecha_hasta = datetime.strptime(fecha_hasta_str, '%Y-%m-%d').date()
-        except ValueError:
-            return Response(
-                {'detail': 'Formato de fecha inválido. Use YYYY-MM-DD'},
-                status=status.HTTP_400_BAD_REQUEST
+            report = DriverReport(request.query_params)
+        except ReportParamsError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Exportación (?format=csv / xlsx): se recorren todas las filas por
+        # bloques sin paginar
+        export_format = request.accepted_renderer.format
+        if export_format in EXPORT_FORMATS:
+            params = request.query_params
+            return export_response(
+                export_format, f"reporte-driver_{params['fecha_desde']}_{params['fecha_hasta']}",
+                *report_rows(ReportJob.TYPE_DRIVER, params, EXPORT_CHUNK_SIZE)
             )
 
-        def time_to_seconds(t):
-            return t.hour * 3600 + t.minute * 60 + t.second
-
-        def seconds_to_str(total_seconds):
-            hours, remainder = divmod(int(total_seconds), 3600)
-            minutes, seconds = divmod(remainder, 60)
-            return f'{hours:02}:{minutes:02}:{seconds:02}'
-
-        # All reported times in the period for tickets that have an assigned user.
-        # Filtered by the ticket's assigned_to (not the reporter) so that
-        # user_total_seconds spans all clients correctly.
-        rt_qs = ReportedTime.objects.filter(
-            date_reported__date__gte=fecha_desde,
-            date_reported__date__lte=fecha_hasta,
-            id_ticket__assigned_to__isnull=False,
-        ).select_related(
-            'id_ticket',
-            'id_ticket__assigned_to',
-            'id_ticket__sub_program_name__program_name__client_name',
-        )
+        def compute():
+            paginator = self.report_paginator(request, DriverReport.ORDERING)
+            page = paginator.paginate_queryset(report.rows, request, view=self)
+            rows = page if page is not None else list(report.rows)
 
-        network_user_filter = request.query_params.get('network_user')
-        if network_user_filter:
-            rt_qs = rt_qs.filter(
-                id_ticket__assigned_to__network_user=network_user_filter
-            )
+            # Totales por (usuario, cliente) solo para los usuarios de esta página
+            results = report.build_results(rows)
 
-        # Single-pass aggregation
-        ticket_seconds = defaultdict(int)           # ticket_id -> seconds
-        user_client_seconds = defaultdict(int)      # (network_user, client) -> seconds
-        user_total_seconds = defaultdict(int)       # network_user -> seconds
-        ticket_info = {}                            # ticket_id -> Ticket instance
-        tickets_for_combo = defaultdict(set)        # (network_user, client) -> {ticket_ids}
-
-        for rt in rt_qs:
-            ticket = rt.id_ticket
-            euser = ticket.assigned_to
-            if not euser:
-                continue
-            try:
-                client_name = ticket.sub_program_name.program_name.client_name.client_name
-            except AttributeError:
-                continue
+            serializer = TicketReporteDriverSerializer(results, many=True)
+            if page is not None:
+                return paginator.get_paginated_response(serializer.data).data
+            return serializer.data
 
-            nu = euser.network_user
-            secs = time_to_seconds(rt.reported_time)
-
-            ticket_seconds[ticket.id_ticket] += secs
-            user_client_seconds[(nu, client_name)] += secs
-            user_total_seconds[nu] += secs
-            ticket_info[ticket.id_ticket] = ticket
-            tickets_for_combo[(nu, client_name)].add(ticket.id_ticket)
-
-        # Apply optional client filter to output only (not to aggregations so that
-        # user_total_seconds always reflects all clients)
-        cliente_filter = request.query_params.get('cliente')
-        if cliente_filter:
-            combos = {k: v for k, v in tickets_for_combo.items() if k[1] == cliente_filter}
-        else:
-            combos = tickets_for_combo
-
-        results = []
-        for (nu, client_name), ticket_ids in combos.items():
-            t_uc = user_client_seconds[(nu, client_name)]
-            t_total = user_total_seconds[nu]
-            porcentaje = round((t_uc / t_total) * 100, 1) if t_total > 0 else 0.0
-
-            for ticket_id in ticket_ids:
-                ticket = ticket_info[ticket_id]
-                euser = ticket.assigned_to
-                parts = [euser.name]
-                if euser.middle_name:
-                    parts.append(euser.middle_name)
-                parts.append(euser.last_name)
-                if euser.second_last_name:
-                    parts.append(euser.second_last_name)
-
-                results.append({
-                    'euser_nombre': ' '.join(parts),
-                    'network_user': nu,
-                    'cliente': client_name,
-                    'id_ticket': ticket_id,
-                    'ticket_title': ticket.ticket_title,
-                    'fecha_creacion': ticket.create_at,
-                    'fecha_cierre': ticket.closing_date,
-                    'fecha_estimada_cierre': ticket.estimated_closing_date,
-                    'tiempo_ticket': seconds_to_str(ticket_seconds[ticket_id]),
-                    'tiempo_usuario_cliente': seconds_to_str(t_uc),
-                    'porcentaje_cliente': porcentaje,
-                    'tiempo_total_usuario': seconds_to_str(t_total),
-                    'cumple': ticket.cumplimiento,
-                })
-
-        results.sort(key=lambda x: (x['network_user'], x['cliente'], x['id_ticket']))
-
-        page = self.paginate_queryset(results)
-        if page is not None:
-            serializer = TicketReporteDriverSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = TicketReporteDriverSerializer(results, many=True)
-        return Response(serializer.data)
+        return Response(cached_report(
+            'reporte-driver', request.query_params, compute,
+            domains=(TICKETS_VERSION, REPORTED_TIMES_VERSION)
+        ))
 
     @action(detail=False, methods=['get'])
     def backlog(self, request):
@@ -1110,6 +1103,10 @@ class WorkingHoursViewSet(CustomDeleteMixin, viewsets.ModelViewSet):
     queryset = WorkingHours.objects.all()
     serializer_class = WorkingHoursSerializer
     permission_classes = [IsAuthenticated]
+    filterset_fields = {
+        'client_name': ['exact', 'isnull'],
+        'id_services': ['exact', 'isnull'],
+    }
     # permission_classes = [IsAuthenticated, IsAdminOrReadOnly]
     
         
@@ -1117,51 +1114,20 @@ class ProjectDateViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = ProjectDateSerializer
     
-    holidays = [];
-    weekDays = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
-    schedules = [];
-    start_time = None
-    end_time = None
-
-    # función reutilizable en tu app
-    def get_holidays(self):
-        holidays = cache.get("holidays")
-        
-        if holidays is None:
-            # fallback si el cache fue limpiado
-            self.set_holidays();
+    def get_holidays(self, year=None):
+        """
+        Festivos desde el almacén local (sin llamadas de red)
+        """
+        year = year or timezone.localdate().year
+        return sorted(day for day in get_holiday_set() if day.year == year)
 
-        holidays = cache.get("holidays", [])
-        return holidays
-    
-    @shared_task
-    def set_holidays():
-        year = timezone.now().year
-        url = f'https://api-colombia.com/api/v1/Holiday/year/{year}'
-        response = requests.get(url, verify=False)
-        try:
-            if response.status_code == 200:
-                holidays = [];
-                for holiday in response.json():
-                    date = holiday.get("date")
-                    onlyDate = date.split("T")[0]
-                    holidays.append( datetime.strptime(onlyDate, "%Y-%m-%d").date())
-                    
-                cache.set("holidays", holidays, timeout=None)
-        except Exception as e:     
-            return Response({
-                'success': False,
-                'message': str(e),
-                'data': []
-            }, status=status.HTTP_400_BAD_REQUEST)
-    
     @action(detail=False, methods=['get'], url_path='holidays')
     def holidays(self, request):
         try:
             return Response({
                 'success': True,
                 'message': str('Se obtuvieron los días festivos correctamente'),
-                'data': self.get_holidays()
+                'data': self.get_holidays(int(request.query_params.get('year', 0)) or None)
             }, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({
@@ -1170,107 +1136,250 @@ class ProjectDateViewSet(viewsets.ViewSet):
                 'data': []
             }, status=status.HTTP_400_BAD_REQUEST)
     
-    def get_schedules(self):
-        return self.schedules;
-    
-    #Trae los horario registrados
-    def set_schedules(self):
-        schedulesRealized = WorkingHoursSerializer(WorkingHours.objects.all(), many=True)
-        self.schedules = schedulesRealized.data
-    
-    #Valida si un día es habil o no
-    def isWorkDay(self, date):
-        dateString = date
-        day = date.weekday()
-        self.set_holidays()
-        self.set_schedules()
-        if dateString in self.get_holidays():
-            return False
-        
-        for item in self.get_schedules():
-            if item.get("week_day") == self.weekDays[day]:
-                return True
-        
-        return False
-    
-    # Encuentra el siguiente día habil
-    def getNextWorkDay(self, date):
-        currentDay = date
-        holiday = True
-        while holiday:
-            nextDay = currentDay + timedelta(days=1)
-            if self.isWorkDay(nextDay):
-                holiday = False
-                break
-            currentDay = nextDay;
-        
-        return nextDay
-    
-    # combina la fecha con la hora para entregar el formato requerido.
-    def combineDateTime(self, date, time):
-        dateTime = datetime.combine(date, time)
-        dateTime = str(dateTime).replace(" ", "T")
-        dateTime = datetime.strptime(dateTime, "%Y-%m-%dT%H:%M:%S") 
-        return dateTime
-    
-    #Encuentra la hora de entra y salida de un dia de las semana.
-    def set_times(self, date):
-        for item in self.schedules: # Buscar el horario del día actual
-            if item.get("week_day") == self.weekDays[date.weekday()]:
-                self.start_time = item["start_time"]
-                self.end_time = item["end_time"]
-    
+    def get_calendar(self, client=None, service=None):
+        """
+        Calendario laboral compilado (en memoria por proceso) del cliente y
+        servicio indicados; sin ellos se usa el horario general
+        """
+        return get_business_calendar(client or None, service or None)
+
     @action(detail=False, methods=['post'], url_path='calculate-date')
     def post(self, request):
         try:
-            dateCurrent = datetime.strptime(request.data.get("date_creation"), "%Y-%m-%dT%H:%M:%S")        
+            dateCurrent = datetime.strptime(request.data.get("date_creation"), "%Y-%m-%dT%H:%M:%S")
             remainigHours = request.data.get("ans")
-            timeDateInitial = dateCurrent.time()
-            dateCurrent = self.combineDateTime(dateCurrent, timeDateInitial)
-            self.set_schedules()
-            
-            while remainigHours > 0:
-                # Si no es día laborable, buscar el siguiente            
-                if not self.isWorkDay(dateCurrent.date()): 
-                    dateCurrent = self.getNextWorkDay(dateCurrent.date())
-                    self.set_times(dateCurrent)
-                    dateCurrent = self.combineDateTime(dateCurrent, datetime.strptime(self.start_time, "%H:%M:%S").time())
-                    continue 
-
-                self.set_times(dateCurrent)
-                    
-                dateStarTime = self.combineDateTime(dateCurrent, datetime.strptime(self.start_time, "%H:%M:%S").time())
-                # Si el momento actual es menor al hora de inicio de ese mismo día, ajustar a la hora de inicio del mismo día.
-                if dateCurrent < dateStarTime: 
-                    dateCurrent = dateStarTime
-                    
-                dateEndTime = self.combineDateTime(dateCurrent, datetime.strptime(self.end_time, "%H:%M:%S").time())
-                # si el momento actual es mayor o igual a la hora final dese dia, ajustar a la hora de inicio del siguiente día.
-                if dateCurrent >= dateEndTime:
-                    self.set_times(dateCurrent)
-                    dateCurrent = self.getNextWorkDay(dateCurrent.date())
-                    dateCurrent = self.combineDateTime(dateCurrent, datetime.strptime(self.start_time, "%H:%M:%S").time())
-                    continue
-                            
-                timeCurrenteEnd = self.combineDateTime(dateCurrent, datetime.strptime(self.end_time, "%H:%M:%S").time())
-                
-                # Calculo de el tiempo dispoble hasta final del dia actual 
-                avalibleDayTime = (timeCurrenteEnd - dateCurrent).total_seconds() / 3600 
-                #Si el tiempo restanten es menor al dispobible se suman las horas al momento actual
-                if remainigHours <= avalibleDayTime: 
-                    dateCurrent = dateCurrent + timedelta(hours=remainigHours)
-                    remainigHours = 0
-                    continue
-                
-                #Se restan la horas disponibles del día para calcular la horas restantes para el siguiente dái
-                remainigHours = remainigHours - avalibleDayTime
-                
-                #Se encuentra el siguiente dpia habil y se le suman las horas restante
-                dateCurrent = self.getNextWorkDay(dateCurrent.date())
-                self.set_times(dateCurrent)
-                dateCurrent = self.combineDateTime(dateCurrent, datetime.strptime(self.start_time, "%H:%M:%S").time())
-                    
+            calendar = self.get_calendar(request.data.get("client"), request.data.get("service"))
+            dateCurrent = calendar.add_business_hours(dateCurrent, remainigHours)
             return Response({"response": dateCurrent}, status=status.HTTP_200_OK)
-                
+
         except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['post'], url_path='calculate-date-batch')
+    @pinned_calendar_versions()
+    def calculate_date_batch(self, request):
+        """
+        Calcula la fecha estimada de cierre de varios tickets en una sola petición.
+        Las versiones del calendario se leen una sola vez para todo el lote.
+
+        Body (uno o ambos):
+        - items: [{"date_creation": "YYYY-MM-DDTHH:MM:SS", "ans": horas,
+          "client": id_opcional, "service": id_opcional}, ...]
+        - tickets: [id_ticket, ...] — usa create_at del ticket, las horas de su
+          ANS y el calendario de su cliente y servicio
+        """
+        serializer = ProjectDateBatchSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        if not self.get_calendar().week_capacity and not WorkingHours.objects.exists():
+            return Response({
+                'success': False,
+                'message': 'No hay horarios laborales configurados'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        items = []
+        for item in serializer.validated_data.get('items', []):
+            try:
+                dateCurrent = datetime.strptime(item['date_creation'], "%Y-%m-%dT%H:%M:%S")
+                calendar = self.get_calendar(item.get('client'), item.get('service'))
+                response = calendar.add_business_hours(dateCurrent, item['ans'])
+                items.append({**item, 'response': response})
+            except ValueError as e:
+                items.append({**item, 'error': str(e)})
+
+        ticket_ids = serializer.validated_data.get('tickets', [])
+        found = {
+            id_ticket: (create_at, ans_hours, sub_program, service)
+            for id_ticket, create_at, ans_hours, sub_program, service in Ticket.objects.filter(
+                id_ticket__in=ticket_ids
+            ).values_list(
+                'id_ticket', 'create_at', 'ticket_ans__ans_hours',
+                'sub_program_name', 'ticket_service'
+            )
+        }
+        tickets = []
+        for id_ticket in ticket_ids:
+            if id_ticket not in found:
+                tickets.append({'id_ticket': id_ticket, 'error': 'Ticket no encontrado'})
+                continue
+            create_at, ans_hours, sub_program, service = found[id_ticket]
+            if ans_hours is None:
+                tickets.append({
+                    'id_ticket': id_ticket,
+                    'error': 'El ANS del ticket no tiene horas configuradas'
+                })
+                continue
+            try:
+                calendar = get_ticket_calendar(sub_program, service)
+                response = calendar.add_business_hours(create_at, ans_hours)
+            except ValueError as e:
+                tickets.append({'id_ticket': id_ticket, 'error': str(e)})
+                continue
+            tickets.append({
+                'id_ticket': id_ticket,
+                'date_creation': create_at,
+                'ans': ans_hours,
+                'response': response,
+            })
+
+        return Response({
+            'success': True,
+            'data': {
+                'items': items,
+                'tickets': tickets,
+            }
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='calculate-date-matrix')
+    def calculate_date_matrix(self, request):
+        """
+        Proyecta la fecha estimada de cierre desde una misma fecha de creación
+        para todos los ANS (o para las horas enviadas) en un solo recorrido del
+        calendario.
+
+        Body:
+        - date_creation: "YYYY-MM-DDTHH:MM:SS"
+        - hours: [horas, ...] (opcional, por defecto las horas de cada ANS)
+        - client, service: alcance del calendario laboral (opcional)
+        """
+        serializer = ProjectDateMatrixSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        try:
+            date_creation = datetime.strptime(data['date_creation'], "%Y-%m-%dT%H:%M:%S")
+        except ValueError:
+            return Response({
+                'success': False,
+                'message': 'Formato de date_creation inválido. Use YYYY-MM-DDTHH:MM:SS'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if 'hours' in data:
+            rows = [{'ans': hours} for hours in data['hours']]
+        else:
+            rows = [
+                {'id_ans': id_ans, 'ans_name': ans_name, 'ans': ans_hours}
+                for id_ans, ans_name, ans_hours in ANS.objects.filter(
+                    ans_hours__isnull=False
+                ).order_by('ans_hours', 'id_ans').values_list('id_ans', 'ans_name', 'ans_hours')
+            ]
+
+        calendar = self.get_calendar(data.get('client'), data.get('service'))
+        try:
+            due_dates = calendar.add_business_hours_many(
+                date_creation, [row['ans'] for row in rows]
+            )
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        for row, due_date in zip(rows, due_dates):
+            row['response'] = due_date
+
+        return Response({
+            'success': True,
+            'data': {
+                'date_creation': date_creation,
+                'results': rows,
+            }
+        }, status=status.HTTP_200_OK)
+
+
+class ReportJobViewSet(viewsets.ViewSet):
+    """
+    ViewSet para calcular reportes pesados en segundo plano.
+
+    - POST   /report-jobs/                 encola el reporte (o reutiliza uno reciente)
+    - GET    /report-jobs/{id}/            estado del reporte
+    - GET    /report-jobs/{id}/download/   archivo comprimido (gzip) del resultado
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Cada usuario solo ve los reportes que solicitó; el staff ve todos
+        """
+        queryset = ReportJob.objects.all()
+        user = self.request.user
+        if not user.is_staff:
+            queryset = queryset.filter(requested_by=user.username)
+        return queryset
+
+    def get_job(self, pk):
+        try:
+            return self.get_queryset().get(pk=pk)
+        except (ReportJob.DoesNotExist, ValidationError):
+            return None
+
+    def create(self, request):
+        serializer = ReportJobCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+
+        try:
+            job, created = request_report_job(
+                data['report_type'], data['result_format'], data['params'],
+                requested_by=request.user.username
+            )
+        except ReportParamsError as e:
+            return Response({
+                'success': False,
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'success': True,
+            'message': 'Reporte encolado' if created else 'Se reutiliza un reporte existente',
+            'data': ReportJobSerializer(job, context={'request': request}).data
+        }, status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK)
+
+    def retrieve(self, request, pk=None):
+        job = self.get_job(pk)
+        if job is None:
+            return Response({
+                'success': False,
+                'message': 'Reporte no encontrado'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            'success': True,
+            'data': ReportJobSerializer(job, context={'request': request}).data
+        })
+
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        job = self.get_job(pk)
+        if job is None:
+            return Response({
+                'success': False,
+                'message': 'Reporte no encontrado'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        if job.status != ReportJob.STATUS_DONE:
+            return Response({
+                'success': False,
+                'message': f'El reporte aún no está disponible (estado: {job.status})'
+            }, status=status.HTTP_409_CONFLICT)
+
+        path = result_path(job)
+        if not path.exists():
+            return Response({
+                'success': False,
+                'message': 'El archivo del reporte ya no existe'
+            }, status=status.HTTP_410_GONE)
+
+        params = job.params
+        filename = '_'.join((
+            job.report_type, params.get('fecha_desde', ''), params.get('fecha_hasta', '')
+        ))
+        return FileResponse(
+            open(path, 'rb'),
+            as_attachment=True,
+            filename=f'{filename}.{job.result_format}.gz',
+            content_type='application/gzip',
+        )
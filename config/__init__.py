@@ -5,3 +5,7 @@ import pymysql
 
 # Hacer que PyMySQL funcione como mysqlclient
 pymysql.install_as_MySQLdb()
+
+from .celery import app as celery_app  # noqa: E402
+
+__all__ = ('celery_app',)
@@ -14,13 +14,64 @@ URL_LDAP = config('URL_LDAP')
 TOKEN_LDAP = config('TOKEN_LDAP')
 
 
+# Cache compartido entre procesos (Redis). Sin REDIS_URL se usa cache local en memoria.
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=REDIS_URL or 'redis://localhost:6379/0')
+CELERY_TIMEZONE = 'America/Bogota'
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=False, cast=bool)
+
 CELERY_BEAT_SCHEDULE = {
     'actualizar-festivos-diario': {
-        'task': 'mi_app.tasks.set_holidays',
+        'task': 'apps.tickets.tasks.sync_holidays',
         'schedule': crontab(hour=3, minute=0),
     },
+    'recalcular-cumplimiento-diario': {
+        'task': 'apps.tickets.tasks.recalculate_cumplimiento',
+        'schedule': crontab(hour=3, minute=30),
+        'kwargs': {'days': 7},
+    },
+    'depurar-reportes-diario': {
+        'task': 'apps.tickets.tasks.purge_report_jobs',
+        'schedule': crontab(hour=4, minute=0),
+    },
 }
 
+# Festivos: se cargan en la tabla local con `manage.py sync_holidays` o con la tarea programada
+HOLIDAYS_YEARS_AHEAD = config('HOLIDAYS_YEARS_AHEAD', default=2, cast=int)
+HOLIDAYS_API_TIMEOUT = config('HOLIDAYS_API_TIMEOUT', default=10, cast=int)
+HOLIDAYS_API_VERIFY_SSL = config('HOLIDAYS_API_VERIFY_SSL', default=True, cast=bool)
+
+# Capacidad laboral diaria (métricas de ocupación): descanso descontado por día hábil
+# y años hacia atrás que se mantienen materializados en la tabla daily-capacity
+WORKDAY_BREAK_MINUTES = config('WORKDAY_BREAK_MINUTES', default=90, cast=int)
+CAPACITY_YEARS_BACK = config('CAPACITY_YEARS_BACK', default=2, cast=int)
+
+# Reportes en segundo plano (report-jobs): reutilización y retención de resultados
+REPORT_JOB_TTL_MINUTES = config('REPORT_JOB_TTL_MINUTES', default=30, cast=int)
+REPORT_JOB_RETENTION_DAYS = config('REPORT_JOB_RETENTION_DAYS', default=7, cast=int)
+REPORT_JOB_PENDING_MINUTES = config('REPORT_JOB_PENDING_MINUTES', default=5, cast=int)
+
+# Cache de reportes y métricas (core.utils.report_cache): segundos máximos que
+# se sirve un resultado (las escrituras de tickets y tiempos lo invalidan antes)
+# y segundos que una petición espera a otra que calcula el mismo resultado
+REPORT_CACHE_SECONDS = config('REPORT_CACHE_SECONDS', default=300, cast=int)
+REPORT_CACHE_LOCK_SECONDS = config('REPORT_CACHE_LOCK_SECONDS', default=30, cast=int)
+
 # Sub-path prefix cuando Django está detrás de un reverse proxy con ruta base.
 # Ejemplo: /e-learning/e-seus  (sin slash final)
 # Dejar vacío si Django está en la raíz del dominio.
@@ -133,6 +184,9 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # Upload files
 UPLOAD_ROOT = BASE_DIR / 'uploads'
 
+# Resultados de los reportes en segundo plano
+REPORTS_ROOT = MEDIA_ROOT / 'reports'
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
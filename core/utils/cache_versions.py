@@ -0,0 +1,44 @@
+"""
+Contadores de versión (generaciones) guardados en el cache compartido.
+
+Permiten invalidar datos derivados que cada proceso guarda en memoria:
+quien escribe incrementa la versión y quien lee compara la versión que
+tiene en memoria con la del cache.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def _version_key(namespace: str) -> str:
+    return f'version:{namespace}'
+
+
+def _initial_version() -> int:
+    # Si la llave se pierde (reinicio o expulsión del cache) se reinicia con
+    # un valor basado en el reloj para no repetir una versión ya vista.
+    return int(time.time() * 1000)
+
+
+def get_version(namespace: str) -> int:
+    """
+    Retorna la versión actual de un espacio de nombres
+    """
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace: str) -> int:
+    """
+    Incrementa la versión de un espacio de nombres y retorna la nueva
+    """
+    key = _version_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, _initial_version(), timeout=None)
+        return cache.get(key)
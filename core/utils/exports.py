@@ -0,0 +1,128 @@
+"""
+Exportación de reportes a CSV y XLSX.
+
+Los renderers solo existen para que DRF acepte ``?format=csv`` y
+``?format=xlsx`` en la negociación de contenido; la vista detecta el formato
+con ``request.accepted_renderer.format`` y responde con ``export_response``,
+que recorre las filas una sola vez sin cargarlas en memoria.
+"""
+import csv
+import tempfile
+
+from django.http import FileResponse, StreamingHttpResponse
+from openpyxl import Workbook
+from rest_framework.renderers import BaseRenderer
+from rest_framework.settings import api_settings
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Por encima de este tamaño el libro XLSX se escribe a disco en lugar de memoria
+XLSX_SPOOL_SIZE = 10 * 1024 * 1024
+
+
+def _renderer_rows(data):
+    """
+    Filas y columnas para las respuestas que no son exportaciones (ej. errores)
+    """
+    rows = data if isinstance(data, list) else [data] if data else []
+    rows = [row for row in rows if isinstance(row, dict)]
+    return (list(rows[0]) if rows else []), rows
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Renderer de CSV para la negociación de contenido (``?format=csv``)
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # La exportación se transmite desde la vista; aquí solo llegan
+        # respuestas como los errores de validación
+        headers, rows = _renderer_rows(data)
+        return ''.join(_stream_csv(headers, rows)).encode(self.charset) if rows else b''
+
+
+class XLSXRenderer(BaseRenderer):
+    """
+    Renderer de XLSX para la negociación de contenido (``?format=xlsx``)
+    """
+    media_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    format = 'xlsx'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # La exportación se transmite desde la vista; aquí solo llegan
+        # respuestas como los errores de validación
+        headers, rows = _renderer_rows(data)
+        with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_SIZE) as handler:
+            _write_xlsx(handler, headers, rows)
+            handler.seek(0)
+            return handler.read()
+
+
+EXPORT_RENDERER_CLASSES = [
+    *api_settings.DEFAULT_RENDERER_CLASSES, CSVRenderer, XLSXRenderer
+]
+EXPORT_FORMATS = (CSVRenderer.format, XLSXRenderer.format)
+
+
+class _Echo:
+    """
+    Pseudo-buffer para ``csv.writer`` que retorna la línea escrita
+    """
+    def write(self, value):
+        return value
+
+
+def _stream_csv(headers, rows):
+    writer = csv.writer(_Echo())
+    # BOM para que Excel reconozca el archivo como UTF-8
+    yield '\ufeff' + writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow([row.get(header) for header in headers])
+
+
+def _xlsx_value(value):
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    return str(value)
+
+
+def _write_xlsx(handler, headers, rows):
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Reporte')
+    sheet.append(headers)
+    for row in rows:
+        sheet.append([_xlsx_value(row.get(header)) for header in headers])
+    workbook.save(handler)
+
+
+def export_response(export_format: str, filename: str, headers, rows):
+    """
+    Respuesta de descarga con ``rows`` (iterable de diccionarios) en el formato
+    indicado. ``headers`` define las columnas y su orden.
+
+    El CSV se transmite con ``StreamingHttpResponse`` a medida que se generan
+    las filas. El XLSX (un zip que solo se puede cerrar al final) se escribe
+    con el modo de solo escritura de openpyxl a un archivo temporal y luego se
+    transmite; en ambos casos la memoria no crece con la cantidad de filas.
+    """
+    if export_format == CSVRenderer.format:
+        response = StreamingHttpResponse(
+            _stream_csv(headers, rows), content_type='text/csv; charset=utf-8'
+        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+        return response
+
+    handler = tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_SIZE)
+    _write_xlsx(handler, headers, rows)
+    handler.seek(0)
+    return FileResponse(
+        handler,
+        as_attachment=True,
+        filename=f'{filename}.xlsx',
+        content_type=XLSXRenderer.media_type,
+    )
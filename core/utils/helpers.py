@@ -87,42 +87,27 @@ def validate_email(email: str) -> bool:
     return bool(re.match(pattern, email))
 
 
-def get_business_hours_diff(start_date: datetime, end_date: datetime) -> float:
+def get_business_hours_diff(start_date: datetime, end_date: datetime, calendar=None) -> float:
     """
     Calcula la diferencia en horas hábiles entre dos fechas
-    Solo cuenta de lunes a viernes, de 9 AM a 6 PM
+    según los horarios laborales (WorkingHours) y los festivos configurados
     """
-    business_hours = 0
-    current = start_date
-    
-    while current < end_date:
-        # Verificar si es día hábil (lunes=0, domingo=6)
-        if current.weekday() < 5:
-            # Hora de inicio (9 AM)
-            start_of_day = current.replace(hour=9, minute=0, second=0)
-            # Hora de fin (6 PM)
-            end_of_day = current.replace(hour=18, minute=0, second=0)
-            
-            # Ajustar inicio si la fecha actual es después de las 9 AM
-            if current > start_of_day:
-                start_of_day = current
-            
-            # Ajustar fin si la fecha final es antes de las 6 PM
-            if end_date < end_of_day:
-                end_of_day = end_date
-            
-            # Si ambas fechas están dentro del horario hábil
-            if start_of_day < end_of_day and start_of_day.hour < 18:
-                diff = (end_of_day - start_of_day).total_seconds() / 3600
-                business_hours += diff
-        
-        # Avanzar al siguiente día
-        current = (current + timedelta(days=1)).replace(hour=9, minute=0, second=0)
-        
-        if current >= end_date:
-            break
-    
-    return business_hours
+    return get_business_hours_diffs([(start_date, end_date)], calendar)[0] or 0.0
+
+
+def get_business_hours_diffs(pairs, calendar=None) -> list:
+    """
+    Calcula las horas hábiles de una lista de pares (inicio, fin) en una sola pasada.
+    Los pares con algún extremo vacío retornan None.
+    """
+    if calendar is None:
+        from apps.tickets.business_calendar import get_business_calendar
+        calendar = get_business_calendar()
+
+    return [
+        seconds / 3600 if seconds is not None else None
+        for seconds in calendar.business_seconds_many(pairs)
+    ]
 
 
 def sanitize_filename(filename: str) -> str:
@@ -1,7 +1,16 @@
 """
 Clases de paginación personalizadas
 """
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from datetime import date, datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class CustomPageNumberPagination(PageNumberPagination):
@@ -11,3 +20,135 @@ class CustomPageNumberPagination(PageNumberPagination):
     page_size = 10  # Tamaño por defecto
     page_size_query_param = 'page_size'  # Permite ?page_size=10
     max_page_size = 100  # Máximo permitido para evitar sobrecarga
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por llave (keyset): cada página continúa después de la última
+    fila de la anterior filtrando por las columnas de ``ordering``, así que
+    la página N cuesta lo mismo que la primera (sin OFFSET ni COUNT).
+
+    ``ordering`` son las columnas (campos o anotaciones, todas ascendentes)
+    que identifican cada fila; la última debe ser única (ej. el id). El
+    cursor es opaco y solo avanza (``next``). El total se calcula solo si el
+    cliente envía ``count=true``. Es opcional: el cliente la pide con
+    ``pagination=keyset`` (o al enviar un ``cursor``), ver ``requested``.
+
+    Las columnas que admiten NULL se asumen ordenadas con los NULL primero
+    (comportamiento de MySQL y SQLite en orden ascendente).
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    pagination_query_param = 'pagination'
+    pagination_value = 'keyset'
+    invalid_cursor_message = 'Cursor inválido'
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+
+    @classmethod
+    def requested(cls, request) -> bool:
+        """
+        Indica si el cliente pidió la paginación por llave
+        """
+        params = request.query_params
+        return (
+            params.get(cls.pagination_query_param, '').lower() == cls.pagination_value
+            or cls.cursor_query_param in params
+        )
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    @staticmethod
+    def _value(row, field):
+        return row[field] if isinstance(row, dict) else getattr(row, field)
+
+    @staticmethod
+    def _encode_value(value):
+        # Las fechas se guardan con isoformat (conserva los microsegundos) y
+        # marcadas con su tipo para reconstruirlas al decodificar
+        if isinstance(value, datetime):
+            return {'datetime': value.isoformat()}
+        if isinstance(value, date):
+            return {'date': value.isoformat()}
+        return value
+
+    @staticmethod
+    def _decode_value(value):
+        if isinstance(value, dict):
+            if set(value) == {'datetime'}:
+                return datetime.fromisoformat(value['datetime'])
+            if set(value) == {'date'}:
+                return date.fromisoformat(value['date'])
+            raise ValueError('Valor de cursor desconocido')
+        return value
+
+    def encode_cursor(self, row) -> str:
+        values = [self._encode_value(self._value(row, field)) for field in self.ordering]
+        payload = json.dumps(values, cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, cursor) -> list:
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError('Cantidad de valores inválida')
+            return [self._decode_value(value) for value in values]
+        except (ValueError, TypeError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def after(self, values) -> Q:
+        """
+        Condición de las filas posteriores a ``values`` en el orden lexicográfico
+        de ``ordering``: (a > va) o (a = va y b > vb) o ...
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            if value is None:
+                condition |= equal & Q(**{f'{field}__isnull': False})
+                equal &= Q(**{f'{field}__isnull': True})
+            else:
+                condition |= equal & Q(**{f'{field}__gt': value})
+                equal &= Q(**{field: value})
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        self.count = None
+        if request.query_params.get(self.count_query_param, '').lower() == 'true':
+            self.count = queryset.count()
+
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.after(self.decode_cursor(cursor)))
+
+        rows = list(queryset[:self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        self.page = rows[:self.page_size_value]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        # El total solo se calcula en la página donde se pide
+        url = remove_query_param(self.request.build_absolute_uri(), self.count_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        response = {'next': self.get_next_link()}
+        if self.count is not None:
+            response['count'] = self.count
+        response['results'] = data
+        return Response(response)
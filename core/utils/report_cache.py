@@ -0,0 +1,94 @@
+"""
+Cache de resultados de reportes en el cache compartido.
+
+La llave combina el nombre del reporte, el alcance de visibilidad, el día
+actual, las generaciones (``cache_versions``) de los dominios de los que
+depende y un hash de los parámetros normalizados. Quien escribe en un
+dominio incrementa su generación, así que un resultado guardado nunca se
+sirve después de un cambio: la llave nueva simplemente no existe todavía.
+
+Los valores se guardan comprimidos (pickle + zlib). Si varias peticiones
+piden la misma llave a la vez, solo una calcula el resultado (candado con
+``cache.add``) y las demás esperan a que quede guardado.
+"""
+import hashlib
+import json
+import pickle
+import time
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .cache_versions import get_version
+
+# Intervalo de espera mientras otra petición calcula el mismo resultado
+WAIT_INTERVAL = 0.1
+
+
+def normalize_params(params, exclude=('format',)) -> dict:
+    """
+    Parámetros de la petición (QueryDict o dict) sin vacíos, ordenados y como texto
+    """
+    items = params.lists() if hasattr(params, 'lists') else (
+        (key, value if isinstance(value, (list, tuple)) else [value])
+        for key, value in params.items()
+    )
+    normalized = {}
+    for key, values in items:
+        values = sorted(str(value).strip() for value in values if str(value).strip())
+        if key not in exclude and values:
+            normalized[key] = values
+    return dict(sorted(normalized.items()))
+
+
+def report_cache_key(name, params, domains=(), scope='') -> str:
+    payload = json.dumps(normalize_params(params), sort_keys=True)
+    digest = hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    versions = '.'.join(str(get_version(domain)) for domain in domains)
+    return f'report:{name}:{scope}:{timezone.localdate().isoformat()}:{versions}:{digest}'
+
+
+def _load(key):
+    value = cache.get(key)
+    return None if value is None else pickle.loads(zlib.decompress(value))
+
+
+def cached_report(name, params, compute, domains=(), scope='', timeout=None):
+    """
+    Retorna el resultado de ``compute()`` para el reporte ``name`` con
+    ``params``, desde el cache cuando ninguna generación de ``domains`` cambió.
+
+    ``scope`` separa los resultados que dependen de lo que puede ver el
+    usuario (ej. 'staff' o 'user:<network_user>').
+    """
+    key = report_cache_key(name, params, domains, scope)
+    data = _load(key)
+    if data is not None:
+        return data
+
+    lock_key = f'{key}:lock'
+    lock_timeout = settings.REPORT_CACHE_LOCK_SECONDS
+    if not cache.add(lock_key, 1, timeout=lock_timeout):
+        # Otra petición lo está calculando: se espera hasta que lo guarde o
+        # libere el candado (por un error) y en ese caso se calcula aquí
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(WAIT_INTERVAL)
+            data = _load(key)
+            if data is not None:
+                return data
+            if cache.get(lock_key) is None:
+                break
+        return compute()
+
+    try:
+        data = compute()
+        cache.set(
+            key, zlib.compress(pickle.dumps(data)),
+            timeout=settings.REPORT_CACHE_SECONDS if timeout is None else timeout
+        )
+    finally:
+        cache.delete(lock_key)
+    return data
@@ -51,3 +51,39 @@ def admin_client(api_client, django_user_model):
     )
     api_client.force_authenticate(user=admin)
     return api_client
+
+
+@pytest.fixture
+def ticket_data(db):
+    """
+    Datos válidos para crear un ticket de un cliente con horario propio
+    (lunes a viernes de 8:00 a 17:00)
+    """
+    from datetime import time
+
+    from apps.tickets.business_calendar import DAY_NAMES
+    from apps.tickets.models import (
+        ANS, Client, Program, Service, Status, SubProgram, TicketPriority, User, WorkingHours
+    )
+
+    client = Client.objects.create(client_name='Tests Client')
+    for week_day in DAY_NAMES[:5]:
+        WorkingHours.objects.create(
+            week_day=week_day, start_time=time(8, 0), end_time=time(17, 0), client_name=client
+        )
+    program = Program.objects.create(program_name='Tests Program', client_name=client)
+    sub_program = SubProgram.objects.create(
+        sub_program_name='Tests SubProgram', program_name=program
+    )
+    return {
+        'ticket_title': 'Ticket de prueba',
+        'ticket_description': 'Test',
+        'ticket_service': Service.objects.create(service_name='Tests Service').pk,
+        'ticket_priority': TicketPriority.objects.create(priority_name='Tests').pk,
+        'ticket_ans': ANS.objects.create(ans_name='Tests 8 horas', ans_hours=8).pk,
+        'reporter_user': User.objects.create(
+            network_user='testsuser', mail='tests@example.com'
+        ).pk,
+        'sub_program_name': sub_program.pk,
+        'status_id': Status.objects.create(status_name='Tests abierto').pk,
+    }
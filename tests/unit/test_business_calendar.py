@@ -0,0 +1,137 @@
+"""
+Tests para el calendario laboral compilado
+"""
+import random
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+from apps.tickets.business_calendar import BusinessCalendar, weekday_from_name
+
+
+SCHEDULE = {
+    0: (time(8, 0), time(17, 0)),
+    1: (time(8, 0), time(17, 0)),
+    2: (time(8, 0), time(17, 0)),
+    3: (time(8, 0), time(17, 0)),
+    4: (time(8, 0), time(16, 0)),
+    5: (time(9, 0), time(12, 0)),
+}
+
+HOLIDAYS = {
+    date(2026, 1, 1), date(2026, 1, 12), date(2026, 3, 23), date(2026, 4, 2), date(2026, 4, 3),
+}
+
+
+def walk_day_by_day(calendar, start, hours):
+    """
+    Implementación de referencia: recorre día a día como el cálculo original
+    """
+    remaining = timedelta(hours=hours)
+    current = start
+    while remaining > timedelta(0):
+        day = current.date()
+        if calendar.is_work_day(day):
+            day_start, day_end = calendar.day_bounds(day)
+            current = max(current, day_start)
+            if current < day_end:
+                available = day_end - current
+                if remaining <= available:
+                    return current + remaining
+                remaining -= available
+        current = datetime.combine(day + timedelta(days=1), time.min)
+    return current
+
+
+class TestBusinessCalendar:
+    """
+    Tests para BusinessCalendar
+    """
+
+    @pytest.fixture
+    def calendar(self):
+        return BusinessCalendar(SCHEDULE, HOLIDAYS)
+
+    def test_weekday_from_name(self):
+        assert weekday_from_name('Lunes') == 0
+        assert weekday_from_name('Miércoles') == 2
+        assert weekday_from_name('miercoles') == 2
+        assert weekday_from_name('Festivo') is None
+
+    def test_within_same_day(self, calendar):
+        start = datetime(2026, 1, 13, 9, 30)
+        assert calendar.add_business_hours(start, 2) == datetime(2026, 1, 13, 11, 30)
+
+    def test_before_opening_starts_at_opening(self, calendar):
+        start = datetime(2026, 1, 13, 6, 0)
+        assert calendar.add_business_hours(start, 1) == datetime(2026, 1, 13, 9, 0)
+
+    def test_exact_end_of_day(self, calendar):
+        start = datetime(2026, 1, 13, 8, 0)
+        assert calendar.add_business_hours(start, 9) == datetime(2026, 1, 13, 17, 0)
+
+    def test_skips_weekend_and_holiday(self, calendar):
+        # Sábado 10 de enero de 2026 a las 11:00, lunes 12 es festivo
+        start = datetime(2026, 1, 10, 11, 0)
+        assert calendar.add_business_hours(start, 2) == datetime(2026, 1, 13, 9, 0)
+
+    def test_zero_hours_returns_start(self, calendar):
+        start = datetime(2026, 1, 11, 3, 0)
+        assert calendar.add_business_hours(start, 0) == start
+
+    def test_without_schedule_raises(self):
+        with pytest.raises(ValueError):
+            BusinessCalendar({}).add_business_hours(datetime(2026, 1, 13, 9, 0), 1)
+
+    def test_matches_day_by_day_walk(self, calendar):
+        rng = random.Random(2026)
+        for _ in range(500):
+            start = datetime(2026, 1, 1) + timedelta(minutes=rng.randrange(0, 60 * 24 * 120))
+            hours = rng.choice([1, 4, 8, 9, 24, 40, 44, 45, 72, 200, 1000]) + rng.choice([0, 0.5])
+            expected = walk_day_by_day(calendar, start, hours)
+            assert calendar.add_business_hours(start, hours) == expected
+
+    def test_many_hours_matches_individual(self, calendar):
+        start = datetime(2026, 1, 9, 15, 30)
+        hours_list = [72, 4, 0, 24, 8, 4, 200.5]
+        assert calendar.add_business_hours_many(start, hours_list) == [
+            calendar.add_business_hours(start, hours) for hours in hours_list
+        ]
+
+
+class TestBusinessHoursIndex:
+    """
+    Tests para el cálculo de horas hábiles transcurridas
+    """
+
+    @pytest.fixture
+    def calendar(self):
+        return BusinessCalendar(SCHEDULE, HOLIDAYS)
+
+    def test_same_day(self, calendar):
+        start = datetime(2026, 1, 13, 7, 0)
+        end = datetime(2026, 1, 13, 10, 30)
+        assert calendar.business_seconds_between(start, end) == 2.5 * 3600
+
+    def test_skips_weekend_and_holiday(self, calendar):
+        start = datetime(2026, 1, 9, 15, 0)
+        end = datetime(2026, 1, 13, 9, 0)
+        # Viernes 1h + sábado 3h + lunes festivo + martes 1h
+        assert calendar.business_seconds_between(start, end) == 5 * 3600
+
+    def test_reversed_range_is_zero(self, calendar):
+        assert calendar.business_seconds_between(
+            datetime(2026, 1, 14, 9, 0), datetime(2026, 1, 13, 9, 0)
+        ) == 0
+
+    def test_many_pairs_is_inverse_of_add(self, calendar):
+        rng = random.Random(4)
+        pairs, expected = [], []
+        for _ in range(300):
+            start = datetime(2026, 1, 1) + timedelta(minutes=rng.randrange(0, 60 * 24 * 200))
+            hours = rng.randrange(1, 300)
+            pairs.append((start, calendar.add_business_hours(start, hours)))
+            expected.append(hours * 3600)
+        pairs.append((None, datetime(2026, 1, 13)))
+        expected.append(None)
+        assert calendar.business_seconds_many(pairs) == expected
@@ -0,0 +1,59 @@
+"""
+Tests para la capacidad laboral diaria materializada
+"""
+from datetime import date, time
+
+import pytest
+from django.test.utils import override_settings
+
+from apps.tickets.business_calendar import DAY_NAMES
+from apps.tickets.capacity import available_seconds
+from apps.tickets.models import Client, DailyCapacity, WorkingHours
+
+# Lunes 2 a viernes 6 de marzo de 2026, sin festivos
+MONDAY = date(2026, 3, 2)
+FRIDAY = date(2026, 3, 6)
+
+
+@pytest.fixture
+def client_name():
+    return Client.objects.create(client_name='Capacidad Client').pk
+
+
+def create_hours(client_name, week_day):
+    return WorkingHours.objects.create(
+        week_day=week_day, start_time=time(8, 0), end_time=time(17, 0),
+        client_name_id=client_name
+    )
+
+
+@pytest.mark.django_db
+@override_settings(WORKDAY_BREAK_MINUTES=60)
+def test_consecutive_working_hours_changes_are_all_reflected(
+    client_name, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        create_hours(client_name, DAY_NAMES[0])
+    assert available_seconds(MONDAY, FRIDAY, client=client_name) == 8 * 3600
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for week_day in DAY_NAMES[1:5]:
+            create_hours(client_name, week_day)
+
+    assert available_seconds(MONDAY, FRIDAY, client=client_name) == 5 * 8 * 3600
+
+
+@pytest.mark.django_db
+@override_settings(WORKDAY_BREAK_MINUTES=60)
+def test_changed_hours_replace_materialized_days(client_name):
+    hours = [create_hours(client_name, week_day) for week_day in DAY_NAMES[:5]]
+    assert available_seconds(MONDAY, FRIDAY, client=client_name) == 5 * 8 * 3600
+
+    hours[0].end_time = time(13, 0)
+    hours[0].save()
+    hours[4].delete()
+
+    assert available_seconds(MONDAY, FRIDAY, client=client_name) == (4 + 3 * 8) * 3600
+    assert DailyCapacity.objects.filter(
+        client_name=client_name, capacity_date=FRIDAY, is_work_day=False
+    ).exists()
@@ -0,0 +1,46 @@
+"""
+Tests para el recálculo del cumplimiento de los tickets cerrados
+"""
+from datetime import datetime, time
+
+import pytest
+from django.utils import timezone
+
+from apps.tickets.business_calendar import DAY_NAMES
+from apps.tickets.models import Ticket, WorkingHours
+from apps.tickets.serializers import TicketCreateSerializer
+from apps.tickets.sla import recalculate_cumplimiento
+
+# El ANS vence el lunes 2 de marzo de 2026 a las 12:00 y el ticket estuvo
+# 4 horas hábiles en pausa; se cerró el martes a las 10:00
+ESTIMATED = timezone.make_aware(datetime(2026, 3, 2, 12, 0))
+CLOSED = timezone.make_aware(datetime(2026, 3, 3, 10, 0))
+
+
+@pytest.fixture
+def closed_tickets(ticket_data):
+    ids = []
+    for _ in range(5):
+        serializer = TicketCreateSerializer(data=ticket_data)
+        assert serializer.is_valid(), serializer.errors
+        ids.append(serializer.save().pk)
+    Ticket.objects.filter(pk__in=ids).update(
+        estimated_closing_date=ESTIMATED, closing_date=CLOSED,
+        sla_paused_seconds=4 * 3600, cumplimiento=False
+    )
+    return Ticket.objects.filter(pk__in=ids)
+
+
+@pytest.mark.django_db
+def test_shorter_workday_recomputes_cumplimiento_in_chunks(closed_tickets):
+    # Con jornada de 8:00 a 17:00 la pausa corre el límite al lunes 16:00
+    recalculate_cumplimiento(closed_since=ESTIMATED, chunk_size=2)
+    assert not closed_tickets.filter(cumplimiento=True).exists()
+
+    # Si el lunes termina a las 13:00 el límite pasa al martes 11:00
+    monday = WorkingHours.objects.get(client_name='Tests Client', week_day=DAY_NAMES[0])
+    monday.end_time = time(13, 0)
+    monday.save()
+
+    assert recalculate_cumplimiento(closed_since=ESTIMATED, chunk_size=2) >= 5
+    assert closed_tickets.filter(cumplimiento=True).count() == 5
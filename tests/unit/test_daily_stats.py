@@ -0,0 +1,56 @@
+"""
+Tests para el aporte de los tickets a la tabla diaria
+"""
+from datetime import date, datetime, timezone as dt_timezone
+
+from apps.tickets.daily_stats import bucket_key, contribution_delta, contributions
+
+
+def ticket_values(**overrides):
+    values = {
+        'create_at': datetime(2026, 3, 2, 15, 0, tzinfo=dt_timezone.utc),
+        'closing_date': None,
+        'cumplimiento': None,
+        'ticket_service': 1,
+        'status_id': 1,
+        'assigned_to': None,
+        'sub_program_name': None,
+    }
+    values.update(overrides)
+    return values
+
+
+def test_closing_moves_ticket_to_closed_and_compliant():
+    before = contributions(ticket_values(), client='ACME')
+    after = contributions(ticket_values(
+        status_id=2,
+        closing_date=datetime(2026, 3, 4, 14, 0, tzinfo=dt_timezone.utc),
+        cumplimiento=True,
+    ), client='ACME')
+
+    assert contribution_delta(before, after) == {
+        (date(2026, 3, 2), 'ACME', 1, 1, None): {'created': -1},
+        (date(2026, 3, 2), 'ACME', 1, 2, None): {'created': 1},
+        (date(2026, 3, 4), 'ACME', 1, 2, None): {'closed': 1, 'compliant': 1},
+    }
+
+
+def test_local_date_is_used_for_the_day():
+    # 03:00 UTC es el día anterior en America/Bogota
+    values = ticket_values(create_at=datetime(2026, 3, 3, 3, 0, tzinfo=dt_timezone.utc))
+
+    assert list(contributions(values, client='ACME')) == [(date(2026, 3, 2), 'ACME', 1, 1, None)]
+
+
+def test_unchanged_ticket_has_no_delta():
+    values = ticket_values(assigned_to='jdoe')
+    before = contributions(values, client='ACME')
+
+    assert contribution_delta(before, contributions(values, client='ACME')) == {}
+
+
+def test_bucket_key_distinguishes_null_dimensions():
+    unassigned = bucket_key((date(2026, 3, 2), None, 1, 2, None))
+
+    assert unassigned == '["2026-03-02", null, 1, 2, null]'
+    assert unassigned != bucket_key((date(2026, 3, 2), None, 1, 2, 'jdoe'))
@@ -0,0 +1,77 @@
+"""
+Tests para la fecha estimada de cierre de los tickets
+"""
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.tickets.models import ANS, Ticket, WorkingHours
+from apps.tickets.serializers import TicketCreateSerializer, TicketUpdateSerializer
+from apps.tickets.sla import ticket_calendar
+
+SENT_DATE = datetime(2026, 3, 20, 17, 0, tzinfo=dt_timezone.utc)
+
+
+def create_ticket(data):
+    serializer = TicketCreateSerializer(data=data)
+    assert serializer.is_valid(), serializer.errors
+    return serializer.save()
+
+
+@pytest.mark.django_db
+def test_create_uses_ans_business_hours(ticket_data):
+    ticket = create_ticket({**ticket_data, 'estimated_closing_date': SENT_DATE})
+
+    assert ticket.estimated_closing_date == ticket_calendar(ticket).add_business_hours(
+        ticket.create_at, 8
+    )
+
+
+@pytest.mark.django_db
+def test_create_without_working_hours_keeps_sent_date(ticket_data):
+    WorkingHours.objects.all().delete()
+
+    ticket = create_ticket({**ticket_data, 'estimated_closing_date': SENT_DATE})
+
+    assert ticket.estimated_closing_date == SENT_DATE
+
+
+@pytest.mark.django_db
+def test_update_ans_recomputes_date(ticket_data):
+    ticket = create_ticket(ticket_data)
+    ans = ANS.objects.create(ans_name='Tests 24 horas', ans_hours=24)
+
+    serializer = TicketUpdateSerializer(ticket, data={'ticket_ans': ans.pk}, partial=True)
+    assert serializer.is_valid(), serializer.errors
+    ticket = serializer.save()
+
+    assert ticket.estimated_closing_date == ticket_calendar(ticket).add_business_hours(
+        ticket.create_at, 24
+    )
+
+
+@pytest.mark.django_db
+def test_update_without_working_hours_keeps_date(ticket_data):
+    ticket = create_ticket(ticket_data)
+    estimated_closing_date = ticket.estimated_closing_date
+    WorkingHours.objects.all().delete()
+    ans = ANS.objects.create(ans_name='Tests 24 horas', ans_hours=24)
+
+    serializer = TicketUpdateSerializer(ticket, data={'ticket_ans': ans.pk}, partial=True)
+    assert serializer.is_valid(), serializer.errors
+
+    assert serializer.save().estimated_closing_date == estimated_closing_date
+
+
+@pytest.mark.django_db
+def test_backfill_skips_tickets_without_working_hours(ticket_data):
+    ticket = create_ticket(ticket_data)
+    Ticket.objects.filter(pk=ticket.pk).update(estimated_closing_date=None)
+    WorkingHours.objects.all().delete()
+
+    call_command('backfill_estimated_closing_date', stdout=StringIO())
+
+    ticket.refresh_from_db()
+    assert ticket.estimated_closing_date is None
@@ -0,0 +1,70 @@
+"""
+Tests para la exportación de reportes a CSV y XLSX
+"""
+import csv
+from io import BytesIO, StringIO
+
+import pytest
+from django.utils import timezone
+from openpyxl import load_workbook
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.tickets.models import ReportJob
+from apps.tickets.report_jobs import report_rows
+from apps.tickets.serializers import TicketCreateSerializer
+from apps.tickets.views import TicketViewSet
+from core.utils.exports import export_response
+
+HEADERS = ['id', 'nombre', 'horas']
+ROWS = [
+    {'id': 1, 'nombre': 'Ticket ñandú', 'horas': 1.5},
+    {'id': 2, 'nombre': 'Otro, con coma', 'horas': None},
+]
+
+
+def read_csv(content):
+    assert content.startswith('\ufeff')
+    return list(csv.reader(StringIO(content[1:])))
+
+
+def test_csv_export_has_headers_and_rows():
+    response = export_response('csv', 'reporte', HEADERS, iter(ROWS))
+
+    assert response['Content-Disposition'] == 'attachment; filename="reporte.csv"'
+    assert read_csv(b''.join(response.streaming_content).decode('utf-8')) == [
+        HEADERS, ['1', 'Ticket ñandú', '1.5'], ['2', 'Otro, con coma', ''],
+    ]
+
+
+def test_xlsx_export_has_headers_and_rows():
+    response = export_response('xlsx', 'reporte', HEADERS, iter(ROWS))
+
+    sheet = load_workbook(BytesIO(b''.join(response.streaming_content)))['Reporte']
+    assert [list(row) for row in sheet.iter_rows(values_only=True)] == [
+        HEADERS, [1, 'Ticket ñandú', 1.5], [2, 'Otro, con coma', None],
+    ]
+
+
+@pytest.mark.django_db
+def test_reporte_general_csv_matches_report_rows(django_user_model, ticket_data):
+    ids = []
+    for _ in range(3):
+        serializer = TicketCreateSerializer(data=ticket_data)
+        assert serializer.is_valid(), serializer.errors
+        ids.append(serializer.save().pk)
+    today = timezone.localdate().isoformat()
+    params = {'fecha_desde': today, 'fecha_hasta': today, 'cliente': 'Tests Client'}
+
+    request = APIRequestFactory().get('/api/tickets/reporte-general/', {**params, 'format': 'csv'})
+    force_authenticate(request, user=django_user_model(username='exports'))
+    view = TicketViewSet.as_view(
+        {'get': 'reporte_general'}, **TicketViewSet.reporte_general.kwargs
+    )
+    response = view(request)
+
+    assert response.status_code == 200
+    headers, rows = report_rows(ReportJob.TYPE_GENERAL, params)
+    content = read_csv(b''.join(response.streaming_content).decode('utf-8'))
+    assert content[0] == headers
+    assert [int(row[headers.index('id_ticket')]) for row in content[1:]] == ids
+    assert len(list(rows)) == 3
@@ -0,0 +1,91 @@
+"""
+Tests para la paginación por llave
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.db.models import Q
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.tickets.models import (
+    ANS, Client, Program, Service, Status, SubProgram, Ticket, TicketPriority, User
+)
+from apps.tickets.views import TicketViewSet
+from core.utils.pagination import KeysetPagination
+
+
+def test_cursor_round_trip_keeps_microseconds():
+    paginator = KeysetPagination(('create_at', 'id_ticket'))
+    create_at = datetime(2026, 3, 2, 15, 0, 0, 123456, tzinfo=dt_timezone.utc)
+    row = {'create_at': create_at, 'id_ticket': 7}
+
+    assert paginator.decode_cursor(paginator.encode_cursor(row)) == [create_at, 7]
+
+
+def test_after_is_lexicographic_with_nulls_first():
+    paginator = KeysetPagination(('assigned_user', 'ticket_client', 'id_ticket'))
+
+    assert paginator.after(['jdoe', None, 7]) == (
+        Q(pk__in=[])
+        | Q(assigned_user__gt='jdoe')
+        | (Q(assigned_user='jdoe') & Q(ticket_client__isnull=False))
+        | (Q(assigned_user='jdoe') & Q(ticket_client__isnull=True) & Q(id_ticket__gt=7))
+    )
+
+
+@pytest.mark.django_db
+def test_pages_return_each_row_once():
+    client = Client.objects.create(client_name='Keyset Client')
+    program = Program.objects.create(program_name='Keyset Program', client_name=client)
+    sub_program = SubProgram.objects.create(
+        sub_program_name='Keyset SubProgram', program_name=program
+    )
+    values = {
+        'ticket_service': Service.objects.create(service_name='Keyset Service'),
+        'ticket_priority': TicketPriority.objects.create(priority_name='Keyset'),
+        'ticket_ans': ANS.objects.create(ans_name='ANS Test'),
+        'reporter_user': User.objects.create(network_user='keysetuser', mail='test@example.com'),
+        'status_id': Status.objects.create(status_name='Keyset'),
+        'sub_program_name': sub_program,
+    }
+    # Fechas que solo difieren en microsegundos (mismo milisegundo)
+    start = datetime(2026, 3, 2, 15, 0, tzinfo=dt_timezone.utc)
+    expected = [
+        Ticket.objects.create(
+            ticket_title=f'Ticket {n}', ticket_description='Test',
+            create_at=start + timedelta(microseconds=n), **values
+        ).id_ticket
+        for n in range(5)
+    ]
+
+    factory = APIRequestFactory()
+    seen, cursor = [], None
+    for _ in range(len(expected)):
+        params = {'page_size': 2, **({'cursor': cursor} if cursor else {})}
+        paginator = KeysetPagination(('create_at', 'id_ticket'))
+        page = paginator.paginate_queryset(
+            Ticket.objects.filter(id_ticket__in=expected), Request(factory.get('/reporte/', params))
+        )
+        seen += [ticket.id_ticket for ticket in page]
+        if not paginator.has_next:
+            break
+        cursor = paginator.encode_cursor(page[-1])
+
+    assert seen == expected
+
+
+@pytest.mark.django_db
+def test_reports_keep_page_number_pagination_unless_keyset_is_requested(django_user_model):
+    view = TicketViewSet.as_view(
+        {'get': 'reporte_general'}, **TicketViewSet.reporte_general.kwargs
+    )
+    params = {'fecha_desde': '2026-03-01', 'fecha_hasta': '2026-03-31', 'cliente': 'Nadie'}
+
+    def get(**extra):
+        request = APIRequestFactory().get('/api/tickets/reporte-general/', {**params, **extra})
+        force_authenticate(request, user=django_user_model(username='paginacion'))
+        return view(request).data
+
+    assert set(get()) == {'count', 'next', 'previous', 'results'}
+    assert set(get(pagination='keyset')) == {'next', 'results'}
@@ -0,0 +1,87 @@
+"""
+Tests para el cache de resultados de reportes
+"""
+import pickle
+import zlib
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from core.utils import report_cache
+from core.utils.cache_versions import bump_version
+from core.utils.report_cache import cached_report, report_cache_key
+
+DOMAIN = 'tests_report_cache'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def counting_compute():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'calls': len(calls)}
+    return compute, calls
+
+
+def test_result_is_served_from_cache_until_version_bump():
+    compute, calls = counting_compute()
+    params = {'fecha_desde': '2026-03-01'}
+
+    assert cached_report('tests', params, compute, domains=(DOMAIN,)) == {'calls': 1}
+    assert cached_report('tests', params, compute, domains=(DOMAIN,)) == {'calls': 1}
+
+    key = report_cache_key('tests', params, (DOMAIN,))
+    bump_version(DOMAIN)
+    assert report_cache_key('tests', params, (DOMAIN,)) != key
+    assert cached_report('tests', params, compute, domains=(DOMAIN,)) == {'calls': 2}
+    assert len(calls) == 2
+
+
+def test_params_and_scope_are_part_of_the_key():
+    compute, calls = counting_compute()
+
+    cached_report('tests', {'cliente': 'A'}, compute, domains=(DOMAIN,), scope='staff')
+    cached_report('tests', {'cliente': 'B'}, compute, domains=(DOMAIN,), scope='staff')
+    cached_report('tests', {'cliente': 'A'}, compute, domains=(DOMAIN,), scope='user:jdoe')
+    # El formato de exportación no cambia el resultado
+    cached_report(
+        'tests', {'cliente': 'A', 'format': 'csv'}, compute, domains=(DOMAIN,), scope='staff'
+    )
+
+    assert len(calls) == 3
+
+
+@override_settings(REPORT_CACHE_LOCK_SECONDS=5)
+def test_waits_for_the_request_holding_the_lock():
+    compute, calls = counting_compute()
+    key = report_cache_key('tests', {}, (DOMAIN,))
+    cache.add(f'{key}:lock', 1)
+
+    def other_request_finishes(_):
+        cache.set(key, zlib.compress(pickle.dumps({'calls': 'otra petición'})))
+
+    with mock.patch.object(report_cache.time, 'sleep', side_effect=other_request_finishes):
+        assert cached_report('tests', {}, compute, domains=(DOMAIN,)) == {
+            'calls': 'otra petición'
+        }
+    assert calls == []
+
+
+@override_settings(REPORT_CACHE_LOCK_SECONDS=5)
+def test_computes_when_the_lock_is_released_without_result():
+    compute, calls = counting_compute()
+    key = report_cache_key('tests', {}, (DOMAIN,))
+    cache.add(f'{key}:lock', 1)
+
+    with mock.patch.object(
+        report_cache.time, 'sleep', side_effect=lambda _: cache.delete(f'{key}:lock')
+    ):
+        assert cached_report('tests', {}, compute, domains=(DOMAIN,)) == {'calls': 1}
+    assert len(calls) == 1
@@ -0,0 +1,42 @@
+"""
+Tests para los trabajos de reportes en segundo plano
+"""
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.tickets.models import ReportJob
+from apps.tickets.report_jobs import request_report_job
+from apps.tickets.views import ReportJobViewSet
+
+
+@pytest.fixture
+def params():
+    today = timezone.localdate().isoformat()
+    return {'fecha_desde': today, 'fecha_hasta': today}
+
+
+def retrieve(job, user):
+    request = APIRequestFactory().get(f'/api/report-jobs/{job.pk}/')
+    force_authenticate(request, user=user)
+    return ReportJobViewSet.as_view({'get': 'retrieve'})(request, pk=str(job.pk))
+
+
+@pytest.mark.django_db
+def test_jobs_are_only_visible_to_requester_and_staff(django_user_model, params):
+    owner = django_user_model(username='jobs-owner')
+    job, _ = request_report_job(ReportJob.TYPE_GENERAL, 'csv', params, owner.username)
+
+    assert retrieve(job, owner).status_code == 200
+    assert retrieve(job, django_user_model(username='jobs-other')).status_code == 404
+    assert retrieve(job, django_user_model(username='jobs-staff', is_staff=True)).status_code == 200
+
+
+@pytest.mark.django_db
+def test_jobs_are_reused_only_for_the_same_requester(params):
+    job, created = request_report_job(ReportJob.TYPE_GENERAL, 'csv', params, 'jobs-owner')
+    assert created
+
+    assert request_report_job(ReportJob.TYPE_GENERAL, 'csv', params, 'jobs-owner') == (job, False)
+    other, created = request_report_job(ReportJob.TYPE_GENERAL, 'csv', params, 'jobs-other')
+    assert created and other.pk != job.pk
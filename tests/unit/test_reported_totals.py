@@ -0,0 +1,66 @@
+"""
+Tests para los totales de tiempo reportado de los tickets
+"""
+from datetime import time
+
+import pytest
+from django.utils import timezone
+
+from apps.tickets.models import ReportedTime
+from apps.tickets.serializers import TicketCreateSerializer
+
+
+@pytest.fixture
+def tickets(ticket_data):
+    created = []
+    for _ in range(2):
+        serializer = TicketCreateSerializer(data=ticket_data)
+        assert serializer.is_valid(), serializer.errors
+        created.append(serializer.save())
+    return created
+
+
+def totals(ticket):
+    ticket.refresh_from_db()
+    return ticket.total_reported_seconds, ticket.reported_entries_count
+
+
+def report(ticket, value):
+    return ReportedTime.objects.create(
+        id_ticket=ticket, date_reported=timezone.now(), reported_time=value
+    )
+
+
+@pytest.mark.django_db
+def test_create_and_update_adjust_ticket_totals(tickets):
+    ticket, _ = tickets
+    entry = report(ticket, time(1, 30))
+    report(ticket, time(0, 15))
+    assert totals(ticket) == (6300, 2)
+
+    entry.reported_time = time(0, 45)
+    entry.save()
+    assert totals(ticket) == (3600, 2)
+
+
+@pytest.mark.django_db
+def test_moving_time_to_another_ticket_adjusts_both(tickets):
+    source, target = tickets
+    entry = report(source, time(1, 0))
+
+    entry.id_ticket = target
+    entry.save()
+
+    assert totals(source) == (0, 0)
+    assert totals(target) == (3600, 1)
+
+
+@pytest.mark.django_db
+def test_delete_subtracts_from_ticket_totals(tickets):
+    ticket, _ = tickets
+    entry = report(ticket, time(2, 0))
+    report(ticket, time(0, 30))
+
+    entry.delete()
+
+    assert totals(ticket) == (1800, 1)
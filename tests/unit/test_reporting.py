@@ -0,0 +1,17 @@
+"""
+Tests para los percentiles de los reportes
+"""
+from apps.tickets.reporting import percentile
+
+
+def test_percentile_interpolates_between_neighbours():
+    values = [10, 20, 30, 40]
+
+    assert percentile(values, 0.5) == 25
+    assert percentile(values, 0.9) == 37
+    assert percentile(values, 1) == 40
+
+
+def test_percentile_of_empty_list_is_none():
+    assert percentile([], 0.5) is None
+    assert percentile([7], 0.99) == 7
@@ -0,0 +1,87 @@
+"""
+Tests para la pausa del ANS al crear, actualizar y cerrar tickets
+"""
+from datetime import datetime
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from apps.tickets.models import Status, Ticket
+from apps.tickets.serializers import TicketCreateSerializer, TicketUpdateSerializer
+from apps.tickets.sla import sla_deadline
+
+
+def local(day, hour):
+    return timezone.make_aware(datetime(2026, 3, day, hour, 0))
+
+
+def create_ticket(data):
+    serializer = TicketCreateSerializer(data=data)
+    assert serializer.is_valid(), serializer.errors
+    return serializer.save()
+
+
+def change_status(ticket, status, moment):
+    serializer = TicketUpdateSerializer(ticket, data={'status_id': status.pk}, partial=True)
+    assert serializer.is_valid(), serializer.errors
+    with mock.patch('django.utils.timezone.now', return_value=moment):
+        return serializer.save()
+
+
+@pytest.fixture
+def ticket(ticket_data):
+    # Creado el lunes 2 de marzo a las 8:00 con ANS de 8 horas: vence a las 16:00
+    ticket = create_ticket(ticket_data)
+    Ticket.objects.filter(pk=ticket.pk).update(
+        create_at=local(2, 8), estimated_closing_date=local(2, 16)
+    )
+    ticket.refresh_from_db()
+    return ticket
+
+
+@pytest.fixture
+def waiting():
+    return Status.objects.create(status_name='En espera del cliente', pauses_sla=True)
+
+
+@pytest.mark.django_db
+def test_ticket_created_in_pausing_status_starts_paused(ticket_data, waiting):
+    ticket = create_ticket({**ticket_data, 'status_id': waiting.pk})
+
+    ticket.refresh_from_db()
+    assert ticket.sla_paused_since == ticket.create_at
+
+
+@pytest.mark.django_db
+def test_ticket_created_in_active_status_is_not_paused(ticket_data):
+    assert create_ticket(ticket_data).sla_paused_since is None
+
+
+@pytest.mark.django_db
+def test_resuming_accumulates_pause_and_moves_deadline(ticket, waiting):
+    active = ticket.status_id
+
+    ticket = change_status(ticket, waiting, local(2, 10))
+    assert ticket.sla_paused_since == local(2, 10)
+
+    ticket = change_status(ticket, active, local(2, 13))
+    ticket.refresh_from_db()
+    assert ticket.sla_paused_since is None
+    assert ticket.sla_paused_seconds == 3 * 3600
+    # Una hora del lunes (16:00 a 17:00) y dos del martes desde las 8:00
+    assert sla_deadline(ticket) == local(3, 10)
+
+
+@pytest.mark.django_db
+def test_closing_while_paused_accumulates_pause(ticket, waiting):
+    closed = Status.objects.create(status_name='Cerrado')
+
+    ticket = change_status(ticket, waiting, local(2, 10))
+    ticket = change_status(ticket, closed, local(2, 15))
+    ticket.refresh_from_db()
+
+    assert ticket.closing_date == local(2, 15)
+    assert ticket.sla_paused_since is None
+    assert ticket.sla_paused_seconds == 5 * 3600
+    assert sla_deadline(ticket) == local(3, 12)
@@ -0,0 +1,42 @@
+"""
+Tests para las estadísticas de tickets en cache
+"""
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.tickets.models import Status, Ticket
+from apps.tickets.serializers import TicketCreateSerializer
+from apps.tickets.views import TicketViewSet
+
+
+def stats(user):
+    request = APIRequestFactory().get('/api/tickets/stats/')
+    force_authenticate(request, user=user)
+    return TicketViewSet.as_view({'get': 'stats'})(request).data
+
+
+@pytest.mark.django_db
+def test_ticket_change_invalidates_cached_stats(
+    ticket_data, django_user_model, django_capture_on_commit_callbacks
+):
+    cache.clear()
+    # El reportante del fixture: solo ve sus propios tickets
+    user = django_user_model(username='testsuser')
+    serializer = TicketCreateSerializer(data=ticket_data)
+    assert serializer.is_valid(), serializer.errors
+    ticket = serializer.save()
+    assert stats(user)['closed_tickets'] == 0
+
+    # Sin señales (update) la generación no cambia y se sirve el cache
+    closed = Status.objects.create(status_name='Cerrado')
+    Ticket.objects.filter(pk=ticket.pk).update(status_id=closed)
+    assert stats(user)['closed_tickets'] == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        ticket.refresh_from_db()
+        ticket.save()
+
+    data = stats(user)
+    assert data['total_tickets'] == 1
+    assert data['closed_tickets'] == 1
@@ -0,0 +1,75 @@
+"""
+Tests para la asignación de tickets
+"""
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.tickets.models import Client, EUser, Role, Service
+from apps.tickets.reporting import ResolutionPercentiles
+from apps.tickets.serializers import TicketCreateSerializer
+from apps.tickets.views import TicketViewSet
+
+
+@pytest.fixture
+def ticket(ticket_data):
+    serializer = TicketCreateSerializer(data=ticket_data)
+    assert serializer.is_valid(), serializer.errors
+    return serializer.save()
+
+
+@pytest.fixture
+def eusers():
+    values = {
+        'user_client_name': Client.objects.get(client_name='Tests Client'),
+        'id_services': Service.objects.create(service_name='Asignación Service'),
+        'rol_name': Role.objects.create(rol_name='Asignación Rol'),
+    }
+    return [
+        EUser.objects.create(
+            network_user=network_user, name='Test', last_name='Asignación', **values
+        )
+        for network_user in ('asigna1', 'asigna2')
+    ]
+
+
+def assign(ticket, network_user, django_user_model):
+    request = APIRequestFactory().post(
+        f'/api/tickets/{ticket.pk}/assign/', {'assigned_to': network_user}, format='json'
+    )
+    force_authenticate(request, user=django_user_model(username='asigna', is_staff=True))
+    view = TicketViewSet.as_view({'post': 'assign'}, **TicketViewSet.assign.kwargs)
+    return view(request, id_ticket=ticket.pk)
+
+
+@pytest.mark.django_db
+def test_first_assignment_is_stamped_once(ticket, eusers, django_user_model):
+    assert ticket.first_assigned_at is None
+
+    response = assign(ticket, 'asigna1', django_user_model)
+    assert response.status_code == 200
+    ticket.refresh_from_db()
+    assert ticket.assigned_to_id == 'asigna1'
+    first_assigned_at = ticket.first_assigned_at
+    assert first_assigned_at is not None
+
+    assert assign(ticket, 'asigna2', django_user_model).status_code == 200
+    ticket.refresh_from_db()
+    assert ticket.assigned_to_id == 'asigna2'
+    assert ticket.first_assigned_at == first_assigned_at
+
+    today = timezone.localdate().isoformat()
+    data = ResolutionPercentiles(
+        {'fecha_desde': today, 'fecha_hasta': today, 'cliente': 'Tests Client'}
+    ).results()
+    assert data['general']['tiempo_primera_asignacion']['tickets'] == 1
+
+
+@pytest.mark.django_db
+def test_unknown_user_is_rejected(ticket, django_user_model):
+    response = assign(ticket, 'no-existe', django_user_model)
+
+    assert response.status_code == 400
+    assert 'assigned_to' in response.data
+    ticket.refresh_from_db()
+    assert ticket.assigned_to_id is None and ticket.first_assigned_at is None